@@ -0,0 +1 @@
+"""가짜 Google Sheets/Gmail/OpenAI 백엔드로 돌리는 오프라인 벤치마크. 실행 방법은 benchmarks/run.py를 참고하세요."""
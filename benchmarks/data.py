@@ -0,0 +1,56 @@
+"""벤치마크용 합성 대상자 명단과 응답 데이터.
+
+같은 크기와 seed면 항상 같은 데이터를 만듭니다. 응답에는 대소문자·공백이 다른 이메일과 이메일 없이 제출된
+행이 섞여 있고, 명단에는 이메일이 없어 이름+소속으로만 매칭되는 대상자가 있어 실제 매칭 경로를 모두 거칩니다.
+"""
+import numpy as np
+import pandas as pd
+
+DEPARTMENTS = ['경영지원팀', '영업1팀', '영업2팀', '개발팀', '디자인팀', '인사팀', '재무팀', '마케팅팀']
+SATISFACTION = ['매우 만족', '만족', '보통', '불만족', '매우 불만족']
+RESPONSE_RATE = 0.6
+NO_EMAIL_RATE = 0.05  # 명단에서 이메일이 없는 대상자 비율
+
+
+def make_roster(n, seed=0):
+    """n명의 대상자 명단(이름, 소속, 이메일, 연락처)을 만듭니다. NO_EMAIL_RATE 비율은 이메일이 없습니다."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(n)
+    roster = pd.DataFrame({
+        '이름': pd.Series(ids).map('참여자{:07d}'.format),
+        '소속': pd.Categorical.from_codes(rng.integers(0, len(DEPARTMENTS), n), DEPARTMENTS),
+        '이메일': pd.Series(ids).map('user{:07d}@example.com'.format),
+        '연락처': pd.Series(rng.integers(0, 10**8, n)).map('010-{:08d}'.format),
+    })
+    roster['이메일'] = roster['이메일'].where(rng.random(n) >= NO_EMAIL_RATE)
+    return roster
+
+
+def make_responses(roster, rate=RESPONSE_RATE, seed=0, survey_no=1):
+    """명단의 rate 비율이 응답한 응답 시트 DataFrame을 만듭니다."""
+    rng = np.random.default_rng(seed + survey_no)
+    picked = roster.sample(frac=rate, random_state=seed + survey_no).reset_index(drop=True)
+    n = len(picked)
+    email = picked['이메일'].astype(object)
+    # 일부는 대소문자/공백이 다르게, 일부는 이메일 없이 제출됩니다
+    variant = rng.random(n)
+    email = email.where(variant >= 0.1, email.str.upper())
+    email = email.where(variant >= 0.15, ' ' + email + ' ')
+    email = email.where(variant >= 0.2, '')
+    start = pd.Timestamp('2024-03-01')
+    stamps = start + pd.to_timedelta(np.sort(rng.integers(0, 14 * 24 * 3600, n)), unit='s')
+    return pd.DataFrame({
+        '타임스탬프': stamps.strftime('%Y-%m-%d %H:%M:%S'),
+        '이름': picked['이름'].astype(object),
+        '소속': picked['소속'].astype(object),
+        '이메일': email,
+        '만족도': np.array(SATISFACTION, dtype=object)[rng.integers(0, len(SATISFACTION), n)],
+        '추천 점수': rng.integers(0, 11, n),
+        '의견': np.where(rng.random(n) < 0.3, '프로그램이 유익했습니다.', ''),
+    })
+
+
+def sheet_values(df):
+    """DataFrame을 get_all_values()가 돌려주는 문자열 2차원 리스트로 바꿉니다."""
+    body = df.astype(str).to_numpy().tolist()
+    return [list(map(str, df.columns))] + body
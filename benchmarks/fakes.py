@@ -0,0 +1,290 @@
+"""벤치마크용 가짜 Google Sheets, Gmail, OpenAI 백엔드.
+
+실제 클라이언트에서 앱이 쓰는 메서드만 같은 모양으로 구현합니다. latency(초)만큼 호출마다 대기하고,
+error_rate 확률로 실제 라이브러리와 같은 할당량 초과(429) 예외를 올립니다. seed가 같으면 오류가 나는
+호출 순서도 같으므로 버전 간 결과를 비교할 수 있습니다.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class _Backend:
+    """지연과 할당량 오류를 흉내 내는 공통 부분입니다."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _should_fail(self):
+        with self._lock:
+            self.calls += 1
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return fail
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+
+# --- Google Sheets (gspread) -------------------------------------------------
+
+class _QuotaResponse:
+    """gspread.exceptions.APIError가 읽는 응답 객체입니다."""
+
+    status_code = 429
+    text = "Quota exceeded"
+
+    def json(self):
+        return {"error": {"code": 429, "message": "Quota exceeded for quota metric 'Read requests'",
+                          "status": "RESOURCE_EXHAUSTED"}}
+
+
+def _sheets_quota_error():
+    from gspread.exceptions import APIError
+
+    return APIError(_QuotaResponse())
+
+
+def _parse_a1(cell):
+    """'B12' -> (12, 2). 행이나 열이 없으면 None으로 둡니다."""
+    letters = ''.join(ch for ch in cell if ch.isalpha())
+    digits = ''.join(ch for ch in cell if ch.isdigit())
+    col = 0
+    for ch in letters.upper():
+        col = col * 26 + ord(ch) - ord('A') + 1
+    return (int(digits) if digits else None), (col or None)
+
+
+class FakeWorksheet(_Backend):
+    """값을 2차원 리스트로 들고 있는 워크시트입니다."""
+
+    def __init__(self, values=None, **kwargs):
+        super().__init__(**kwargs)
+        self.values = [list(row) for row in (values or [])]
+        self.title = "Sheet1"
+
+    def _call(self):
+        self._wait()
+        if self._should_fail():
+            raise _sheets_quota_error()
+
+    def get_all_values(self):
+        self._call()
+        return [list(row) for row in self.values]
+
+    def _range(self, range_name):
+        if ':' in range_name:
+            start, end = range_name.split(':', 1)
+        else:
+            start = end = range_name
+        (r1, c1), (r2, c2) = _parse_a1(start), _parse_a1(end)
+        r1, r2 = r1 or 1, r2 or len(self.values)
+        rows = self.values[r1 - 1:r2]
+        if c1 or c2:
+            rows = [row[(c1 or 1) - 1:c2] for row in rows]
+        # Sheets API처럼 뒤쪽 빈 칸과 빈 행은 잘라서 돌려줍니다
+        trimmed = []
+        for row in rows:
+            row = list(row)
+            while row and row[-1] == '':
+                row.pop()
+            trimmed.append(row)
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()
+        return trimmed
+
+    def batch_get(self, ranges):
+        self._call()
+        return [self._range(range_name) for range_name in ranges]
+
+    def append_rows(self, rows, value_input_option=None):
+        self._call()
+        self.values.extend([list(map(str, row)) for row in rows])
+
+    def resize(self, rows=None, cols=None):
+        self._call()
+        if rows is not None:
+            del self.values[rows:]
+
+    def update(self, values, range_name=None):
+        self._call()
+        start = (range_name or 'A1').split(':', 1)[0]
+        row, col = _parse_a1(start)
+        row, col = row or 1, col or 1
+        with self._lock:
+            while len(self.values) < row - 1 + len(values):
+                self.values.append([])
+            for offset, new_row in enumerate(values):
+                target = self.values[row - 1 + offset]
+                target.extend([''] * max(0, col - 1 + len(new_row) - len(target)))
+                target[col - 1:col - 1 + len(new_row)] = ['' if v is None else str(v) for v in new_row]
+
+
+class FakeSpreadsheet:
+    def __init__(self, spreadsheet_id, worksheet):
+        self.id = spreadsheet_id
+        self.sheet1 = worksheet
+
+
+class FakeSheetsClient:
+    """gspread 클라이언트 대신 쓰는 객체입니다. add_sheet()로 시트 내용을 미리 넣어 둡니다."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.sheets = {}
+
+    def add_sheet(self, sheet_id, values):
+        worksheet = FakeWorksheet(values, latency=self.latency, error_rate=self.error_rate,
+                                  seed=self.seed + len(self.sheets))
+        self.sheets[sheet_id] = FakeSpreadsheet(sheet_id, worksheet)
+        return worksheet
+
+    def open_by_key(self, sheet_id):
+        return self.sheets[sheet_id]
+
+    def create(self, name):
+        self.add_sheet(name, [])
+        return self.sheets[name]
+
+
+# --- Gmail (googleapiclient) -------------------------------------------------
+
+def _gmail_quota_error():
+    from googleapiclient.errors import HttpError
+
+    resp = SimpleNamespace(status=429, reason="Too Many Requests")
+    content = json.dumps({"error": {"code": 429, "message": "User-rate limit exceeded"}}).encode('utf-8')
+    return HttpError(resp, content)
+
+
+class _SendRequest:
+    def __init__(self, service, body):
+        self.service = service
+        self.body = body
+
+    def execute(self, http=None):
+        service = self.service
+        service._wait()
+        if service._should_fail():
+            raise _gmail_quota_error()
+        with service._lock:
+            service.sent.append(self.body)
+            return {"id": f"fake-{len(service.sent)}"}
+
+
+class FakeGmailService(_Backend):
+    """service.users().messages().send(userId='me', body=...).execute()만 구현한 Gmail 서비스입니다."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sent = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def send(self, userId, body):
+        return _SendRequest(self, body)
+
+
+# --- OpenAI ------------------------------------------------------------------
+
+SAMPLE_SURVEY = {
+    "title": "교육 프로그램 만족도 조사",
+    "description": "프로그램 개선을 위해 의견을 들려주세요.",
+    "questions": [
+        {"type": "radio", "question": f"{i}번째 항목에 얼마나 만족하셨나요?", "required": True,
+         "options": ["매우 만족", "만족", "보통", "불만족", "매우 불만족"]}
+        for i in range(1, 9)
+    ] + [{"type": "textarea", "question": "개선할 점을 자유롭게 적어주세요.", "required": False}],
+}
+
+
+def _openai_rate_limit_error():
+    from openai import RateLimitError
+
+    # RateLimitError가 읽는 응답 속성만 채웁니다 (HTTP 클라이언트 라이브러리에 의존하지 않도록)
+    response = SimpleNamespace(status_code=429, headers={}, request=None)
+    return RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def _usage(text):
+    completion = max(1, len(text) // 4)
+    return SimpleNamespace(prompt_tokens=250, completion_tokens=completion, total_tokens=250 + completion)
+
+
+class _Completions:
+    def __init__(self, backend, survey, chunk_chars, chunk_latency):
+        self.backend = backend
+        self.survey = survey
+        self.chunk_chars = chunk_chars
+        self.chunk_latency = chunk_latency
+
+    def _text(self):
+        return json.dumps(self.survey, ensure_ascii=False, indent=2)
+
+    def _chunks(self, text):
+        for start in range(0, len(text), self.chunk_chars):
+            if self.chunk_latency:
+                time.sleep(self.chunk_latency)
+            delta = SimpleNamespace(content=text[start:start + self.chunk_chars])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=_usage(text))
+
+    def create(self, model=None, messages=None, temperature=None, stream=False, stream_options=None):
+        # latency는 첫 토큰까지 걸리는 시간입니다
+        self.backend._wait()
+        if self.backend._should_fail():
+            raise _openai_rate_limit_error()
+        text = self._text()
+        if stream:
+            return self._chunks(text)
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=_usage(text))
+
+
+class FakeOpenAI(_Backend):
+    """client.chat.completions.create(...)를 구현한 동기 클라이언트입니다. stream=True를 지원합니다."""
+
+    def __init__(self, survey=SAMPLE_SURVEY, chunk_chars=16, chunk_latency=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.chat = SimpleNamespace(completions=_Completions(self, survey, chunk_chars, chunk_latency))
+
+
+class _AsyncCompletions(_Completions):
+    async def create(self, model=None, messages=None, temperature=None, stream=False, stream_options=None):
+        if self.backend.latency:
+            await asyncio.sleep(self.backend.latency)
+        if self.backend._should_fail():
+            raise _openai_rate_limit_error()
+        text = self._text()
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=_usage(text))
+
+
+class FakeAsyncOpenAI(_Backend):
+    """AsyncOpenAI 대신 쓰는 비동기 클라이언트입니다. async with로 열고 닫을 수 있습니다."""
+
+    def __init__(self, survey=SAMPLE_SURVEY, **kwargs):
+        super().__init__(**kwargs)
+        self.chat = SimpleNamespace(completions=_AsyncCompletions(self, survey, 0, 0.0))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
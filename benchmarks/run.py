@@ -0,0 +1,362 @@
+"""오프라인 벤치마크 실행기.
+
+앱 모듈(streamlit_app_email_simple)은 불러오지 않고 엔진 모듈만 가짜 백엔드에 연결해 주요 경로의 시간을
+잽니다. 결과는 benchmarks/results/<라벨>.json에 저장되며, --compare로 이전 결과와 비교할 수 있습니다.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000,100000 --cases match,export --label before
+    python -m benchmarks.run --label after --compare benchmarks/results/before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+
+from benchmarks.data import make_responses, make_roster, sheet_values
+from benchmarks.fakes import FakeAsyncOpenAI, FakeGmailService, FakeOpenAI, FakeSheetsClient
+from google_quota import SHEETS_READ, QuotaLimiter, unlimited_quota
+from reminder_engine import ReminderDispatcher
+from reminder_outbox import ReminderOutbox
+from respondent_matching import (
+    completion_by_department, find_non_respondents, match_respondents, match_summary, response_matrix
+)
+from sheet_repository import SheetRepository
+from sheet_uploader import SheetUploader
+from survey_aggregates import SurveySummary
+from survey_export import export_frame
+from survey_generation import run_variants, stream_survey
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 3
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+XLSX_MAX_ROWS = 100_000    # XLSX는 느려서 이 크기까지만 잽니다
+DEFAULT_MAX_SENDS = 5_000  # 리마인더 발송 한 번에 보내는 최대 수
+APPEND_RATIO = 0.01        # 증분 동기화 때 새로 추가되는 응답 비율
+QUOTA_RATE = 200           # 할당량 케이스의 초당 한도 (실제 분당 60회를 축소한 값)
+QUOTA_CALLS = 400
+QUOTA_ERROR_RATE = 0.1     # --error-rate가 0일 때 할당량 케이스에 쓰는 429 비율
+
+
+class Context:
+    """크기별 데이터와 가짜 백엔드 설정을 담습니다. 데이터는 처음 필요할 때 만듭니다."""
+
+    def __init__(self, n, latency=0.0, error_rate=0.0, seed=0, max_sends=DEFAULT_MAX_SENDS):
+        self.n = n
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.max_sends = max_sends
+        self._cache = {}
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def roster(self):
+        return self._get('roster', lambda: make_roster(self.n, self.seed))
+
+    def responses(self, survey_no=1):
+        return self._get(('responses', survey_no),
+                         lambda: make_responses(self.roster, seed=self.seed, survey_no=survey_no))
+
+    @property
+    def response_values(self):
+        return self._get('response_values', lambda: sheet_values(self.responses()))
+
+    def sheets_client(self):
+        return FakeSheetsClient(latency=self.latency, error_rate=self.error_rate, seed=self.seed)
+
+
+class Timer:
+    """with timer(): 블록에 걸린 시간을 기록합니다. 준비 작업은 블록 밖에서 합니다."""
+
+    def __init__(self):
+        self.elapsed = None
+
+    @contextmanager
+    def __call__(self):
+        started = time.perf_counter()
+        yield
+        self.elapsed = time.perf_counter() - started
+
+
+# --- 벤치마크 케이스 -----------------------------------------------------------
+# 각 케이스는 (ctx, timer)를 받아 측정할 부분만 timer 블록으로 감싸고, 참고용 값 dict를 반환합니다.
+
+def case_find_non_respondents(ctx, timer):
+    roster, responses = ctx.roster, ctx.responses()
+    with timer():
+        result = find_non_respondents(roster, responses)
+    return {"non_respondents": len(result)}
+
+
+def case_status_summary(ctx, timer):
+    roster, responses = ctx.roster, ctx.responses()
+    with timer():
+        summary = match_summary(match_respondents(roster, responses))
+    return {"methods": {str(k): int(v) for k, v in summary.items()}}
+
+
+def case_survey_summary(ctx, timer):
+    responses = ctx.responses()
+    with timer():
+        summary = SurveySummary().update(responses)
+        summary.satisfaction_counts()
+        columns = summary.categorical_columns()
+    return {"categorical_columns": len(columns)}
+
+
+def case_response_matrix(ctx, timer):
+    rosters = {"명단": ctx.roster}
+    surveys = {f"Survey {i}": ctx.responses(i) for i in range(1, 4)}
+    with timer():
+        matrix = response_matrix(rosters, surveys)
+        completion_by_department(matrix, list(surveys))
+    return {"participants": len(matrix)}
+
+
+def _export_case(extension):
+    def case(ctx, timer):
+        if extension == "xlsx" and ctx.n > XLSX_MAX_ROWS:
+            return None
+        responses = ctx.responses()
+        with timer():
+            with export_frame(responses, extension) as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+        return {"bytes": size}
+    return case
+
+
+def case_load_full(ctx, timer):
+    client = ctx.sheets_client()
+    client.add_sheet("responses", ctx.response_values)
+    repo = SheetRepository(lambda: client, limiter=unlimited_quota())
+    with timer():
+        df = repo.get_records("responses")
+    return {"rows": len(df)}
+
+
+def case_load_incremental(ctx, timer):
+    client = ctx.sheets_client()
+    values = ctx.response_values
+    worksheet = client.add_sheet("responses", values)
+    repo = SheetRepository(lambda: client, limiter=unlimited_quota())
+    repo.get_records("responses")
+    appended = max(1, int(len(values) * APPEND_RATIO))
+    worksheet.values.extend(values[1:appended + 1])
+    repo.invalidate("responses")
+    with timer():
+        df = repo.get_records("responses")
+    return {"rows": len(df), "appended": appended, "incremental_syncs": repo.stats()["incremental_syncs"]}
+
+
+def case_reminder_drain(ctx, timer):
+    non_respondents = find_non_respondents(ctx.roster, ctx.responses()).head(ctx.max_sends)
+    service = FakeGmailService(latency=ctx.latency, error_rate=ctx.error_rate, seed=ctx.seed)
+    # 실제 발송 속도 제한(초당 2.5건)은 빼고 발송 루프 자체의 비용만 잽니다
+    dispatcher = ReminderDispatcher(service, limiter=unlimited_quota())
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = ReminderOutbox(os.path.join(tmp, 'outbox.db'))
+        with timer():
+            outbox.enqueue("bench", "r1", zip(non_respondents['이름'], non_respondents['이메일']),
+                           "https://example.com/survey")
+            _, stats = outbox.drain(dispatcher, "bench", "r1")
+    return {"sent": stats["sent"], "failed": stats["failed"], "throughput": round(stats["throughput"], 1)}
+
+
+def case_roster_upload(ctx, timer):
+    client = ctx.sheets_client()
+    worksheet = client.add_sheet("upload", [])
+    uploader = SheetUploader(limiter=unlimited_quota())
+    with timer():
+        report = uploader.upload(worksheet, ctx.roster)
+    return {"uploaded_rows": report["uploaded_rows"], "failed_chunks": len(report["failed_chunks"]),
+            "api_errors": worksheet.errors}
+
+
+def case_generation_stream(ctx, timer):
+    client = FakeOpenAI(latency=ctx.latency, error_rate=ctx.error_rate, seed=ctx.seed)
+    with timer():
+        for event, value in stream_survey(client, "신입사원", "교육 만족도 조사", "만족도, 개선점"):
+            if event == "done":
+                survey_data, info = value
+    return {"questions": len(survey_data["questions"]), "first_question": round(info["first_question"] or 0.0, 4)}
+
+
+def case_generation_variants(ctx, timer):
+    with timer():
+        results = run_variants(
+            lambda: FakeAsyncOpenAI(latency=ctx.latency, error_rate=ctx.error_rate, seed=ctx.seed),
+            "신입사원", "교육 만족도 조사", "만족도, 개선점"
+        )
+    return {"failed": sum(1 for r in results if r.get("error"))}
+
+
+def case_quota_retry(ctx, timer):
+    """429가 섞인 읽기를 여러 스레드가 공유 제한기로 보낼 때 한도 대비 처리량을 잽니다."""
+    client = FakeSheetsClient(latency=ctx.latency, error_rate=ctx.error_rate or QUOTA_ERROR_RATE, seed=ctx.seed)
+    worksheet = client.add_sheet("quota", [["a"]])
+    # 버스트 없이 시작해 한도만큼만 흘려보냅니다
+    limiter = QuotaLimiter(quotas={SHEETS_READ: (QUOTA_RATE, 1)}, backoff=0.01, max_backoff=0.2)
+    with timer():
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(limiter.call, SHEETS_READ, "get_all_values", worksheet.get_all_values)
+                       for _ in range(QUOTA_CALLS)]
+            failed = sum(1 for f in futures if f.exception() is not None)
+    return {"calls": QUOTA_CALLS, "failed": failed, "api_errors": worksheet.errors,
+            "ceiling_per_sec": QUOTA_RATE, "requests_per_sec": round(worksheet.calls / timer.elapsed, 1)}
+
+
+# (이름, 함수, 크기에 따라 달라지는지)
+CASES = [
+    ("match.find_non_respondents", case_find_non_respondents, True),
+    ("aggregate.status_summary", case_status_summary, True),
+    ("aggregate.survey_summary", case_survey_summary, True),
+    ("aggregate.response_matrix", case_response_matrix, True),
+    ("export.csv", _export_case("csv"), True),
+    ("export.parquet", _export_case("parquet"), True),
+    ("export.xlsx", _export_case("xlsx"), True),
+    ("load.full", case_load_full, True),
+    ("load.incremental", case_load_incremental, True),
+    ("upload.roster", case_roster_upload, True),
+    ("reminder.drain", case_reminder_drain, True),
+    ("quota.retry", case_quota_retry, False),
+    ("generation.stream", case_generation_stream, False),
+    ("generation.variants", case_generation_variants, False),
+]
+
+
+def run_case(func, ctx, repeat):
+    """케이스를 repeat번 실행해 결과 dict를 반환합니다. 건너뛴 케이스는 None입니다."""
+    times, extra = [], {}
+    for _ in range(repeat):
+        timer = Timer()
+        try:
+            extra = func(ctx, timer)
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+        if extra is None and timer.elapsed is None:
+            return None
+        times.append(timer.elapsed)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "repeat": repeat,
+        "extra": extra or {},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, selected=None, repeat=DEFAULT_REPEAT, latency=0.0, error_rate=0.0, seed=0,
+        max_sends=DEFAULT_MAX_SENDS, log=print):
+    """선택한 케이스를 크기별로 실행하고 결과 목록을 반환합니다."""
+    cases = [c for c in CASES if not selected or any(c[0].startswith(s) for s in selected)]
+    results = []
+    for name, func, sized in cases:
+        if sized:
+            continue
+        ctx = Context(0, latency, error_rate, seed, max_sends)
+        result = run_case(func, ctx, repeat)
+        if result is not None:
+            results.append({"case": name, "rows": None, **result})
+            log(_format_row(results[-1]))
+    for n in sizes:
+        ctx = Context(n, latency, error_rate, seed, max_sends)
+        for name, func, sized in cases:
+            if not sized:
+                continue
+            result = run_case(func, ctx, repeat)
+            if result is None:
+                log(f"{name:<30} {n:>10,}  건너뜀")
+                continue
+            results.append({"case": name, "rows": n, **result})
+            log(_format_row(results[-1]))
+    return results
+
+
+def _format_row(result):
+    rows = f"{result['rows']:,}" if result["rows"] is not None else "-"
+    if "error" in result:
+        return f"{result['case']:<30} {rows:>10}  오류: {result['error']}"
+    return f"{result['case']:<30} {rows:>10}  {result['min'] * 1000:>10.1f}ms  (중앙값 {result['median'] * 1000:.1f}ms)"
+
+
+def compare(baseline, current, log=print):
+    """같은 (케이스, 크기) 결과의 최소 시간을 비교해 출력합니다. 1보다 크면 느려진 것입니다."""
+    base = {(r["case"], r["rows"]): r for r in baseline["results"] if "min" in r}
+    log(f"\n비교 기준: {baseline.get('label')} ({baseline.get('revision')})")
+    for r in current["results"]:
+        old = base.get((r["case"], r["rows"]))
+        if old is None or "min" not in r:
+            continue
+        ratio = r["min"] / old["min"] if old["min"] else float('inf')
+        rows = f"{r['rows']:,}" if r["rows"] is not None else "-"
+        log(f"{r['case']:<30} {rows:>10}  {old['min'] * 1000:>10.1f}ms -> {r['min'] * 1000:>10.1f}ms  x{ratio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가짜 백엔드로 주요 경로의 처리 시간을 잽니다.")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="쉼표로 구분한 행 수 (기본: 1000,100000,1000000)")
+    parser.add_argument('--cases', default='', help="이름이 이 값으로 시작하는 케이스만 실행 (쉼표 구분)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="가짜 API 호출마다 더할 지연 (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="가짜 API 호출이 429로 실패할 확률")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-sends', type=int, default=DEFAULT_MAX_SENDS, help="리마인더 케이스의 최대 발송 수")
+    parser.add_argument('--label', default=None, help="결과 파일 이름 (기본: git 리비전)")
+    parser.add_argument('--output-dir', default=DEFAULT_RESULTS_DIR)
+    parser.add_argument('--compare', default=None, help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    selected = [s.strip() for s in args.cases.split(',') if s.strip()]
+    revision = git_revision()
+    label = args.label or revision or time.strftime('%Y%m%d-%H%M%S')
+
+    results = run(sizes, selected, args.repeat, args.latency_ms / 1000, args.error_rate, args.seed,
+                  args.max_sends)
+    report = {
+        "label": label,
+        "revision": revision,
+        "created_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "settings": {"sizes": sizes, "repeat": args.repeat, "latency_ms": args.latency_ms,
+                     "error_rate": args.error_rate, "seed": args.seed, "max_sends": args.max_sends},
+        "results": results,
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    path = os.path.join(args.output_dir, f"{label}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Google API 할당량 클래스별 공유 속도 제한과 재시도.
+
+Sheets 읽기·쓰기와 Gmail 발송은 할당량이 따로 잡히므로 클래스마다 토큰 버킷을 하나씩 두고, 프로세스 안의
+모든 스레드와 Streamlit 세션이 GOOGLE_QUOTA 하나를 함께 씁니다. 429나 5xx 응답을 받으면 지터를 섞은
+지수 백오프로 다시 시도하고, 429일 때는 버킷을 비워 같은 할당량을 쓰는 다른 스레드도 잠시 물러서게 합니다.
+"""
+import random
+import threading
+import time
+
+from instrumentation import count, timer, METRICS
+
+# 할당량 클래스
+SHEETS_READ = 'sheets_read'
+SHEETS_WRITE = 'sheets_write'
+GMAIL_SEND = 'gmail_send'
+
+# Sheets API 할당량: 사용자당 분당 읽기 60회, 쓰기 60회
+SHEETS_READS_PER_MINUTE = 60
+SHEETS_WRITES_PER_MINUTE = 60
+# Gmail API 할당량: 사용자당 초당 250 quota unit, messages.send 1회 = 100 unit
+GMAIL_SEND_RATE = 2.5   # 초당 발송 수
+GMAIL_SEND_BURST = 2    # 순간 최대 발송 수
+
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 1.0       # 첫 재시도 대기 (초)
+DEFAULT_MAX_BACKOFF = 32.0
+
+# 재시도해도 되는 오류 (할당량 초과, 일시적 서버 오류)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """스레드 간에 공유되는 토큰 버킷 속도 제한기입니다."""
+
+    def __init__(self, rate=GMAIL_SEND_RATE, capacity=GMAIL_SEND_BURST):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기하고, 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def drain(self):
+        """남은 토큰을 비웁니다. 할당량 초과 응답을 받았을 때 다른 스레드의 요청도 늦춥니다."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+def per_minute(limit):
+    """분당 한도를 (초당 속도, 최대 버스트) 버킷 설정으로 바꿉니다.
+
+    버킷은 60초 동안 버스트 + 속도 × 60개까지 내주므로, 버스트를 한도의 1/6로 두고 남은 몫을 속도로 나눠
+    버킷이 가득 찬 상태에서 시작해도 어느 60초 구간에서나 한도를 넘지 않게 합니다.
+    """
+    burst = max(1.0, limit / 6.0)
+    return max(limit - burst, 1.0) / 60.0, burst
+
+
+# 계측 라벨에 쓰는 할당량 클래스별 서비스 이름
+QUOTA_SERVICES = {SHEETS_READ: 'sheets', SHEETS_WRITE: 'sheets', GMAIL_SEND: 'gmail'}
+
+DEFAULT_QUOTAS = {
+    SHEETS_READ: per_minute(SHEETS_READS_PER_MINUTE),
+    SHEETS_WRITE: per_minute(SHEETS_WRITES_PER_MINUTE),
+    GMAIL_SEND: (GMAIL_SEND_RATE, GMAIL_SEND_BURST),
+}
+
+
+def error_status(error):
+    """Google API 예외에서 HTTP 상태 코드를 꺼냅니다. 알 수 없으면 None입니다.
+
+    gspread의 APIError(code)와 googleapiclient의 HttpError(resp.status)를 라이브러리를 불러오지 않고 구분합니다.
+    """
+    code = getattr(error, 'code', None)
+    if isinstance(code, int):
+        return code
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(error):
+    """응답의 Retry-After 헤더(초)를 반환합니다. 없으면 None입니다."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or getattr(error, 'resp', None)
+    if not headers or not hasattr(headers, 'get'):
+        return None
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return isinstance(error, (ConnectionError, TimeoutError, OSError))
+
+
+class QuotaLimiter:
+    """할당량 클래스별 토큰 버킷을 들고 API 호출을 속도 제한·재시도합니다.
+
+    limiter.call(SHEETS_READ, "get_all_values", worksheet.get_all_values)처럼 할당량 클래스, 계측용 작업 이름,
+    호출할 함수와 인자를 넘기면 토큰을 얻은 뒤 호출하고, 재시도할 수 있는 오류면 최대 retries번 다시 시도합니다.
+    시도마다 external_call 시간을 기록하며, 마지막 오류는 그대로 올립니다.
+    """
+
+    def __init__(self, quotas=None, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, sleep=time.sleep):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+        for quota, (rate, capacity) in {**DEFAULT_QUOTAS, **(quotas or {})}.items():
+            self.configure(quota, rate, capacity)
+
+    def configure(self, quota, rate, capacity):
+        """할당량 클래스의 초당 속도와 최대 버스트를 설정합니다."""
+        with self._lock:
+            self._buckets[quota] = TokenBucket(rate, capacity)
+
+    def bucket(self, quota):
+        with self._lock:
+            return self._buckets[quota]
+
+    def acquire(self, quota):
+        waited = self.bucket(quota).acquire()
+        if waited:
+            METRICS.observe("quota_wait", waited, quota=quota)
+        return waited
+
+    def _delay(self, attempt, error):
+        # 대기 시간의 절반은 고정, 절반은 무작위로 두어 여러 스레드가 한꺼번에 재시도하지 않게 합니다
+        cap = min(self.max_backoff, self.backoff * (2 ** attempt))
+        delay = cap / 2 + random.uniform(0, cap / 2)
+        server_delay = retry_after(error)
+        return max(delay, server_delay) if server_delay is not None else delay
+
+    def call(self, quota, op, func, *args, **kwargs):
+        """토큰을 얻고 func(*args, **kwargs)를 호출해 결과를 반환합니다."""
+        service = QUOTA_SERVICES.get(quota, quota)
+        for attempt in range(self.retries + 1):
+            self.acquire(quota)
+            try:
+                with timer("external_call", service=service, op=op):
+                    return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.retries or not is_retryable(e):
+                    raise
+                status = error_status(e)
+                if status == 429:
+                    self.bucket(quota).drain()
+                count("api_retries", quota=quota, status=status if status is not None else "network")
+                self.sleep(self._delay(attempt, e))
+
+
+# 프로세스 전체가 공유하는 기본 제한기
+GOOGLE_QUOTA = QuotaLimiter()
+
+
+def unlimited_quota():
+    """속도 제한과 재시도 대기가 없는 제한기를 만듭니다. 벤치마크처럼 API 비용만 빼고 잴 때 씁니다."""
+    return QuotaLimiter(
+        quotas={quota: (1e9, 1e9) for quota in DEFAULT_QUOTAS}, backoff=0.0, sleep=lambda seconds: None
+    )
@@ -0,0 +1,165 @@
+"""외부 API 호출과 화면 렌더링 시간을 재는 가벼운 계측 계층.
+
+엔진 모듈은 `with timer("external_call", service="sheets", op="get_all_values"):`처럼 감싸기만 하고,
+집계는 프로세스 전체가 공유하는 METRICS에 모입니다. 집계는 이름과 라벨별 호출 수, 합계, 최대, 마지막 시간만
+보관하므로 호출이 많아도 메모리가 늘지 않습니다.
+
+집계는 Prometheus 텍스트 형식(node_exporter textfile 수집기용)이나 JSON으로 내보낼 수 있고,
+'survey.metrics' 로거를 DEBUG로 켜면 측정할 때마다 한 줄짜리 JSON 로그를 남깁니다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRIC_PREFIX = 'survey'
+
+logger = logging.getLogger('survey.metrics')
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+class Metrics:
+    """이름과 라벨별 시간 측정값과 카운터를 스레드 안전하게 모읍니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers = {}    # (이름, 라벨) -> [count, total, max, last]
+        self._counters = {}  # (이름, 라벨) -> 값
+        self.started_at = time.time()
+
+    def observe(self, name, seconds, **labels):
+        """측정한 시간(초)을 기록합니다."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            entry = self._timers.get(key)
+            if entry is None:
+                self._timers[key] = [1, seconds, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+                entry[3] = seconds
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(
+                {"ts": time.time(), "metric": name, "seconds": round(seconds, 6), **dict(key[1])},
+                ensure_ascii=False
+            ))
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """블록에 걸린 시간을 기록합니다. 예외가 나면 status="error" 라벨로 기록하고 예외는 그대로 올립니다.
+
+        Exception이 아닌 예외(Streamlit의 st.stop()/st.rerun() 같은 흐름 제어)는 정상 종료로 봅니다.
+        """
+        started = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, status=status, **labels)
+
+    def count(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def total(self, name, **labels):
+        """라벨이 일치하는 시간 측정 호출 수의 합을 반환합니다. 화면 하나가 부른 API 수를 셀 때 씁니다."""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(
+                entry[0] for (metric, key), entry in self._timers.items()
+                if metric == name and wanted <= set(key)
+            )
+
+    def snapshot(self):
+        """집계를 dict 목록으로 반환합니다. 각 항목은 type, name, labels와 측정값을 담습니다."""
+        with self._lock:
+            timers = [(name, key, list(entry)) for (name, key), entry in self._timers.items()]
+            counters = [(name, key, value) for (name, key), value in self._counters.items()]
+        records = [
+            {
+                "type": "timer", "name": name, "labels": dict(key),
+                "count": count, "total": total, "avg": total / count, "max": max_, "last": last,
+            }
+            for name, key, (count, total, max_, last) in sorted(timers)
+        ]
+        records += [
+            {"type": "counter", "name": name, "labels": dict(key), "value": value}
+            for name, key, value in sorted(counters)
+        ]
+        return records
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 노출 형식으로 집계를 반환합니다."""
+        lines = []
+        declared = set()
+        for record in self.snapshot():
+            labels = _format_labels(sorted(record["labels"].items()))
+            if record["type"] == "timer":
+                base = f"{METRIC_PREFIX}_{record['name']}_seconds"
+                if base not in declared:
+                    declared.add(base)
+                    lines.append(f"# TYPE {base} summary")
+                    lines.append(f"# TYPE {base}_max gauge")
+                lines.append(f"{base}_count{labels} {record['count']}")
+                lines.append(f"{base}_sum{labels} {record['total']:.6f}")
+                lines.append(f"{base}_max{labels} {record['max']:.6f}")
+            else:
+                base = f"{METRIC_PREFIX}_{record['name']}_total"
+                if base not in declared:
+                    declared.add(base)
+                    lines.append(f"# TYPE {base} counter")
+                lines.append(f"{base}{labels} {record['value']}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_process_start_time_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_process_start_time_seconds {self.started_at:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def json_text(self):
+        return json.dumps(
+            {"exported_at": time.time(), "started_at": self.started_at, "metrics": self.snapshot()},
+            ensure_ascii=False, indent=2
+        )
+
+    def write_prometheus(self, path):
+        """수집기가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+
+# 프로세스 전체가 공유하는 기본 집계
+METRICS = Metrics()
+
+
+def timer(name, **labels):
+    return METRICS.timer(name, **labels)
+
+
+def count(name, value=1, **labels):
+    METRICS.count(name, value, **labels)
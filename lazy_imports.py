@@ -0,0 +1,31 @@
+"""무거운 의존성을 처음 사용하는 시점에 불러오고 import에 걸린 시간을 기록합니다.
+
+gspread, openai, Google API 클라이언트처럼 import만으로 수백 ms가 걸리는 모듈은 앱을 시작할 때 불러오지 않고
+그 기능을 쓰는 페이지에서 lazy_import()로 가져옵니다. 기록된 시간은 import_times()로 확인합니다.
+"""
+import importlib
+import sys
+import threading
+import time
+
+_import_times = {}  # 모듈 이름 -> 처음 불러오는 데 걸린 초
+_lock = threading.Lock()
+
+
+def lazy_import(name):
+    """모듈을 불러와 반환합니다. 처음 불러올 때만 걸린 시간을 기록합니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - started
+    with _lock:
+        _import_times.setdefault(name, elapsed)
+    return module
+
+
+def import_times():
+    """{모듈 이름: 초}를 불러온 순서대로 반환합니다."""
+    with _lock:
+        return dict(_import_times)
@@ -0,0 +1,149 @@
+"""리마인더 이메일 일괄 발송 엔진."""
+import base64
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+from google_quota import GOOGLE_QUOTA, GMAIL_SEND
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TOKEN_PATH = 'token.pickle'
+
+
+def build_reminder_message(name, email, survey_url):
+    """리마인더 이메일을 Gmail API용 raw 메시지로 만듭니다."""
+    subject = f"[리마인더] {name}님, 만족도 조사에 참여해주세요"
+    body = f"""안녕하세요, {name}님
+
+아직 만족도 조사에 응답하지 않으신 것 같아 안내 드립니다.
+아래 링크를 통해 만족도 조사에 참여해주시면 감사하겠습니다.
+
+📝 만족도 조사 링크: {survey_url}
+
+귀중한 의견 부탁드립니다.
+감사합니다."""
+
+    message = MIMEMultipart()
+    message['to'] = email
+    message['subject'] = subject
+    message.attach(MIMEText(body, 'plain'))
+    return base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+
+
+def send_reminder_message(service, name, email, survey_url, http=None):
+    """이미 생성된 Gmail 서비스로 리마인더 한 건을 발송합니다. 실패 시 예외를 그대로 올립니다."""
+    raw_message = build_reminder_message(name, email, survey_url)
+    request = service.users().messages().send(userId='me', body={'raw': raw_message})
+    return request.execute(http=http) if http is not None else request.execute()
+
+
+class ReminderDispatcher:
+    """Gmail 서비스를 한 번만 만들고 제한된 워커 풀로 리마인더를 발송합니다.
+
+    googleapiclient의 서비스 객체는 httplib2 연결을 공유하므로 스레드 안전하지 않습니다.
+    http_factory가 주어지면 워커 스레드마다 별도의 인증된 http 객체를 만들어 사용합니다.
+    """
+
+    def __init__(self, service, http_factory=None, max_workers=DEFAULT_MAX_WORKERS,
+                 limiter=None, send_func=send_reminder_message):
+        self.service = service
+        self.http_factory = http_factory
+        self.max_workers = max(1, int(max_workers))
+        self.limiter = limiter or GOOGLE_QUOTA
+        self.send_func = send_func
+        self._local = threading.local()
+
+    def _thread_http(self):
+        if self.http_factory is None:
+            return None
+        if not hasattr(self._local, 'http'):
+            self._local.http = self.http_factory()
+        return self._local.http
+
+    def _send_one(self, name, email, survey_url):
+        started = time.monotonic()
+        try:
+            self.limiter.call(
+                GMAIL_SEND, "messages.send",
+                self.send_func, self.service, name, email, survey_url, http=self._thread_http()
+            )
+            return {"name": name, "email": email, "success": True, "error": None,
+                    "elapsed": time.monotonic() - started}
+        except Exception as e:
+            return {"name": name, "email": email, "success": False, "error": str(e),
+                    "elapsed": time.monotonic() - started}
+
+    def dispatch(self, recipients, survey_url, on_result=None):
+        """(이름, 이메일) 목록에 리마인더를 발송하고 (수신자별 결과, 처리량 통계)를 반환합니다.
+
+        on_result(result, done, total)는 호출한 스레드에서 실행되므로 Streamlit 위젯 갱신에 사용할 수 있습니다.
+        """
+        recipients = list(recipients)
+        total = len(recipients)
+        results = []
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(total, 1))) as executor:
+            futures = [
+                executor.submit(self._send_one, name, email, survey_url)
+                for name, email in recipients
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result:
+                    on_result(result, len(results), total)
+
+        elapsed = time.monotonic() - started
+        sent = sum(1 for r in results if r["success"])
+        stats = {
+            "total": total,
+            "sent": sent,
+            "failed": total - sent,
+            "elapsed": elapsed,
+            "throughput": (total / elapsed) if elapsed > 0 else 0.0,
+        }
+        return results, stats
+
+
+def load_saved_credentials(token_path=DEFAULT_TOKEN_PATH):
+    """저장된 Gmail 인증 정보(token.pickle)를 불러옵니다.
+
+    만료된 토큰은 갱신해서 다시 저장합니다. 브라우저 인증이 필요한 경우에는 None을 반환하므로
+    화면 없이 동작하는 백그라운드 작업에서 사용할 수 있습니다.
+    """
+    if not os.path.exists(token_path):
+        return None
+    with open(token_path, 'rb') as token:
+        creds = pickle.load(token)
+    if creds and not creds.valid and creds.expired and creds.refresh_token:
+        from google.auth.transport.requests import Request
+
+        creds.refresh(Request())
+        with open(token_path, 'wb') as token:
+            pickle.dump(creds, token)
+    return creds if creds and creds.valid else None
+
+
+def build_dispatcher(creds, max_workers=DEFAULT_MAX_WORKERS, limiter=None, service=None):
+    """인증 정보로 발송 엔진을 생성합니다. 워커 스레드마다 별도의 인증된 http 연결을 사용합니다.
+
+    service가 없으면 Gmail 서비스를 새로 만듭니다.
+    """
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+
+    if service is None:
+        from googleapiclient.discovery import build
+
+        service = build('gmail', 'v1', credentials=creds)
+    return ReminderDispatcher(
+        service,
+        http_factory=lambda: AuthorizedHttp(creds, http=httplib2.Http()),
+        max_workers=max_workers,
+        limiter=limiter
+    )
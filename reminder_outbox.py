@@ -0,0 +1,240 @@
+"""SQLite 기반 리마인더 발송함(outbox).
+
+(survey_id, 이메일, 캠페인) 단위로 발송 기록을 남겨 새로고침, 재실행, 프로세스 중단 이후에도
+남은 대상자에게만 이어서 발송합니다. 앱 화면, 스케줄러, CLI가 같은 파일을 동시에 비울 수 있으므로
+발송할 행은 먼저 'sending' 상태로 점유한 뒤 발송합니다.
+"""
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+
+DEFAULT_OUTBOX_PATH = 'reminder_outbox.db'
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_CLAIM_BATCH = 100           # 한 번에 점유할 행 수
+DEFAULT_CLAIM_TIMEOUT = 15 * 60     # 점유한 채 이 시간(초)이 지나면 중단된 발송으로 보고 다시 점유합니다
+
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+# 발송할 수 있는 행: 미발송이고 시도 횟수가 남았으며, 다른 발송이 점유 중이 아닌 행
+_SENDABLE = """
+    o.survey_id = :survey_id AND o.campaign = :campaign AND o.attempts < :max_attempts
+    AND (o.status IN ('pending', 'failed') OR (o.status = 'sending' AND o.claimed_at < :stale_before))
+    AND (:since IS NULL OR NOT EXISTS (
+        SELECT 1 FROM outbox s
+        WHERE s.email = o.email AND s.status = 'sent' AND s.sent_at >= :since
+    ))
+"""
+
+
+def normalize_email(email):
+    """발송함 키로 사용할 이메일을 정규화합니다."""
+    return str(email).strip().lower()
+
+
+def is_blank_email(email):
+    """비어 있거나 결측값(None, NaN, pd.NA)인 이메일인지 확인합니다."""
+    return not isinstance(email, str) or not email.strip()
+
+
+class ReminderOutbox:
+    """리마인더 발송 대기열과 발송 이력을 로컬 SQLite 파일에 보관합니다."""
+
+    def __init__(self, path=DEFAULT_OUTBOX_PATH, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 claim_batch=DEFAULT_CLAIM_BATCH, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.claim_batch = claim_batch
+        self.claim_timeout = claim_timeout
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_db(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    survey_id   TEXT NOT NULL,
+                    email       TEXT NOT NULL,
+                    campaign    TEXT NOT NULL,
+                    name        TEXT,
+                    survey_url  TEXT,
+                    status      TEXT NOT NULL DEFAULT 'pending',
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    last_error  TEXT,
+                    enqueued_at REAL NOT NULL,
+                    sent_at     REAL,
+                    claim_token TEXT,
+                    claimed_at  REAL,
+                    PRIMARY KEY (survey_id, email, campaign)
+                )
+            """)
+            # 점유 컬럼이 없던 이전 파일에 컬럼을 추가합니다
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}
+            for column, column_type in (("claim_token", "TEXT"), ("claimed_at", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE outbox ADD COLUMN {column} {column_type}")
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_outbox_sent ON outbox (email, sent_at)')
+
+    def enqueue(self, survey_id, campaign, recipients, survey_url):
+        """현재 미응답자 (이름, 이메일) 목록을 발송 대기열에 반영합니다. 이미 등록된 대상자와 이메일이 없는
+        대상자는 건너뜁니다.
+
+        이전 실행에서 남은 대기·실패 행 중 목록에 없는 대상자(그 사이 응답한 사람)는 지워서 보내지 않습니다.
+        새로 추가된 건수를 반환합니다.
+        """
+        now = time.time()
+        rows = [
+            (survey_id, normalize_email(email), campaign, name, survey_url, now)
+            for name, email in recipients
+            if not is_blank_email(email)
+        ]
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO outbox (survey_id, email, campaign, name, survey_url, enqueued_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            added = conn.total_changes - before
+
+            conn.execute("CREATE TEMP TABLE current_recipients (email TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO current_recipients VALUES (?)", [(row[1],) for row in rows])
+            conn.execute("""
+                DELETE FROM outbox
+                WHERE survey_id = ? AND campaign = ? AND status IN (?, ?)
+                  AND email NOT IN (SELECT email FROM current_recipients)
+            """, (survey_id, campaign, STATUS_PENDING, STATUS_FAILED))
+            return added
+
+    def _params(self, survey_id, campaign, cooldown_hours):
+        now = time.time()
+        return {
+            "survey_id": survey_id, "campaign": campaign, "max_attempts": self.max_attempts,
+            "stale_before": now - self.claim_timeout,
+            "since": now - cooldown_hours * 3600 if cooldown_hours else None,
+        }
+
+    def pending(self, survey_id, campaign, cooldown_hours=0):
+        """아직 발송되지 않은 대상자 (이름, 이메일) 목록을 반환합니다.
+
+        cooldown_hours가 주어지면 그 시간 안에 다른 리마인더를 받은 대상자는 제외합니다.
+        다른 발송이 점유 중인 대상자도 제외합니다.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT o.name, o.email FROM outbox o WHERE {_SENDABLE} ORDER BY o.enqueued_at",
+                self._params(survey_id, campaign, cooldown_hours)
+            ).fetchall()
+        return rows
+
+    def _claim(self, survey_id, campaign, cooldown_hours, token):
+        """발송할 행을 최대 claim_batch개 'sending' 상태로 점유하고 (이름, 이메일) 목록을 반환합니다.
+
+        이번 drain에서 이미 시도한 행(token이 같은 행)은 다시 점유하지 않습니다.
+        """
+        params = dict(self._params(survey_id, campaign, cooldown_hours), token=token,
+                      now=time.time(), limit=self.claim_batch)
+        with closing(self._connect()) as conn:
+            conn.isolation_level = None
+            # 다른 프로세스와 같은 행을 점유하지 않도록 조회와 갱신을 하나의 쓰기 트랜잭션으로 묶습니다
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"""
+                    UPDATE outbox SET status = 'sending', claim_token = :token, claimed_at = :now
+                    WHERE rowid IN (
+                        SELECT o.rowid FROM outbox o
+                        WHERE {_SENDABLE} AND o.claim_token IS NOT :token
+                        ORDER BY o.enqueued_at LIMIT :limit
+                    )
+                """, params)
+                rows = conn.execute("""
+                    SELECT name, email FROM outbox
+                    WHERE survey_id = :survey_id AND campaign = :campaign
+                      AND status = 'sending' AND claim_token = :token
+                    ORDER BY enqueued_at
+                """, params).fetchall()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def mark_sent(self, survey_id, campaign, email):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                UPDATE outbox SET status = ?, attempts = attempts + 1, sent_at = ?, last_error = NULL
+                WHERE survey_id = ? AND email = ? AND campaign = ?
+            """, (STATUS_SENT, time.time(), survey_id, normalize_email(email), campaign))
+
+    def mark_failed(self, survey_id, campaign, email, error):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ?
+                WHERE survey_id = ? AND email = ? AND campaign = ?
+            """, (STATUS_FAILED, error, survey_id, normalize_email(email), campaign))
+
+    def summary(self, survey_id, campaign):
+        """캠페인의 상태별 건수를 반환합니다."""
+        counts = {STATUS_PENDING: 0, STATUS_SENDING: 0, STATUS_SENT: 0, STATUS_FAILED: 0}
+        with closing(self._connect()) as conn:
+            for status, count in conn.execute("""
+                SELECT status, COUNT(*) FROM outbox
+                WHERE survey_id = ? AND campaign = ? GROUP BY status
+            """, (survey_id, campaign)):
+                counts[status] = count
+        return counts
+
+    def drain(self, dispatcher, survey_id, campaign, cooldown_hours=0, on_result=None):
+        """대기 중인 리마인더를 발송하고 결과를 즉시 기록합니다.
+
+        발송할 행을 claim_batch개씩 점유한 뒤 발송하므로 여러 프로세스가 같은 캠페인을 동시에 비워도 한 사람에게
+        두 번 보내지 않습니다. 발송 결과는 건별로 바로 저장되므로 중간에 중단되어도 다음 실행은 남은 대상자만
+        처리합니다.
+        """
+        total = len(self.pending(survey_id, campaign, cooldown_hours))
+        if not total:
+            return [], {"total": 0, "sent": 0, "failed": 0, "elapsed": 0.0, "throughput": 0.0}
+
+        survey_url = self._survey_url(survey_id, campaign)
+        token = uuid.uuid4().hex
+        results = []
+
+        def record(result, done, batch_total):
+            if result["success"]:
+                self.mark_sent(survey_id, campaign, result["email"])
+            else:
+                self.mark_failed(survey_id, campaign, result["email"], result["error"])
+            results.append(result)
+            if on_result:
+                on_result(result, len(results), max(total, len(results)))
+
+        started = time.monotonic()
+        while True:
+            batch = self._claim(survey_id, campaign, cooldown_hours, token)
+            if not batch:
+                break
+            dispatcher.dispatch(batch, survey_url, on_result=record)
+
+        elapsed = time.monotonic() - started
+        sent = sum(1 for r in results if r["success"])
+        stats = {
+            "total": len(results),
+            "sent": sent,
+            "failed": len(results) - sent,
+            "elapsed": elapsed,
+            "throughput": (len(results) / elapsed) if elapsed > 0 else 0.0,
+        }
+        return results, stats
+
+    def _survey_url(self, survey_id, campaign):
+        with closing(self._connect()) as conn:
+            row = conn.execute("""
+                SELECT survey_url FROM outbox WHERE survey_id = ? AND campaign = ? LIMIT 1
+            """, (survey_id, campaign)).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,289 @@
+"""Survey별 리마인더 자동 발송 스케줄러.
+
+스케줄은 발송함과 같은 SQLite 파일에 저장하고, Streamlit 재실행과 무관한 백그라운드 스레드가 주기적으로
+마감 전 Survey의 미응답자를 찾아 발송함을 통해 리마인더를 보냅니다. 화면은 스케줄 상태와 결과만 읽습니다.
+같은 파일을 쓰는 별도 프로세스에서 run_due()를 호출해 워커로 돌릴 수도 있습니다.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from reminder_outbox import DEFAULT_OUTBOX_PATH
+from respondent_matching import find_non_respondents
+
+DEFAULT_POLL_INTERVAL = 60        # 초
+DEFAULT_RETRY_DELAY = 15 * 60     # 오류 후 다시 시도할 때까지 (초)
+DEFAULT_INTERVAL_HOURS = 24
+DEFAULT_MAX_REMINDERS = 3
+DEFAULT_COOLDOWN_HOURS = 12
+
+# 리마인더를 보내려면 대상자 명단에 있어야 하는 컬럼
+REQUIRED_ROSTER_COLUMNS = ['이름', '이메일']
+
+STATUS_ACTIVE = 'active'
+STATUS_PAUSED = 'paused'
+STATUS_COMPLETED = 'completed'
+
+logger = logging.getLogger('survey.scheduler')
+
+_COLUMNS = [
+    "survey_id", "survey_name", "survey_url", "roster_id", "interval_hours", "deadline", "max_reminders",
+    "reminders_sent", "next_run", "last_run", "last_result", "status", "created_at",
+]
+
+
+def missing_roster_columns(df_students):
+    """대상자 명단에 없는 필수 컬럼 목록을 반환합니다. 스케줄을 저장하기 전에 확인합니다."""
+    return [col for col in REQUIRED_ROSTER_COLUMNS if col not in df_students.columns]
+
+
+class ScheduleStore:
+    """Survey별 리마인더 스케줄을 SQLite에 보관합니다."""
+
+    def __init__(self, path=DEFAULT_OUTBOX_PATH):
+        self.path = path
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_db(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS reminder_schedule (
+                    survey_id      TEXT PRIMARY KEY,
+                    survey_name    TEXT,
+                    survey_url     TEXT,
+                    roster_id      TEXT NOT NULL,
+                    interval_hours REAL NOT NULL,
+                    deadline       REAL,
+                    max_reminders  INTEGER NOT NULL,
+                    reminders_sent INTEGER NOT NULL DEFAULT 0,
+                    next_run       REAL NOT NULL,
+                    last_run       REAL,
+                    last_result    TEXT,
+                    status         TEXT NOT NULL DEFAULT 'active',
+                    created_at     REAL NOT NULL
+                )
+            """)
+
+    def _row(self, row):
+        schedule = dict(zip(_COLUMNS, row))
+        schedule["last_result"] = json.loads(schedule["last_result"]) if schedule["last_result"] else None
+        return schedule
+
+    def save(self, survey_id, survey_name, survey_url, roster_id, interval_hours=DEFAULT_INTERVAL_HOURS,
+             deadline=None, max_reminders=DEFAULT_MAX_REMINDERS, start_at=None):
+        """스케줄을 만들거나 설정을 바꿉니다. 기존 스케줄의 발송 횟수와 결과는 유지합니다."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                INSERT INTO reminder_schedule
+                    (survey_id, survey_name, survey_url, roster_id, interval_hours, deadline, max_reminders,
+                     next_run, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (survey_id) DO UPDATE SET
+                    survey_name = excluded.survey_name,
+                    survey_url = excluded.survey_url,
+                    roster_id = excluded.roster_id,
+                    interval_hours = excluded.interval_hours,
+                    deadline = excluded.deadline,
+                    max_reminders = excluded.max_reminders,
+                    next_run = excluded.next_run,
+                    status = excluded.status
+            """, (survey_id, survey_name, survey_url, roster_id, interval_hours, deadline, max_reminders,
+                  start_at if start_at is not None else now, STATUS_ACTIVE, now))
+
+    def get(self, survey_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM reminder_schedule WHERE survey_id = ?", (survey_id,)
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def all(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM reminder_schedule ORDER BY next_run"
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def roster_links(self):
+        """스케줄에 연결된 {survey_id: 대상자 명단 시트 ID}를 반환합니다."""
+        with closing(self._connect()) as conn:
+            return dict(conn.execute("SELECT survey_id, roster_id FROM reminder_schedule"))
+
+    def due(self, now=None):
+        """실행할 때가 된 활성 스케줄 목록을 반환합니다."""
+        now = now if now is not None else time.time()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM reminder_schedule WHERE status = ? AND next_run <= ?"
+                " ORDER BY next_run",
+                (STATUS_ACTIVE, now)
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def record_run(self, survey_id, result, next_run, reminders_sent=None, status=None):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                UPDATE reminder_schedule SET
+                    last_run = ?, last_result = ?, next_run = ?,
+                    reminders_sent = COALESCE(?, reminders_sent),
+                    status = COALESCE(?, status)
+                WHERE survey_id = ?
+            """, (time.time(), json.dumps(result, ensure_ascii=False), next_run, reminders_sent, status,
+                  survey_id))
+
+    def set_status(self, survey_id, status):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE reminder_schedule SET status = ? WHERE survey_id = ?", (status, survey_id))
+
+    def delete(self, survey_id):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM reminder_schedule WHERE survey_id = ?", (survey_id,))
+
+
+class ReminderScheduler:
+    """실행할 때가 된 스케줄마다 미응답자를 찾아 리마인더를 발송합니다.
+
+    load_records(sheet_id)는 API에서 새로 읽은 시트 DataFrame을 반환하고, 읽지 못하면 예외를 올려야 합니다
+    (SheetRepository.sync). 스냅샷이나 캐시의 지난 데이터로 미응답자를 찾으면 그 사이 응답한 사람에게도
+    발송하므로, 읽기에 실패한 회차는 발송하지 않고 잠시 뒤 다시 시도합니다.
+    dispatcher_factory()는 발송 엔진(없으면 None)을 반환합니다.
+    """
+
+    def __init__(self, store, outbox, load_records, dispatcher_factory,
+                 poll_interval=DEFAULT_POLL_INTERVAL, retry_delay=DEFAULT_RETRY_DELAY,
+                 cooldown_hours=DEFAULT_COOLDOWN_HOURS):
+        self.store = store
+        self.outbox = outbox
+        self.load_records = load_records
+        self.dispatcher_factory = dispatcher_factory
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.cooldown_hours = cooldown_hours
+        self.last_poll = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread = None
+
+    def run_schedule(self, schedule, now=None):
+        """스케줄 하나를 실행하고 기록한 결과를 반환합니다."""
+        now = now if now is not None else time.time()
+        survey_id = schedule["survey_id"]
+        round_no = schedule["reminders_sent"] + 1
+        result = {"at": now, "round": round_no}
+
+        if schedule["deadline"] and now >= schedule["deadline"]:
+            result["message"] = "마감 시각이 지나 스케줄을 종료했습니다."
+            self.store.record_run(survey_id, result, now, status=STATUS_COMPLETED)
+            return result
+        if schedule["reminders_sent"] >= schedule["max_reminders"]:
+            result["message"] = "최대 발송 횟수에 도달해 스케줄을 종료했습니다."
+            self.store.record_run(survey_id, result, now, status=STATUS_COMPLETED)
+            return result
+
+        try:
+            df_students = self.load_records(schedule["roster_id"])
+            df_survey = self.load_records(survey_id)
+            if df_students is None or df_survey is None:
+                raise RuntimeError("대상자 명단 또는 응답 시트를 불러올 수 없습니다.")
+            missing = missing_roster_columns(df_students)
+            if missing:
+                # 다시 시도해도 성공하지 않으므로 스케줄을 일시 중지하고 다음 스케줄로 넘어갑니다
+                result["error"] = f"대상자 명단에 {', '.join(missing)} 컬럼이 없어 스케줄을 일시 중지했습니다."
+                logger.warning("리마인더 스케줄 %s: %s", survey_id, result["error"])
+                self.store.record_run(survey_id, result, now, status=STATUS_PAUSED)
+                return result
+            non_respondents = find_non_respondents(df_students, df_survey)
+            result["non_respondents"] = len(non_respondents)
+
+            if len(non_respondents) == 0:
+                result["message"] = "모든 대상자가 응답해 스케줄을 종료했습니다."
+                self.store.record_run(survey_id, result, now, status=STATUS_COMPLETED)
+                return result
+
+            dispatcher = self.dispatcher_factory()
+            if dispatcher is None:
+                raise RuntimeError("저장된 Gmail 인증 정보가 없습니다. 리마인더 페이지에서 한 번 인증해주세요.")
+
+            campaign = f"auto-{round_no}"
+            self.outbox.enqueue(
+                survey_id, campaign,
+                zip(non_respondents['이름'], non_respondents['이메일']),
+                schedule["survey_url"]
+            )
+            # 발송 간격보다 긴 재발송 제한은 다음 회차를 막으므로 간격 이내로 줄입니다
+            cooldown_hours = min(self.cooldown_hours, schedule["interval_hours"])
+            _, stats = self.outbox.drain(dispatcher, survey_id, campaign, cooldown_hours=cooldown_hours)
+            result.update({"campaign": campaign, "sent": stats["sent"], "failed": stats["failed"]})
+            result["message"] = f"{stats['sent']}명에게 발송했습니다."
+
+            next_run = now + schedule["interval_hours"] * 3600
+            done = round_no >= schedule["max_reminders"] or (
+                schedule["deadline"] and next_run >= schedule["deadline"]
+            )
+            self.store.record_run(
+                survey_id, result, next_run, reminders_sent=round_no,
+                status=STATUS_COMPLETED if done else None
+            )
+        except Exception as e:
+            # 일시적인 오류는 발송 횟수를 늘리지 않고 잠시 뒤 다시 시도합니다
+            result["error"] = str(e)
+            logger.warning("리마인더 스케줄 %s 실행 실패: %s", survey_id, e)
+            self.store.record_run(survey_id, result, now + self.retry_delay)
+        return result
+
+    def run_due(self, now=None):
+        """실행할 때가 된 스케줄을 모두 처리하고 결과 목록을 반환합니다.
+
+        스케줄 하나가 실패해도 나머지 스케줄은 계속 처리합니다.
+        """
+        with self._run_lock:
+            self.last_poll = time.time()
+            results = []
+            for schedule in self.store.due(now):
+                try:
+                    results.append(self.run_schedule(schedule, now))
+                except Exception as e:
+                    logger.exception("리마인더 스케줄 %s를 실행하지 못했습니다", schedule["survey_id"])
+                    results.append({"at": now if now is not None else time.time(), "error": str(e)})
+            return results
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_due()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self):
+        """백그라운드 스레드를 시작합니다. 이미 실행 중이면 아무것도 하지 않습니다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """다음 폴링을 기다리지 않고 바로 확인하도록 깨웁니다."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
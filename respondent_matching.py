@@ -0,0 +1,202 @@
+"""응답자-대상자 매칭 엔진.
+
+대상자 명단과 응답 데이터의 신원 정보를 벡터 연산으로 정규화한 뒤, 응답 쪽 키의 해시 인덱스에 대해
+정해진 순서의 키(이메일 → 이름+소속)로 차례대로 매칭합니다. 행 단위 파이썬 루프를 사용하지 않습니다.
+"""
+import numpy as np
+import pandas as pd
+
+# 매칭에 사용할 키 (앞에서부터 순서대로 시도)
+DEFAULT_MATCH_KEYS = [("이메일",), ("이름", "소속")]
+
+MATCHED_COLUMN = "응답 여부"
+METHOD_COLUMN = "매칭 기준"
+ROSTER_COLUMN = "대상자 목록"
+
+_KEY_SEPARATOR = "\x1f"
+_GMAIL_SUFFIX = "@gmail.com"
+
+
+def _nfkc(series):
+    """ASCII가 아닌 값에만 NFKC 정규화를 적용합니다 (정규화는 값마다 파이썬에서 처리되므로)."""
+    s = series.astype("string")
+    non_ascii = ~s.str.isascii().fillna(True)
+    if non_ascii.any():
+        s = s.mask(non_ascii, s[non_ascii].str.normalize("NFKC"))
+    return s
+
+
+def normalize_text(series):
+    """이름, 소속 등을 비교할 수 있도록 정규화합니다 (유니코드 NFKC, 공백 정리, 소문자)."""
+    s = _nfkc(series)
+    s = s.str.replace(r"\s+", " ", regex=True).str.strip().str.casefold()
+    return s.mask(s == "")
+
+
+def normalize_email(series):
+    """이메일을 정규화합니다.
+
+    대소문자와 공백을 정리하고 '+태그' 별칭을 제거하며, Gmail 주소는 로컬 부분의 점을 무시합니다.
+    형식이 올바르지 않은 값은 결측값이 됩니다.
+    """
+    s = _nfkc(series).str.strip().str.lower()
+    valid = s.str.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+").fillna(False)
+    s = s.str.replace(r"\+[^@]*@", "@", regex=True)
+    s = s.str.replace(r"@googlemail\.com$", _GMAIL_SUFFIX, regex=True)
+    is_gmail = s.str.endswith(_GMAIL_SUFFIX).fillna(False)
+    s = s.mask(is_gmail, s.str.slice(0, -len(_GMAIL_SUFFIX)).str.replace(".", "", regex=False) + _GMAIL_SUFFIX)
+    return s.mask(~valid | s.str.startswith("@").fillna(False))
+
+
+def _normalizer(column):
+    return normalize_email if column == "이메일" else normalize_text
+
+
+def build_key(df, columns):
+    """여러 컬럼을 정규화해 하나의 매칭 키로 합칩니다. 구성 값 중 하나라도 비어 있으면 결측값입니다."""
+    key = None
+    for col in columns:
+        part = _normalizer(col)(df[col])
+        key = part if key is None else key + _KEY_SEPARATOR + part
+    return key
+
+
+def match_respondents(df_students, df_survey, keys=DEFAULT_MATCH_KEYS):
+    """대상자별 응답 여부와 매칭에 사용된 키를 계산합니다.
+
+    df_students에 '응답 여부'(bool)와 '매칭 기준'(예: '이메일', '이름+소속', 미응답이면 결측값)
+    컬럼을 추가한 사본을 반환합니다. 양쪽 모두에 있는 컬럼으로 이루어진 키만 사용합니다.
+
+    뒤쪽 키는 앞선 키 값이 없는 대상자에게만, 앞선 키로 대상자와 이어지지 않은 응답에 대해서만 씁니다.
+    이메일이 있는 대상자는 이메일로만 매칭하므로, 이름과 소속이 같은 다른 사람의 응답으로 응답 처리되지 않습니다.
+    """
+    result = df_students.copy()
+    matched = np.zeros(len(result), dtype=bool)
+    eligible = np.ones(len(result), dtype=bool)        # 앞선 키 값이 없는 대상자
+    response_open = np.ones(len(df_survey), dtype=bool)  # 앞선 키로 대상자와 이어지지 않은 응답
+    method = pd.Series(pd.NA, index=result.index, dtype="string")
+
+    for columns in keys:
+        if not all(col in df_students.columns and col in df_survey.columns for col in columns):
+            continue
+        if not (eligible & ~matched).any():
+            break
+
+        student_keys = build_key(result, list(columns)).astype(object)
+        response_keys = build_key(df_survey, columns).astype(object)
+
+        # 응답 쪽 키의 해시 인덱스 (object 인덱스의 해시 조회가 Arrow 문자열 isin보다 훨씬 빠릅니다)
+        response_index = pd.Index(response_keys[response_open].dropna().unique(), dtype=object)
+        candidates = eligible & ~matched & student_keys.notna().to_numpy()
+        hit = np.zeros(len(result), dtype=bool)
+        hit[candidates] = response_index.get_indexer(student_keys[candidates]) >= 0
+
+        matched |= hit
+        method[hit] = "+".join(columns)
+
+        roster_index = pd.Index(student_keys.dropna().unique(), dtype=object)
+        response_open &= roster_index.get_indexer(response_keys) < 0
+        eligible &= student_keys.isna().to_numpy()
+
+    result[MATCHED_COLUMN] = matched
+    result[METHOD_COLUMN] = method
+    return result
+
+
+def match_summary(matched_df):
+    """매칭 기준별 인원 수를 반환합니다 (미응답 포함)."""
+    return matched_df[METHOD_COLUMN].fillna("미응답").value_counts()
+
+
+def find_non_respondents(df_students, df_survey, keys=DEFAULT_MATCH_KEYS):
+    """미응답자 목록을 찾습니다."""
+    if df_students is None or df_survey is None:
+        return pd.DataFrame()
+
+    matched = match_respondents(df_students, df_survey, keys)
+    return df_students[~matched[MATCHED_COLUMN]]
+
+
+def response_matrix(rosters, surveys, keys=DEFAULT_MATCH_KEYS):
+    """여러 대상자 명단과 여러 Survey의 참여자 × Survey 응답 여부 행렬을 계산합니다.
+
+    rosters와 surveys는 {이름: DataFrame} 딕셔너리입니다. 모든 명단을 합쳐 정규화된 신원으로 중복을
+    제거한 참여자 목록을 만들고, Survey별 응답 키를 한 번에 쌓아 키마다 한 번의 조인으로 응답 여부를 채웁니다.
+    반환값은 참여자 정보, 참여자가 속한 명단 이름 목록('대상자 목록', list), Survey별 bool 컬럼으로 이루어진
+    DataFrame입니다.
+    """
+    frames = [
+        df.assign(**{ROSTER_COLUMN: name})
+        for name, df in rosters.items() if df is not None and not df.empty
+    ]
+    if not frames:
+        return pd.DataFrame()
+    participants = pd.concat(frames, ignore_index=True)
+
+    # 같은 사람이 여러 명단에 있으면 한 행으로 합치고 소속 명단을 모두 남깁니다
+    identity = None
+    for columns in keys:
+        if all(col in participants.columns for col in columns):
+            key = build_key(participants, columns)
+            identity = key if identity is None else identity.fillna(key)
+    merged = None
+    if identity is not None:
+        identity = identity.fillna(pd.Series(participants.index.astype(str), index=participants.index))
+        shared = identity.duplicated(keep=False)
+        keep = ~identity.duplicated()
+        if shared.any():
+            roster_names = participants.loc[shared].groupby(
+                identity[shared].to_numpy(), sort=False
+            )[ROSTER_COLUMN].agg(lambda names: list(dict.fromkeys(names)))
+            merged = identity[keep & shared].map(roster_names)
+        participants = participants[keep]
+
+    # 명단 이름에 구분자나 특수 문자가 있어도 정확히 고를 수 있도록 이름 목록(list)으로 둡니다
+    roster_lists = pd.Series(
+        [[name] for name in participants[ROSTER_COLUMN].to_numpy()], index=participants.index, dtype=object
+    )
+    if merged is not None:
+        roster_lists.loc[merged.index] = merged.to_numpy()
+    participants = participants.assign(**{ROSTER_COLUMN: roster_lists}).reset_index(drop=True)
+
+    survey_names = list(surveys)
+    status = np.zeros((len(participants), len(survey_names)), dtype=bool)
+    # match_respondents와 같은 규칙: 뒤쪽 키는 앞선 키 값이 없는 참여자와 앞선 키로 이어지지 않은 응답에만 씁니다
+    eligible = np.ones_like(status)
+    response_open = {i: np.ones(len(df), dtype=bool) for i, df in enumerate(surveys.values()) if df is not None}
+
+    for columns in keys:
+        if not all(col in participants.columns for col in columns):
+            continue
+        people_keys = build_key(participants, columns).astype(object)
+        known = pd.Index(people_keys.dropna().unique(), dtype=object)
+        # 모든 Survey의 응답 키를 (키, Survey 번호) 형태로 쌓습니다
+        stacked, used = [], []
+        for i, df in enumerate(surveys.values()):
+            if df is None or not all(col in df.columns for col in columns):
+                continue
+            response_keys = build_key(df, columns).astype(object)
+            stacked.append(pd.DataFrame({"key": response_keys[response_open[i]].to_numpy(), "survey": i}))
+            response_open[i] &= known.get_indexer(response_keys) < 0
+            used.append(i)
+        if not stacked:
+            continue
+        responses = pd.concat(stacked, ignore_index=True).dropna().drop_duplicates()
+        people = pd.DataFrame({"key": people_keys.to_numpy(), "row": np.arange(len(participants))}).dropna()
+        pairs = people.merge(responses, on="key", how="inner")
+        rows, cols = pairs["row"].to_numpy(), pairs["survey"].to_numpy()
+        hit = eligible[rows, cols]
+        status[rows[hit], cols[hit]] = True
+        eligible[np.ix_(np.flatnonzero(people_keys.notna().to_numpy()), used)] = False
+
+    matrix = participants.copy()
+    for i, name in enumerate(survey_names):
+        matrix[name] = status[:, i]
+    return matrix
+
+
+def completion_by_department(matrix, survey_names, department_column="소속"):
+    """소속별·Survey별 응답률(%)을 계산합니다."""
+    if matrix.empty or department_column not in matrix.columns:
+        return pd.DataFrame()
+    return matrix.groupby(department_column)[list(survey_names)].mean().mul(100).round(1)
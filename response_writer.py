@@ -0,0 +1,125 @@
+"""설문 응답 write-behind 버퍼.
+
+제출된 응답을 먼저 로컬 스풀 파일에 기록하고, 건수나 시간 기준에 도달하면 append_rows 한 번으로 묶어 저장합니다.
+시트 저장이 끝난 행만 스풀에서 지우므로 최소 한 번(at-least-once) 저장이 보장됩니다.
+"""
+import atexit
+import json
+import os
+import threading
+
+from google_quota import GOOGLE_QUOTA, SHEETS_WRITE
+
+DEFAULT_SPOOL_PATH = 'response_spool.jsonl'
+DEFAULT_MAX_BATCH = 50
+DEFAULT_FLUSH_INTERVAL = 5.0  # 초
+
+
+class ResponseWriter:
+    """응답 행을 모아 Google Sheets에 일괄 저장합니다.
+
+    open_worksheet는 저장할 워크시트를 반환하는 함수이며 처음 한 번만 호출되고 결과는 재사용됩니다.
+    """
+
+    def __init__(self, open_worksheet, spool_path=DEFAULT_SPOOL_PATH,
+                 max_batch=DEFAULT_MAX_BATCH, flush_interval=DEFAULT_FLUSH_INTERVAL, limiter=None):
+        self.open_worksheet = open_worksheet
+        self.limiter = limiter or GOOGLE_QUOTA
+        self.spool_path = spool_path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._worksheet = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self.last_error = None
+        self.flushed = 0
+        self._pending = self._load_spool()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _load_spool(self):
+        """이전 실행에서 저장하지 못한 응답을 불러옵니다."""
+        if not os.path.exists(self.spool_path):
+            return []
+        with open(self.spool_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _rewrite_spool(self):
+        tmp_path = f"{self.spool_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for row in self._pending:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spool_path)
+
+    def submit(self, row):
+        """응답 한 행을 스풀에 기록합니다. 디스크에 기록된 뒤에 반환합니다."""
+        with self._lock:
+            with open(self.spool_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending.append(row)
+            if len(self._pending) >= self.max_batch:
+                self._wakeup.set()
+
+    @property
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _get_worksheet(self):
+        if self._worksheet is None:
+            self._worksheet = self.open_worksheet()
+        return self._worksheet
+
+    def flush(self):
+        """대기 중인 응답을 모두 저장합니다. 저장한 행 수를 반환하며 실패하면 예외를 올립니다."""
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = list(self._pending[:self.max_batch])
+                if not batch:
+                    return total
+                try:
+                    worksheet = self._get_worksheet()
+                    self.limiter.call(SHEETS_WRITE, "append_rows", worksheet.append_rows, batch)
+                except Exception as e:
+                    # 시트가 삭제되었을 수 있으므로 다음 시도에서 다시 찾습니다
+                    self._worksheet = None
+                    self.last_error = str(e)
+                    raise
+                with self._lock:
+                    del self._pending[:len(batch)]
+                    self._rewrite_spool()
+                self.last_error = None
+                self.flushed += len(batch)
+                total += len(batch)
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break  # 남은 응답은 close()가 저장합니다
+            try:
+                self.flush()
+            except Exception:
+                self._wakeup.wait(self.flush_interval)  # last_error에 기록되어 있으며 다음 주기에 재시도합니다
+
+    def close(self):
+        """백그라운드 저장을 멈추고 남은 응답을 저장합니다. 실패한 행은 스풀에 남아 다음 실행 때 저장됩니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        try:
+            self.flush()
+        except Exception:
+            pass
@@ -0,0 +1,166 @@
+"""대상자 명단 업로드 수집 단계.
+
+CSV/Excel 파일을 청크 단위로 읽으면서 컬럼 형식을 작게 지정하고(소속은 범주형), 이메일 누락·형식 오류·중복을
+걸러 정제된 명단과 제외 내역을 함께 만듭니다.
+"""
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from respondent_matching import normalize_email
+
+DEFAULT_CHUNK_SIZE = 50_000
+REQUIRED_COLUMNS = ['이름', '이메일']
+ROSTER_DTYPES = {
+    '이름': 'string',
+    '소속': 'category',
+    '이메일': 'string',
+    '연락처': 'string',
+}
+
+ROW_COLUMN = '행 번호'
+REASON_COLUMN = '제외 사유'
+REASON_MISSING = '이메일 누락'
+REASON_INVALID = '이메일 형식 오류'
+REASON_DUPLICATE = '중복'
+
+# tracemalloc은 프로세스 전체에 하나뿐이므로 한 번에 한 업로드만 메모리를 잽니다
+_TRACE_LOCK = threading.Lock()
+
+
+def _apply_dtypes(chunk):
+    for col, dtype in ROSTER_DTYPES.items():
+        if col in chunk.columns:
+            chunk[col] = chunk[col].astype('string').str.strip().astype(dtype)
+    return chunk
+
+
+def iter_csv_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """CSV를 청크 단위로 읽습니다. 청크의 인덱스는 파일의 줄 번호(헤더가 1행)입니다."""
+    dtype = {col: 'string' for col in ROSTER_DTYPES}
+    # 빈 줄도 읽은 뒤 버려야 줄 번호가 파일과 맞습니다
+    for chunk in pd.read_csv(file, chunksize=chunk_size, dtype=dtype, skip_blank_lines=False):
+        chunk.index = chunk.index + 2
+        yield chunk.dropna(how='all')
+
+
+def iter_excel_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """openpyxl 읽기 전용 모드로 첫 시트를 청크 단위로 읽습니다. 청크의 인덱스는 시트의 행 번호입니다."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        header_row = worksheet.min_row or 1
+        rows = worksheet.iter_rows(min_row=header_row, values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(col).strip() if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+        batch, row_numbers = [], []
+        for row_number, row in enumerate(rows, start=header_row + 1):
+            if all(v is None for v in row):
+                continue
+            batch.append(row[:len(header)])
+            row_numbers.append(row_number)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=header, index=row_numbers)
+                batch, row_numbers = [], []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, index=row_numbers)
+    finally:
+        workbook.close()
+
+
+def _concat(frames, columns):
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    # 청크마다 범주가 다른 범주형 컬럼은 합집합 범주로 합칩니다
+    categorical = {
+        col: union_categoricals([f[col] for f in frames])
+        for col in frames[0].columns if isinstance(frames[0][col].dtype, pd.CategoricalDtype)
+    }
+    df = pd.concat(frames, ignore_index=True)
+    for col, values in categorical.items():
+        df[col] = pd.Categorical(values)
+    return df
+
+
+def ingest_roster(file, filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """업로드된 명단 파일을 읽어 (정제된 명단, 제외 내역, 처리 보고서)를 반환합니다.
+
+    필수 컬럼이 없으면 ValueError를 올립니다. 보고서의 peak_memory는 처리 중 추적된 최대 메모리(바이트)이며,
+    다른 업로드가 메모리를 재는 중이거나 다른 곳에서 이미 추적 중이면 서로 간섭하지 않도록 None입니다.
+    """
+    started = time.monotonic()
+    tracing = _TRACE_LOCK.acquire(blocking=False)
+    if tracing and tracemalloc.is_tracing():
+        _TRACE_LOCK.release()
+        tracing = False
+    if tracing:
+        tracemalloc.start()
+    peak = None
+
+    try:
+        chunks = (iter_csv_chunks if filename.lower().endswith('.csv') else iter_excel_chunks)(file, chunk_size)
+        accepted, rejected = [], []
+        seen = pd.Index([], dtype=object)
+        rows_read = 0
+        columns = None
+
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+                missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+                if missing:
+                    raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+            chunk = _apply_dtypes(chunk)
+            # 청크 인덱스는 원본 파일의 행 번호이므로 제외 내역에 그대로 쓰고, 이후 처리는 순번 인덱스로 합니다
+            source_rows = chunk.index.to_numpy()
+            chunk.index = pd.RangeIndex(rows_read, rows_read + len(chunk))
+            rows_read += len(chunk)
+
+            raw = chunk['이메일']
+            keys = normalize_email(raw)
+            reason = pd.Series(pd.NA, index=chunk.index, dtype='string')
+            reason = reason.mask(raw.isna() | (raw == ''), REASON_MISSING)
+            reason = reason.mask(reason.isna() & keys.isna(), REASON_INVALID)
+
+            # 이전 청크와 현재 청크 안에서 정규화된 이메일 기준으로 중복을 찾습니다
+            valid = reason.isna()
+            valid_keys = keys[valid].astype(object)
+            duplicate = (seen.get_indexer(valid_keys) >= 0) | valid_keys.duplicated().to_numpy()
+            reason[valid_keys.index[duplicate]] = REASON_DUPLICATE
+            seen = seen.append(pd.Index(valid_keys[~duplicate]))
+
+            ok = reason.isna().to_numpy()
+            accepted.append(chunk[ok])
+            if not ok.all():
+                bad = chunk[~ok].copy()
+                bad.insert(0, REASON_COLUMN, reason[~ok])
+                bad.insert(0, ROW_COLUMN, source_rows[~ok])
+                rejected.append(bad)
+
+        columns = columns or []
+        df_clean = _concat(accepted, columns)
+        df_rejected = _concat(rejected, [ROW_COLUMN, REASON_COLUMN] + columns)
+        if tracing:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if tracing:
+            tracemalloc.stop()
+            _TRACE_LOCK.release()
+
+    report = {
+        "rows_read": rows_read,
+        "accepted": len(df_clean),
+        "rejected": len(df_rejected),
+        "reasons": df_rejected[REASON_COLUMN].value_counts().to_dict() if len(df_rejected) else {},
+        "peak_memory": peak,
+        "result_memory": int(df_clean.memory_usage(deep=True).sum()),
+        "elapsed": time.monotonic() - started,
+    }
+    return df_clean.reset_index(drop=True), df_rejected.reset_index(drop=True), report
@@ -0,0 +1,110 @@
+"""등록된 Survey/대상자 시트 목록과 시트 메타데이터를 보관하는 로컬 레지스트리.
+
+세션이나 서버가 바뀌어도 목록이 유지되며, 시트 저장소가 동기화할 때마다 행 수, 헤더, 마지막 동기화 시각,
+리비전을 함께 기록합니다. 목록 화면과 대시보드는 API를 호출하지 않고 이 메타데이터만 읽습니다.
+"""
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+DEFAULT_REGISTRY_PATH = 'sheet_registry.db'
+
+KIND_SURVEY = 'survey'
+KIND_TARGET = 'target'
+
+
+class SheetRegistry:
+    """종류(survey/target)별 시트 목록을 SQLite에 보관합니다.
+
+    리비전은 동기화 때 행 수나 헤더, 데이터가 바뀐 것이 확인될 때마다 1씩 올라가는 로컬 번호입니다.
+    """
+
+    def __init__(self, path=DEFAULT_REGISTRY_PATH):
+        self.path = path
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_db(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sheets (
+                    kind      TEXT NOT NULL,
+                    id        TEXT NOT NULL,
+                    name      TEXT NOT NULL,
+                    url       TEXT NOT NULL,
+                    added_at  REAL NOT NULL,
+                    PRIMARY KEY (kind, id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sheet_meta (
+                    id        TEXT PRIMARY KEY,
+                    row_count INTEGER,
+                    header    TEXT,
+                    last_sync REAL,
+                    revision  INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def add(self, kind, sheet_id, name, url):
+        """시트를 등록합니다. 이미 등록된 시트이면 이름과 URL만 바꿉니다."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                INSERT INTO sheets (kind, id, name, url, added_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, id) DO UPDATE SET name = excluded.name, url = excluded.url
+            """, (kind, sheet_id, name, url, time.time()))
+
+    def remove(self, kind, sheet_id):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sheets WHERE kind = ? AND id = ?", (kind, sheet_id))
+            # 다른 종류로도 등록되어 있지 않으면 메타데이터도 지웁니다
+            conn.execute("""
+                DELETE FROM sheet_meta WHERE id = ? AND NOT EXISTS (SELECT 1 FROM sheets WHERE id = ?)
+            """, (sheet_id, sheet_id))
+
+    def sheets(self, kind):
+        """등록 순서대로 시트 목록을 반환합니다.
+
+        각 항목은 name, url, id와 메타데이터 row_count, header, last_sync, revision을 담습니다.
+        아직 동기화하지 않은 시트의 메타데이터는 None입니다.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT s.name, s.url, s.id, m.row_count, m.header, m.last_sync, COALESCE(m.revision, 0)
+                FROM sheets s LEFT JOIN sheet_meta m ON m.id = s.id
+                WHERE s.kind = ? ORDER BY s.added_at
+            """, (kind,)).fetchall()
+        return [
+            {
+                "name": name, "url": url, "id": sheet_id,
+                "row_count": row_count,
+                "header": json.loads(header) if header else None,
+                "last_sync": last_sync,
+                "revision": revision,
+            }
+            for name, url, sheet_id, row_count, header, last_sync, revision in rows
+        ]
+
+    def record_sync(self, sheet_id, header, row_count, fetched_at=None, changed=True):
+        """시트 동기화 결과를 기록합니다. 등록되지 않은 시트는 무시합니다."""
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        header_json = json.dumps(list(header or []), ensure_ascii=False)
+        with closing(self._connect()) as conn, conn:
+            if not conn.execute("SELECT 1 FROM sheets WHERE id = ? LIMIT 1", (sheet_id,)).fetchone():
+                return
+            conn.execute("""
+                INSERT INTO sheet_meta (id, row_count, header, last_sync, revision) VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT (id) DO UPDATE SET
+                    revision = revision + (
+                        CASE WHEN ? OR row_count IS NOT excluded.row_count OR header IS NOT excluded.header
+                        THEN 1 ELSE 0 END
+                    ),
+                    row_count = excluded.row_count,
+                    header = excluded.header,
+                    last_sync = excluded.last_sync
+            """, (sheet_id, row_count, header_json, fetched_at, bool(changed)))
@@ -0,0 +1,384 @@
+"""Google Sheets 공용 데이터 접근 계층.
+
+모든 페이지가 이 저장소를 통해 시트를 읽으며, 시트 ID별로 TTL과 LRU 크기 제한이 있는 캐시를 공유합니다.
+응답 시트는 행이 추가되기만 하므로 TTL이 지나면 새로 추가된 행만 가져와 캐시된 DataFrame에 이어 붙입니다.
+스냅샷 저장소가 주어지면 가져온 데이터를 디스크에 보관해 콜드 스타트와 API 장애 시에 사용합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from google_quota import GOOGLE_QUOTA, SHEETS_READ
+from instrumentation import count
+
+DEFAULT_TTL = 60          # 초
+# 캐시할 시트 수. 응답 매트릭스와 대시보드가 등록된 시트를 한 번에 모두 불러오므로 수십 개 과정의
+# Survey와 대상자 목록이 밀려나지 않도록 여유 있게 둡니다 (이전 값 32)
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_FETCH_WORKERS = 8
+
+
+def _column_letter(n):
+    """열 번호(1부터)를 A1 표기의 열 문자로 바꿉니다."""
+    from gspread.utils import rowcol_to_a1
+
+    return rowcol_to_a1(1, n).rstrip('0123456789')
+
+
+def _pad_row(row, width):
+    row = list(row[:width])
+    return row + [''] * (width - len(row))
+
+
+def records_frame(header, rows):
+    """시트 값 목록을 get_all_records()와 같은 규칙(숫자 변환)으로 DataFrame으로 만듭니다."""
+    from gspread.utils import numericise_all
+
+    width = len(header)
+    values = [numericise_all(_pad_row(row, width)) for row in rows]
+    return pd.DataFrame(values, columns=header)
+
+
+class SheetRepository:
+    """시트 ID를 키로 하는 TTL/LRU 캐시를 가진 시트 저장소입니다.
+
+    incremental=True이면 만료된 시트는 마지막으로 동기화한 행 이후만 가져옵니다.
+    헤더가 바뀌었거나 시트가 줄어든 경우에만 전체를 다시 읽습니다.
+    snapshot_store가 있으면 캐시에 없는 시트는 스냅샷을 먼저 반환하고 백그라운드에서 갱신하며,
+    API 호출이 실패하면 마지막으로 성공한 데이터를 읽기 전용으로 반환합니다.
+    반환되는 DataFrame은 캐시와 공유되므로 호출하는 쪽에서 수정하지 않아야 합니다.
+    on_sync(sheet_id, header, row_count, fetched_at, changed)가 주어지면 API에서 가져올 때마다 호출합니다.
+    API 호출은 limiter(기본: 프로세스 공유 GOOGLE_QUOTA)의 Sheets 읽기 할당량 안에서 재시도와 함께 이루어집니다.
+    """
+
+    def __init__(self, client_factory, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 incremental=True, snapshot_store=None, on_sync=None, limiter=None):
+        self.client_factory = client_factory
+        self.limiter = limiter or GOOGLE_QUOTA
+        self.on_sync = on_sync
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.incremental = incremental
+        self.snapshot_store = snapshot_store
+        self._cache = OrderedDict()  # sheet_id -> (fetched_at, DataFrame)
+        self._sync_state = {}        # sheet_id -> {"header", "row_count", "last_row"}
+        self._freshness = {}         # sheet_id -> {"source", "fetched_at", "error"}
+        self._lock = threading.Lock()
+        self._fetch_locks = {}       # sheet_id -> [조회 잠금, 잠금을 기다리거나 잡고 있는 스레드 수]
+        self._stale = set()          # 무효화된 뒤 아직 API에서 다시 읽지 않은 시트
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.rows_fetched = 0
+
+    def _client(self):
+        client = self.client_factory()
+        if not client:
+            raise RuntimeError("Google Sheets API 클라이언트를 생성할 수 없습니다.")
+        return client
+
+    def _fetch(self, sheet_id, previous=None):
+        client = self._client()
+        worksheet = self.limiter.call(SHEETS_READ, "open_by_key", client.open_by_key, sheet_id).sheet1
+        state = self._sync_state.get(sheet_id)
+        if self.incremental and previous is not None and state:
+            df = self._sync_incremental(sheet_id, worksheet, previous, state)
+            if df is not None:
+                return df
+        return self._sync_full(sheet_id, worksheet)
+
+    def _sync_full(self, sheet_id, worksheet):
+        values = self.limiter.call(SHEETS_READ, "get_all_values", worksheet.get_all_values)
+        self.full_syncs += 1
+        if not values:
+            self._sync_state.pop(sheet_id, None)
+            return pd.DataFrame()
+        header, rows = values[0], values[1:]
+        self.rows_fetched += len(rows)
+        self._sync_state[sheet_id] = {
+            "header": header,
+            "row_count": len(rows),
+            "last_row": _pad_row(rows[-1], len(header)) if rows else None,
+        }
+        return records_frame(header, rows)
+
+    def _sync_incremental(self, sheet_id, worksheet, previous, state):
+        """새로 추가된 행만 가져옵니다. 전체 동기화가 필요하면 None을 반환합니다."""
+        header, row_count = state["header"], state["row_count"]
+        if not header:
+            return None
+        # 마지막으로 읽은 행부터 다시 읽어 시트가 줄거나 수정되지 않았는지 함께 확인합니다
+        start = row_count + 1 if row_count else 2
+        header_range, new_range = self.limiter.call(
+            SHEETS_READ, "batch_get", worksheet.batch_get, ['1:1', f'A{start}:{_column_letter(len(header))}']
+        )
+        current_header = list(header_range[0]) if header_range else []
+        if current_header != header:
+            return None
+
+        rows = list(new_range)
+        if row_count:
+            if not rows or _pad_row(rows[0], len(header)) != state["last_row"]:
+                return None
+            rows = rows[1:]
+
+        self.incremental_syncs += 1
+        if not rows:
+            return previous
+
+        self.rows_fetched += len(rows)
+        state["row_count"] = row_count + len(rows)
+        state["last_row"] = _pad_row(rows[-1], len(header))
+        return pd.concat([previous, records_frame(header, rows)], ignore_index=True)
+
+    def _lookup(self, sheet_id):
+        """(DataFrame, 유효 여부)를 반환합니다. 만료된 항목도 증분 동기화를 위해 돌려줍니다."""
+        entry = self._cache.get(sheet_id)
+        if entry is None:
+            return None, False
+        fetched_at, df = entry
+        if time.monotonic() - fetched_at > self.ttl:
+            return df, False
+        self._cache.move_to_end(sheet_id)
+        return df, True
+
+    def _store(self, sheet_id, df):
+        self._cache[sheet_id] = (time.monotonic(), df)
+        self._cache.move_to_end(sheet_id)
+        while len(self._cache) > self.max_entries:
+            evicted, _ = self._cache.popitem(last=False)
+            self._sync_state.pop(evicted, None)
+            self._freshness.pop(evicted, None)
+            # 잠금을 잡고 있거나 기다리는 스레드가 있으면 남겨 두어 같은 시트를 두 번 조회하지 않게 합니다
+            entry = self._fetch_locks.get(evicted)
+            if entry is not None and not entry[1]:
+                del self._fetch_locks[evicted]
+            self.evictions += 1
+
+    @contextmanager
+    def _fetch_lock(self, sheet_id):
+        """시트별 조회 잠금을 잡습니다. 같은 시트를 동시에 요청하면 한 번만 조회합니다.
+
+        잠금을 기다리는 스레드 수를 함께 세어, 아무도 쓰지 않고 캐시에도 없는 시트의 잠금만 지웁니다.
+        """
+        with self._lock:
+            entry = self._fetch_locks.setdefault(sheet_id, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1] and sheet_id not in self._cache and self._fetch_locks.get(sheet_id) is entry:
+                    del self._fetch_locks[sheet_id]
+
+    def get_records(self, sheet_id):
+        """시트의 전체 레코드를 DataFrame으로 반환합니다. 캐시가 유효하면 API를 호출하지 않습니다."""
+        with self._lock:
+            df, fresh = self._lookup(sheet_id)
+            if fresh:
+                self.hits += 1
+                count("cache_requests", cache="sheets", result="hit")
+                return df
+
+        with self._fetch_lock(sheet_id):
+            with self._lock:
+                df, fresh = self._lookup(sheet_id)
+                if fresh:
+                    self.hits += 1
+                    count("cache_requests", cache="sheets", result="hit")
+                    return df
+                self.misses += 1
+                count("cache_requests", cache="sheets", result="miss")
+            if df is None and self.snapshot_store is not None:
+                df = self._load_snapshot(sheet_id)
+                if df is not None and sheet_id not in self._stale:
+                    # 스냅샷으로 먼저 화면을 그리고 최신 데이터는 백그라운드에서 가져옵니다
+                    threading.Thread(
+                        target=self._refresh, args=(sheet_id,), daemon=True
+                    ).start()
+                    return df
+            return self._refresh_locked(sheet_id, df)
+
+    def sync(self, sheet_id):
+        """캐시 유효 여부와 관계없이 API에서 시트를 갱신해 반환합니다. 리마인더 발송이나 배치 작업처럼
+        최신 데이터가 꼭 필요할 때 씁니다.
+
+        캐시나 스냅샷에 이전 데이터가 있으면 증분 동기화합니다. get_records()와 달리 API 호출이 실패하면
+        이전 데이터를 반환하지 않고 예외를 올립니다.
+        """
+        with self._fetch_lock(sheet_id):
+            with self._lock:
+                df, _ = self._lookup(sheet_id)
+            if df is None and self.snapshot_store is not None:
+                df = self._load_snapshot(sheet_id)
+            df = self._refresh_locked(sheet_id, df)
+            error = self._freshness.get(sheet_id, {}).get("error")
+            if error:
+                raise RuntimeError(error)
+            return df
+
+    def _refresh(self, sheet_id):
+        """백그라운드에서 시트를 갱신합니다."""
+        with self._fetch_lock(sheet_id):
+            with self._lock:
+                df, fresh = self._lookup(sheet_id)
+            if fresh:
+                return
+            try:
+                self._refresh_locked(sheet_id, df)
+            except Exception:
+                pass  # 오류는 freshness()로 확인할 수 있습니다
+
+    def _refresh_locked(self, sheet_id, previous):
+        """시트를 가져와 캐시에 저장합니다. 호출하는 쪽에서 시트별 조회 잠금을 잡고 있어야 합니다."""
+        try:
+            df = self._fetch(sheet_id, previous=previous)
+        except Exception as e:
+            if previous is None:
+                raise
+            # API에 연결할 수 없으면 마지막 데이터를 읽기 전용으로 사용하고 TTL 동안 재시도하지 않습니다
+            last = self._freshness.get(sheet_id, {})
+            self._freshness[sheet_id] = {
+                "source": "snapshot" if last.get("source") == "snapshot" else "cache",
+                "fetched_at": last.get("fetched_at"),
+                "error": str(e),
+            }
+            with self._lock:
+                self._store(sheet_id, previous)
+            return previous
+
+        fetched_at = time.time()
+        self._freshness[sheet_id] = {"source": "live", "fetched_at": fetched_at, "error": None}
+        with self._lock:
+            self._stale.discard(sheet_id)
+            self._store(sheet_id, df)
+        if self.snapshot_store is not None and df is not previous:
+            self.snapshot_store.save(
+                sheet_id, df, sync_state=self._sync_state.get(sheet_id), fetched_at=fetched_at
+            )
+        if self.on_sync is not None:
+            # 증분 동기화에서 새 DataFrame이 나왔다면 행이 추가되었거나 시트가 수정된 것입니다
+            changed = previous is not None and df is not previous
+            try:
+                self.on_sync(sheet_id, list(df.columns), len(df), fetched_at, changed)
+            except Exception:
+                pass  # 메타데이터 기록 실패로 조회를 실패시키지 않습니다
+        return df
+
+    def _load_snapshot(self, sheet_id):
+        df, meta = self.snapshot_store.load(sheet_id)
+        if df is None:
+            return None
+        if meta.get("sync_state"):
+            self._sync_state[sheet_id] = meta["sync_state"]
+        self._freshness[sheet_id] = {
+            "source": "snapshot", "fetched_at": meta.get("fetched_at"), "error": None
+        }
+        with self._lock:
+            # 만료된 항목으로 넣어 두어 다음 조회 때 증분 동기화합니다
+            self._cache[sheet_id] = (float('-inf'), df)
+        return df
+
+    def freshness(self, sheet_id):
+        """시트 데이터의 출처(live/snapshot/cache), 가져온 시각, 마지막 오류를 반환합니다."""
+        return dict(self._freshness.get(sheet_id, {}))
+
+    def fetch_many(self, sheet_ids, max_workers=DEFAULT_FETCH_WORKERS, timeout=None, sheet_timeout=None,
+                   refresh=False):
+        """여러 시트를 제한된 스레드 풀로 동시에 가져옵니다.
+
+        ({sheet_id: DataFrame}, {sheet_id: 오류 메시지})를 반환합니다. timeout(초)은 전체 대기 한도이고,
+        sheet_timeout(초)은 조회를 시작한 시트 하나가 걸릴 수 있는 한도입니다. 한도 안에 끝나지 않은 시트는
+        오류로 보고하며, 나머지 결과는 그대로 반환합니다. refresh=True이면 캐시 대신 sync()로 API에서 갱신하고,
+        갱신에 실패한 시트는 이전 데이터가 있어도 오류로 보고합니다.
+        """
+        sheet_ids = list(dict.fromkeys(sheet_ids))
+        frames, errors = {}, {}
+        if not sheet_ids:
+            return frames, errors
+
+        started = {}
+
+        def fetch(sheet_id):
+            started[sheet_id] = time.monotonic()
+            return self.sync(sheet_id) if refresh else self.get_records(sheet_id)
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(sheet_ids)))
+        futures = {executor.submit(fetch, sheet_id): sheet_id for sheet_id in sheet_ids}
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            limits = [deadline - now] if deadline is not None else []
+            if sheet_timeout is not None:
+                limits += [
+                    started[futures[f]] + sheet_timeout - now for f in pending if futures[f] in started
+                ]
+                limits.append(0.1)  # 아직 시작하지 않은 시트가 시작되는지 확인합니다
+            done, pending = wait(pending, timeout=max(0, min(limits)) if limits else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                sheet_id = futures[future]
+                try:
+                    frames[sheet_id] = future.result()
+                except Exception as e:
+                    errors[sheet_id] = str(e)
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                for future in pending:
+                    errors[futures[future]] = "시간 초과"
+                break
+            if sheet_timeout is not None:
+                expired = {
+                    f for f in pending
+                    if futures[f] in started and now - started[futures[f]] >= sheet_timeout
+                }
+                for future in expired:
+                    errors[futures[future]] = "시간 초과"
+                pending -= expired
+        # 끝나지 않은 조회는 기다리지 않습니다 (완료되면 캐시에 저장됩니다)
+        executor.shutdown(wait=False, cancel_futures=True)
+        return frames, errors
+
+    def invalidate(self, sheet_id=None, full=False):
+        """시트 캐시를 만료시킵니다. sheet_id가 없으면 전체가 대상입니다.
+
+        기본적으로 다음 조회 때 증분 동기화하며, full=True이거나 증분 동기화를 쓰지 않으면 동기화 상태와
+        스냅샷까지 지워 전체를 다시 읽습니다. 증분 동기화에 쓰려고 남겨 둔 스냅샷도 다음 조회 때 그대로
+        반환하지 않고 API에서 갱신한 뒤 반환합니다.
+        """
+        with self._lock:
+            keys = list(self._cache) if sheet_id is None else [sheet_id]
+            for key in keys:
+                self._stale.add(key)
+                if full or not self.incremental:
+                    self._cache.pop(key, None)
+                    self._sync_state.pop(key, None)
+                    if self.snapshot_store is not None:
+                        self.snapshot_store.delete(key)
+                elif key in self._cache:
+                    self._cache[key] = (float('-inf'), self._cache[key][1])
+
+    def stats(self):
+        """캐시 적중/미스 통계를 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._cache),
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "full_syncs": self.full_syncs,
+                "incremental_syncs": self.incremental_syncs,
+                "rows_fetched": self.rows_fetched,
+            }
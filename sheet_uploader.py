@@ -0,0 +1,208 @@
+"""대상자 명단을 Google Sheets에 청크 단위로 병렬 업로드합니다.
+
+워크시트 크기를 한 번에 맞춘 뒤 행 범위별로 나눠 동시에 기록하고, 실패한 청크만 따로 재시도합니다.
+스프레드시트를 만든 직후부터 진행 파일에 작업을 남겨 두므로 중간에 끊긴 업로드를 같은 스프레드시트에 이어서
+올릴 수 있습니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from google_quota import GOOGLE_QUOTA, SHEETS_READ, SHEETS_WRITE
+
+DEFAULT_CHUNK_SIZE = 5_000
+DEFAULT_UPLOAD_WORKERS = 4
+DEFAULT_PROGRESS_DIR = 'upload_progress'
+
+
+def frame_fingerprint(df):
+    """명단 내용으로 업로드 작업 키를 만듭니다. 같은 파일을 다시 올리면 같은 키가 나옵니다."""
+    h = hashlib.sha1()
+    h.update("\x1f".join(map(str, df.columns)).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df.astype(object), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def chunk_values(chunk):
+    """청크를 시트에 보낼 2차원 리스트로 바꿉니다. 결측값(pd.NA)은 JSON으로 보낼 수 없으므로 빈 칸으로 둡니다."""
+    return chunk.astype(object).where(chunk.notna(), '').values.tolist()
+
+
+class UploadProgress:
+    """업로드 작업별 완료 청크를 JSON 파일로 기록합니다."""
+
+    def __init__(self, directory=DEFAULT_PROGRESS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def load(self, job_id):
+        path = self._path(job_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, job_id, state):
+        path = self._path(job_id)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+    def delete(self, job_id):
+        path = self._path(job_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class SheetUploader:
+    """DataFrame을 워크시트에 청크 단위로 기록합니다.
+
+    uploader.upload(worksheet, df, job_id)는 처리 보고서를 반환합니다. 실패한 청크가 남아 있으면 같은
+    job_id로 다시 호출해 나머지 청크만 올릴 수 있습니다.
+    """
+
+    def __init__(self, progress=None, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=DEFAULT_UPLOAD_WORKERS,
+                 limiter=None):
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.limiter = limiter or GOOGLE_QUOTA
+
+    def pending_job(self, job_id):
+        """이어서 올릴 수 있는 작업 상태를 반환합니다. 없으면 None입니다."""
+        if self.progress is None:
+            return None
+        return self.progress.load(job_id)
+
+    def _new_state(self, spreadsheet_id, df):
+        return {
+            "spreadsheet_id": spreadsheet_id,
+            "rows": len(df),
+            "chunk_size": self.chunk_size,
+            "resized": False,
+            "done": [],
+        }
+
+    def _save(self, job_id, state):
+        if self.progress is not None and job_id:
+            self.progress.save(job_id, state)
+
+    def start_job(self, job_id, spreadsheet_id, df):
+        """새 작업을 진행 파일에 기록합니다.
+
+        스프레드시트를 만든 직후에 호출하면 첫 청크를 올리기 전에 중단되어도 다음 실행이 같은 스프레드시트를
+        이어서 사용하므로 빈 스프레드시트가 남지 않습니다.
+        """
+        state = self._new_state(spreadsheet_id, df)
+        self._save(job_id, state)
+        return state
+
+    def discard_job(self, job_id):
+        """이어서 올릴 수 없는 작업 기록을 지웁니다."""
+        if self.progress is not None and job_id:
+            self.progress.delete(job_id)
+
+    def matches_job(self, state, worksheet, df):
+        """저장된 작업이 이 명단과 워크시트에 이어서 올릴 수 있는 작업인지 확인합니다.
+
+        청크 크기와 행 수가 같아야 하고, 첫 청크를 이미 올렸다면 워크시트의 헤더가 명단 컬럼과 같아야 합니다.
+        """
+        if state.get("chunk_size") != self.chunk_size or state.get("rows") != len(df):
+            return False
+        if 0 in state.get("done", []):
+            header = self.limiter.call(SHEETS_READ, "batch_get", worksheet.batch_get, ['1:1'])[0]
+            if not header or list(header[0]) != [str(col) for col in df.columns]:
+                return False
+        return True
+
+    def _write_chunk(self, worksheet, df, index, chunk_size):
+        from gspread.utils import rowcol_to_a1
+
+        start = index * chunk_size
+        chunk = df.iloc[start:start + chunk_size]
+        values = chunk_values(chunk)
+        first_row = start + 2  # 1행은 헤더
+        if index == 0:
+            values = [[str(col) for col in df.columns]] + values
+            first_row = 1
+        range_name = f"A{first_row}:{rowcol_to_a1(first_row + len(values) - 1, len(df.columns))}"
+
+        # 할당량 초과나 일시적 오류는 공유 제한기가 백오프하며 다시 시도합니다
+        self.limiter.call(SHEETS_WRITE, "update", worksheet.update, values, range_name=range_name)
+        return len(chunk)
+
+    def upload(self, worksheet, df, job_id=None, spreadsheet_id=None, on_progress=None):
+        """명단을 업로드하고 보고서를 반환합니다.
+
+        on_progress(완료 행 수, 전체 행 수)는 호출한 스레드에서 불립니다.
+        보고서 키: total_rows, uploaded_rows, chunks, failed_chunks, errors, elapsed, rows_per_sec, resumed
+        """
+        started = time.monotonic()
+        total_chunks = max(1, -(-len(df) // self.chunk_size))
+        state = self.pending_job(job_id) if job_id else None
+        if not (state and state.get("spreadsheet_id") in (None, spreadsheet_id)
+                and state.get("chunk_size") == self.chunk_size and state.get("rows") == len(df)):
+            state = self._new_state(spreadsheet_id, df)
+        resumed = bool(state["done"])
+        if not state.get("resized", True):
+            # 시트 크기를 미리 한 번만 맞춰 두면 청크마다 행을 늘리지 않아도 됩니다
+            self.limiter.call(
+                SHEETS_WRITE, "resize", worksheet.resize, rows=len(df) + 1, cols=max(1, len(df.columns))
+            )
+            state["resized"] = True
+            self._save(job_id, state)
+
+        done = set(state["done"])
+        remaining = [i for i in range(total_chunks) if i not in done]
+        resumed_rows = sum(
+            len(df.iloc[i * self.chunk_size:(i + 1) * self.chunk_size]) for i in done
+        )
+        uploaded_rows = resumed_rows
+        errors = {}
+
+        if remaining:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(remaining))) as executor:
+                futures = {
+                    executor.submit(self._write_chunk, worksheet, df, i, self.chunk_size): i
+                    for i in remaining
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        uploaded_rows += future.result()
+                        done.add(index)
+                        state["done"] = sorted(done)
+                        self._save(job_id, state)
+                    except Exception as e:
+                        errors[index] = str(e)
+                    if on_progress:
+                        on_progress(uploaded_rows, len(df))
+
+        if errors:
+            state["done"] = sorted(done)
+            self._save(job_id, state)
+        else:
+            self.discard_job(job_id)
+
+        elapsed = time.monotonic() - started
+        return {
+            "total_rows": len(df),
+            "uploaded_rows": uploaded_rows,
+            "chunks": total_chunks,
+            "failed_chunks": sorted(errors),
+            "errors": errors,
+            "elapsed": elapsed,
+            "rows_per_sec": (uploaded_rows - resumed_rows) / elapsed if elapsed > 0 else 0.0,
+            "resumed": resumed,
+        }
@@ -0,0 +1,111 @@
+"""Arrow IPC 기반 로컬 스냅샷 저장소.
+
+시트에서 가져온 응답/대상자 DataFrame을 시트 ID별 Arrow 파일로 보관합니다.
+앱을 새로 시작하거나 Google API에 연결할 수 없을 때에도 마지막 스냅샷으로 화면을 그릴 수 있습니다.
+"""
+import importlib.util
+import json
+import os
+import re
+import time
+
+from lazy_imports import lazy_import
+
+# pyarrow가 없으면 스냅샷 기능을 끕니다. 설치 여부만 확인하고 실제 import는 처음 읽고 쓸 때 합니다
+_PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+DEFAULT_SNAPSHOT_DIR = 'snapshots'
+_META_KEY = b'survey_snapshot'
+
+
+def mixed_columns(df):
+    """숫자와 문자열이 섞인 object 컬럼 목록을 반환합니다 (예: 빈 칸이 있는 숫자 컬럼)."""
+    mixed = []
+    for col in df.columns:
+        if df[col].dtype == 'object':
+            kinds = {type(v) for v in df[col].dropna()}
+            if len(kinds) > 1:
+                mixed.append(col)
+    return mixed
+
+
+class SnapshotStore:
+    """시트 ID별 스냅샷을 쓰고 메모리 매핑으로 읽습니다."""
+
+    def __init__(self, directory=DEFAULT_SNAPSHOT_DIR):
+        self.directory = directory
+        if self.available:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def available(self):
+        return _PYARROW_AVAILABLE
+
+    def _path(self, sheet_id):
+        safe_id = re.sub(r'[^a-zA-Z0-9_-]', '_', sheet_id)
+        return os.path.join(self.directory, f"{safe_id}.arrow")
+
+    def save(self, sheet_id, df, sync_state=None, fetched_at=None):
+        """DataFrame을 스냅샷으로 저장합니다. 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봅니다."""
+        if not self.available:
+            return False
+
+        mixed = mixed_columns(df)
+        frame = df.copy(deep=False)
+        for col in mixed:
+            frame[col] = frame[col].map(lambda v: v if v is None else str(v))
+
+        meta = {
+            "sheet_id": sheet_id,
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "rows": len(df),
+            "mixed_columns": mixed,
+            "sync_state": sync_state,
+        }
+        pa = lazy_import('pyarrow')
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _META_KEY: json.dumps(meta, ensure_ascii=False).encode('utf-8'),
+        })
+
+        path = self._path(sheet_id)
+        tmp_path = f"{path}.tmp"
+        # 메모리 매핑으로 바로 읽을 수 있도록 압축하지 않습니다
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return True
+
+    def load(self, sheet_id):
+        """스냅샷을 (DataFrame, 메타데이터)로 읽습니다. 없으면 (None, None)을 반환합니다."""
+        path = self._path(sheet_id)
+        if not self.available or not os.path.exists(path):
+            return None, None
+
+        pa = lazy_import('pyarrow')
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        meta = json.loads(table.schema.metadata[_META_KEY].decode('utf-8'))
+        df = table.to_pandas()
+        if meta.get("mixed_columns"):
+            from gspread.utils import numericise
+        for col in meta.get("mixed_columns", []):
+            df[col] = df[col].map(lambda v: v if v is None else numericise(v)).astype(object)
+        return df, meta
+
+    def info(self, sheet_id):
+        """데이터를 읽지 않고 스냅샷 메타데이터만 반환합니다."""
+        path = self._path(sheet_id)
+        if not self.available or not os.path.exists(path):
+            return None
+        pa = lazy_import('pyarrow')
+        with pa.memory_map(path, 'r') as source:
+            schema = pa.ipc.open_file(source).schema
+        return json.loads(schema.metadata[_META_KEY].decode('utf-8'))
+
+    def delete(self, sheet_id):
+        path = self._path(sheet_id)
+        if os.path.exists(path):
+            os.remove(path)
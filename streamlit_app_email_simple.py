@@ -1,24 +1,35 @@
 import streamlit as st
 import pandas as pd
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import os
 import time
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import re
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 import pickle
-import base64
 import json
 import datetime
-from urllib.parse import urlencode
-from openai import OpenAI
-import plotly.express as px
-import plotly.graph_objects as go
+# gspread, openai, Google API 클라이언트는 import 비용이 커서 사용하는 페이지에서 불러옵니다
+from lazy_imports import lazy_import, import_times
+from instrumentation import METRICS, timer
+from google_quota import GOOGLE_QUOTA, SHEETS_READ, SHEETS_WRITE, GMAIL_SEND, GMAIL_SEND_BURST, per_minute
+from reminder_engine import send_reminder_message, build_dispatcher, load_saved_credentials, DEFAULT_MAX_WORKERS
+from reminder_outbox import ReminderOutbox
+from reminder_scheduler import (
+    ReminderScheduler, ScheduleStore, missing_roster_columns, STATUS_ACTIVE, STATUS_PAUSED, STATUS_COMPLETED
+)
+from sheet_registry import SheetRegistry, KIND_SURVEY, KIND_TARGET
+from sheet_repository import SheetRepository, DEFAULT_TTL as SHEET_CACHE_TTL, DEFAULT_MAX_ENTRIES as SHEET_CACHE_SIZE
+from snapshot_store import SnapshotStore
+from response_writer import ResponseWriter
+from survey_aggregates import SummaryStore, SATISFACTION_ORDER
+from survey_charts import FigureCache, LIGHTWEIGHT_TOP_N, satisfaction_mix_bar
+from survey_export import EXPORT_FORMATS, export_frame, export_archive
+from survey_query import ResponseIndexStore
+from respondent_matching import (
+    match_respondents, find_non_respondents, match_summary, response_matrix, completion_by_department,
+    MATCHED_COLUMN, ROSTER_COLUMN
+)
+from roster_ingest import ingest_roster
+from sheet_uploader import SheetUploader, UploadProgress, frame_fingerprint
+from survey_generation import GenerationCache, stream_survey, run_variants, VARIANT_STYLES
 
 # 페이지 설정
 st.set_page_config(
@@ -28,15 +39,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+ROSTER_PREVIEW_ROWS = 100
+
 # 환경 변수 로드 대신 Streamlit secrets 사용
 # load_dotenv()  # 이 줄 제거
 
-# OpenAI API 키 설정
-if 'openai' in st.secrets:
-    client = OpenAI(api_key=st.secrets['openai']['api_key'])
-else:
-    client = None
-
 # Gmail API 스코프 설정
 SCOPES = [
     'https://www.googleapis.com/auth/gmail.send',
@@ -44,9 +51,27 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive.file'
 ]
 
+# 설문 응답 시트
+RESPONSE_SHEET_TITLE = "교육 만족도 조사 응답"
+RESPONSE_SHEET_HEADER = ["이름", "소속", "이메일", "만족도", "의견", "제출일시"]
+
+# 응답 현황 경량 모드 기준
+LIGHTWEIGHT_MIN_RESPONSES = 10000
+LIGHTWEIGHT_EAGER_CHARTS = 3
+
+# 메인 대시보드 실시간 현황 조회 한도
+DASHBOARD_FETCH_WORKERS = 8
+DASHBOARD_SHEET_TIMEOUT = 10   # 시트 하나당 (초)
+DASHBOARD_TIMEOUT = 20         # 전체 (초)
+
+# 진단 패널에서 화면별 호출 수를 보여줄 외부 서비스
+DIAGNOSTIC_SERVICES = {"sheets": "Sheets", "gmail": "Gmail", "openai": "OpenAI"}
+
 # Gmail API 서비스 초기화
 if 'gmail_service' not in st.session_state:
     st.session_state.gmail_service = None
+if 'gmail_credentials' not in st.session_state:
+    st.session_state.gmail_credentials = None
 
 # Google Sheets 관리 상태 초기화
 if 'survey_sheets' not in st.session_state:
@@ -62,51 +87,169 @@ def extract_sheet_id(url):
     return None
 
 @st.cache_resource
-def get_gspread_client():
-    """Google Sheets API 클라이언트를 생성합니다."""
+def create_gspread_client():
+    """Google Sheets API 클라이언트를 생성합니다. 실패하면 예외를 올리며, 예외는 캐시되지 않으므로 설정을 고치면 다시 시도합니다."""
     scope = ['https://spreadsheets.google.com/feeds',
              'https://www.googleapis.com/auth/drive']
     
+    # 서비스 계정 JSON 파일이 있는지 확인
+    if not os.path.exists('service_account.json'):
+        raise FileNotFoundError("서비스 계정 JSON 파일(service_account.json)이 없습니다.")
+    
+    gspread = lazy_import('gspread')
+    service_account = lazy_import('oauth2client.service_account')
+    creds = service_account.ServiceAccountCredentials.from_json_keyfile_name('service_account.json', scope)
+    return gspread.authorize(creds)
+
+def get_gspread_client():
+    """Google Sheets API 클라이언트를 반환합니다. 연결할 수 없으면 오류를 표시하고 None을 반환합니다."""
     try:
-        # 서비스 계정 JSON 파일이 있는지 확인
-        if not os.path.exists('service_account.json'):
-            st.error("서비스 계정 JSON 파일(service_account.json)이 없습니다.")
-            return None
-            
-        creds = ServiceAccountCredentials.from_json_keyfile_name('service_account.json', scope)
-        client = gspread.authorize(creds)
-        return client
+        return create_gspread_client()
+    except FileNotFoundError as e:
+        st.error(str(e))
+        return None
     except Exception as e:
         st.error(f"Google Sheets API 연결 오류: {str(e)}")
         return None
 
-@st.cache_data(ttl=60)  # 1분 캐시
+@st.cache_resource
+def get_sheet_registry():
+    """등록된 Survey/대상자 시트 목록과 메타데이터를 보관하는 레지스트리를 엽니다."""
+    return SheetRegistry()
+
+def load_registered_sheets():
+    """레지스트리에서 Survey/대상자 목록을 세션으로 불러옵니다. API를 호출하지 않습니다."""
+    registry = get_sheet_registry()
+    st.session_state.survey_sheets = registry.sheets(KIND_SURVEY)
+    st.session_state.target_sheets = registry.sheets(KIND_TARGET)
+
+def register_sheet(kind, name, url, sheet_id):
+    get_sheet_registry().add(kind, sheet_id, name, url)
+    load_registered_sheets()
+
+def unregister_sheet(kind, sheet_id):
+    get_sheet_registry().remove(kind, sheet_id)
+    load_registered_sheets()
+
+def format_sheet_meta(sheet, unit="행"):
+    """레지스트리에 기록된 행 수와 마지막 동기화 시각을 한 줄로 만듭니다."""
+    if sheet.get("last_sync") is None:
+        return "아직 동기화하지 않음"
+    synced = datetime.datetime.fromtimestamp(sheet["last_sync"]).strftime("%Y-%m-%d %H:%M")
+    return f"{sheet['row_count']:,}{unit} · {synced} 동기화 · 리비전 {sheet['revision']}"
+
+@st.cache_resource
+def get_sheet_repository():
+    """모든 페이지가 공유하는 시트 저장소(TTL/LRU 캐시)를 생성합니다."""
+    ttl, max_entries = SHEET_CACHE_TTL, SHEET_CACHE_SIZE
+    if 'sheet_cache' in st.secrets:
+        ttl = st.secrets['sheet_cache'].get('ttl', ttl)
+        max_entries = st.secrets['sheet_cache'].get('max_entries', max_entries)
+    snapshot_store = SnapshotStore()
+    return SheetRepository(
+        get_gspread_client, ttl=ttl, max_entries=max_entries,
+        snapshot_store=snapshot_store if snapshot_store.available else None,
+        on_sync=get_sheet_registry().record_sync
+    )
+
+@st.cache_resource
+def get_summary_store():
+    """시트별 응답 집계 요약 저장소를 생성합니다."""
+    return SummaryStore()
+
+@st.cache_resource
+def get_figure_cache():
+    """데이터 지문 기반 차트 캐시를 생성합니다."""
+    return FigureCache()
+
+@st.cache_resource
+def get_response_index_store():
+    """Raw Data 조회용 인덱스 저장소를 생성합니다."""
+    return ResponseIndexStore()
+
+def load_sheet_records(sheet_id):
+    """시트 저장소를 통해 시트 데이터를 DataFrame으로 불러옵니다."""
+    if not get_gspread_client():
+        return None
+    return get_sheet_repository().get_records(sheet_id)
+
+def show_data_freshness(sheet_id):
+    """스냅샷이나 마지막 캐시 데이터를 보여주는 중이면 안내합니다."""
+    freshness = get_sheet_repository().freshness(sheet_id)
+    if not freshness or freshness["source"] == "live":
+        return
+    fetched_at = freshness.get("fetched_at")
+    fetched_text = (
+        datetime.datetime.fromtimestamp(fetched_at).strftime("%Y-%m-%d %H:%M:%S")
+        if fetched_at else "알 수 없음"
+    )
+    if freshness.get("error"):
+        st.warning(f"⚠️ Google Sheets에 연결할 수 없어 {fetched_text} 기준 데이터를 읽기 전용으로 표시합니다.")
+    else:
+        st.caption(f"💾 {fetched_text}에 저장된 스냅샷입니다. 최신 데이터는 백그라운드에서 불러오고 있습니다.")
+
+def load_uploaded_roster(uploaded_file):
+    """업로드된 대상자 명단을 청크 단위로 읽고 검증 결과를 보여줍니다. 실패하면 None을 반환합니다."""
+    try:
+        df, df_rejected, report = ingest_roster(uploaded_file, uploaded_file.name)
+    except ImportError:
+        st.error("""
+            ### Excel 파일 처리를 위한 패키지가 필요합니다
+            터미널에서 다음 명령어를 실행하세요:
+            ```
+            pip install openpyxl
+            ```
+            설치 후 앱을 다시 실행하세요.
+        """)
+        return None
+    except ValueError as e:
+        st.error(f"파일 형식 오류: {str(e)}")
+        return None
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("읽은 행", f"{report['rows_read']:,}")
+    col2.metric("등록 대상", f"{report['accepted']:,}")
+    col3.metric("제외", f"{report['rejected']:,}")
+    col4.metric(
+        "최대 메모리", f"{report['peak_memory'] / 1024 ** 2:.1f}MB" if report['peak_memory'] is not None else "-"
+    )
+    st.caption(
+        f"명단 메모리 {report['result_memory'] / 1024 ** 2:.1f}MB · 처리 시간 {report['elapsed']:.2f}초"
+    )
+
+    if report['rejected']:
+        with st.expander(f"⚠️ 제외된 행 {report['rejected']:,}건"):
+            st.write(", ".join(f"{reason} {count:,}건" for reason, count in report['reasons'].items()))
+            st.dataframe(df_rejected.head(ROSTER_PREVIEW_ROWS), hide_index=True)
+            st.download_button(
+                "제외 내역 다운로드 (CSV)",
+                data=lambda: export_frame(df_rejected, "csv"),
+                file_name=f"{uploaded_file.name.rsplit('.', 1)[0]}_제외내역.csv",
+                mime="text/csv",
+                key=f"rejected_{uploaded_file.name}"
+            )
+
+    st.dataframe(df.head(ROSTER_PREVIEW_ROWS))
+    if len(df) > ROSTER_PREVIEW_ROWS:
+        st.caption(f"처음 {ROSTER_PREVIEW_ROWS}행만 표시합니다.")
+    return df
+
 def load_sheet_data(student_sheet_url, survey_sheet_url):
     """Google Sheets에서 데이터를 로드합니다."""
-    client = get_gspread_client()
-    if not client:
-        return None, None
-    
     try:
         # 교육생 명단 로드
         student_sheet_id = extract_sheet_id(student_sheet_url)
         if not student_sheet_id:
             st.error("올바른 교육생 명단 스프레드시트 URL이 아닙니다.")
             return None, None
-            
-        student_sheet = client.open_by_key(student_sheet_id).sheet1
-        students_data = student_sheet.get_all_records()
-        df_students = pd.DataFrame(students_data)
+        df_students = load_sheet_records(student_sheet_id)
         
         # 만족도 조사 응답 로드
         survey_sheet_id = extract_sheet_id(survey_sheet_url)
         if not survey_sheet_id:
             st.error("올바른 만족도 조사 스프레드시트 URL이 아닙니다.")
             return None, None
-            
-        survey_sheet = client.open_by_key(survey_sheet_id).sheet1
-        survey_data = survey_sheet.get_all_records()
-        df_survey = pd.DataFrame(survey_data)
+        df_survey = load_sheet_records(survey_sheet_id)
         
         return df_students, df_survey
     
@@ -176,27 +319,11 @@ def load_sample_data():
     
     return df_students, df_survey
 
-def find_non_respondents(df_students, df_survey):
-    """미응답자 목록을 찾습니다."""
-    if df_students is None or df_survey is None:
-        return pd.DataFrame()
-    
-    # 응답자 이메일 목록
-    respondent_emails = set(df_survey['이메일'].dropna())
-    
-    # 전체 교육생 이메일 목록
-    student_emails = set(df_students['이메일'].dropna())
-    
-    # 미응답자 찾기
-    non_respondent_emails = student_emails - respondent_emails
-    
-    # 미응답자 정보 가져오기
-    non_respondents = df_students[df_students['이메일'].isin(non_respondent_emails)]
-    
-    return non_respondents
+def get_gmail_credentials():
+    """Gmail API 인증 정보를 불러옵니다."""
+    if st.session_state.gmail_credentials is not None and st.session_state.gmail_credentials.valid:
+        return st.session_state.gmail_credentials
 
-def get_gmail_service():
-    """Gmail API 서비스 객체를 생성합니다."""
     creds = None
     
     if os.path.exists('token.pickle'):
@@ -205,7 +332,7 @@ def get_gmail_service():
     
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+            creds.refresh(lazy_import('google.auth.transport.requests').Request())
         else:
             if not os.path.exists('credentials.json'):
                 st.error("""
@@ -223,7 +350,7 @@ def get_gmail_service():
                 """)
                 return None
                 
-            flow = InstalledAppFlow.from_client_secrets_file(
+            flow = lazy_import('google_auth_oauthlib.flow').InstalledAppFlow.from_client_secrets_file(
                 'credentials.json', SCOPES)
             
             try:
@@ -236,14 +363,109 @@ def get_gmail_service():
         # 인증 정보 저장
         with open('token.pickle', 'wb') as token:
             pickle.dump(creds, token)
+
+    st.session_state.gmail_credentials = creds
+    return creds
+
+def get_gmail_service():
+    """Gmail API 서비스 객체를 생성합니다. 생성한 서비스는 세션에 보관해 재사용합니다."""
+    if st.session_state.gmail_service is not None:
+        return st.session_state.gmail_service
+
+    creds = get_gmail_credentials()
+    if not creds:
+        return None
     
     try:
-        service = build('gmail', 'v1', credentials=creds)
+        service = lazy_import('googleapiclient.discovery').build('gmail', 'v1', credentials=creds)
+        st.session_state.gmail_service = service
         return service
     except Exception as e:
         st.error(f"Gmail API 서비스 생성 실패: {str(e)}")
         return None
 
+@st.cache_resource
+def get_reminder_outbox():
+    """리마인더 발송함(SQLite)을 엽니다."""
+    return ReminderOutbox()
+
+@st.cache_resource
+def configure_google_quota():
+    """secrets의 google_quota 설정으로 프로세스 공유 할당량을 바꿉니다. 설정이 없으면 기본 할당량을 씁니다."""
+    if 'google_quota' not in st.secrets:
+        return GOOGLE_QUOTA
+    settings = st.secrets['google_quota']
+    if 'sheets_reads_per_minute' in settings:
+        GOOGLE_QUOTA.configure(SHEETS_READ, *per_minute(settings['sheets_reads_per_minute']))
+    if 'sheets_writes_per_minute' in settings:
+        GOOGLE_QUOTA.configure(SHEETS_WRITE, *per_minute(settings['sheets_writes_per_minute']))
+    if 'gmail_send_rate' in settings:
+        GOOGLE_QUOTA.configure(GMAIL_SEND, settings['gmail_send_rate'], settings.get('gmail_send_burst', GMAIL_SEND_BURST))
+    return GOOGLE_QUOTA
+
+@st.cache_resource
+def get_sheet_uploader():
+    """대상자 명단 업로드 엔진을 생성합니다. 진행 상황은 upload_progress/ 폴더에 기록합니다."""
+    return SheetUploader(progress=UploadProgress())
+
+def upload_roster(client, df, job_id, name):
+    """명단을 청크 단위로 업로드하고 보고서를 반환합니다. 중단된 작업이 있으면 같은 스프레드시트에 이어서 올립니다.
+
+    이어서 올릴 스프레드시트가 지워졌거나 명단과 맞지 않으면 작업 기록을 지우고 새 스프레드시트에 처음부터 올립니다.
+    """
+    uploader = get_sheet_uploader()
+    pending = uploader.pending_job(job_id)
+    sheet = None
+    if pending:
+        try:
+            sheet = GOOGLE_QUOTA.call(SHEETS_READ, "open_by_key", client.open_by_key, pending["spreadsheet_id"])
+            if not uploader.matches_job(pending, sheet.sheet1, df):
+                sheet = None
+        except Exception:
+            sheet = None
+        if sheet is None:
+            uploader.discard_job(job_id)
+            st.info("이전에 중단된 업로드를 이어갈 수 없어 새 스프레드시트에 처음부터 업로드합니다.")
+    if sheet is None:
+        sheet = GOOGLE_QUOTA.call(SHEETS_WRITE, "create", client.create, name)
+        # 첫 청크를 올리기 전에 중단되어도 다음 시도가 이 스프레드시트를 이어서 쓰도록 바로 기록합니다
+        uploader.start_job(job_id, sheet.id, df)
+
+    progress_bar = st.progress(0.0, text="업로드 준비 중...")
+
+    def on_progress(done, total):
+        progress_bar.progress(done / total if total else 1.0, text=f"{done:,} / {total:,}행 업로드")
+
+    report = uploader.upload(sheet.sheet1, df, job_id=job_id, spreadsheet_id=sheet.id, on_progress=on_progress)
+    report["spreadsheet_id"] = sheet.id
+    return report
+
+@st.cache_resource
+def get_reminder_scheduler():
+    """자동 리마인더 스케줄러를 만들고 백그라운드 스레드를 시작합니다.
+
+    백그라운드 스레드는 세션 상태에 접근할 수 없으므로 저장된 token.pickle로 Gmail에 인증합니다.
+    """
+    repository = get_sheet_repository()
+    
+    def dispatcher_factory():
+        creds = load_saved_credentials()
+        return build_dispatcher(creds) if creds else None
+    
+    scheduler = ReminderScheduler(
+        ScheduleStore(), get_reminder_outbox(), repository.sync, dispatcher_factory
+    )
+    scheduler.start()
+    return scheduler
+
+def get_reminder_dispatcher(max_workers=DEFAULT_MAX_WORKERS):
+    """인증 정보와 Gmail 서비스를 한 번만 만들어 리마인더 발송 엔진을 생성합니다."""
+    service = get_gmail_service()
+    if not service:
+        return None
+    # 워커 스레드마다 별도의 http 연결을 사용합니다 (httplib2는 스레드 안전하지 않음)
+    return build_dispatcher(st.session_state.gmail_credentials, max_workers=max_workers, service=service)
+
 def get_survey_url(base_url):
     """설문 URL을 생성합니다."""
     return f"{base_url}?page=survey"
@@ -256,23 +478,49 @@ def create_satisfaction_survey():
     survey_url = get_survey_url(base_url)
     return survey_url
 
+def open_response_worksheet(client):
+    """응답 시트를 찾고, 없으면 생성합니다."""
+    try:
+        sheet = GOOGLE_QUOTA.call(SHEETS_READ, "open", client.open, RESPONSE_SHEET_TITLE).sheet1
+    except lazy_import('gspread').SpreadsheetNotFound:
+        sheet = GOOGLE_QUOTA.call(SHEETS_WRITE, "create", client.create, RESPONSE_SHEET_TITLE).sheet1
+        # 헤더 추가
+        GOOGLE_QUOTA.call(SHEETS_WRITE, "append_row", sheet.append_row, RESPONSE_SHEET_HEADER)
+    return sheet
+
+@st.cache_resource
+def create_response_writer(_client):
+    """응답 저장용 write-behind 버퍼를 생성합니다. 응답 시트는 처음 저장할 때 한 번만 찾습니다."""
+    return ResponseWriter(lambda: open_response_worksheet(_client))
+
+def get_response_writer():
+    """응답 저장 버퍼를 반환합니다. Sheets에 연결할 수 없으면 None이며, 이 결과는 캐시하지 않습니다."""
+    client = get_gspread_client()
+    if not client:
+        return None
+    return create_response_writer(client)
+
+def show_response_writer_status():
+    """시트에 아직 저장하지 못한 응답과 마지막 저장 오류를 사이드바에 표시합니다."""
+    if not os.path.exists('service_account.json'):
+        return
+    writer = get_response_writer()
+    if not writer:
+        return
+    pending = writer.pending_count
+    if writer.last_error:
+        st.sidebar.warning(f"응답 {pending:,}건을 시트에 저장하지 못했습니다 (자동 재시도 중): {writer.last_error}")
+    elif pending:
+        st.sidebar.caption(f"응답 저장 대기 {pending:,}건")
+
 def save_survey_response(response_data):
-    """설문 응답을 Google Sheets에 저장합니다."""
+    """설문 응답을 저장 대기열에 넣습니다. 응답은 모아서 Google Sheets에 일괄 저장됩니다."""
     try:
-        client = get_gspread_client()
-        if not client:
+        writer = get_response_writer()
+        if not writer:
             return False
-            
-        # 응답 시트가 없으면 생성
-        try:
-            sheet = client.open("교육 만족도 조사 응답").sheet1
-        except:
-            sheet = client.create("교육 만족도 조사 응답").sheet1
-            # 헤더 추가
-            sheet.append_row(["이름", "소속", "이메일", "만족도", "의견", "제출일시"])
         
-        # 응답 저장
-        sheet.append_row([
+        writer.submit([
             response_data["이름"],
             response_data["소속"],
             response_data["이메일"],
@@ -292,30 +540,10 @@ def send_reminder_email(name, email, survey_url):
         if not service:
             return False
 
-        # 이메일 내용 생성
-        subject = f"[리마인더] {name}님, 만족도 조사에 참여해주세요"
-        body = f"""안녕하세요, {name}님
-
-아직 만족도 조사에 응답하지 않으신 것 같아 안내 드립니다.
-아래 링크를 통해 만족도 조사에 참여해주시면 감사하겠습니다.
-
-📝 만족도 조사 링크: {survey_url}
-
-귀중한 의견 부탁드립니다.
-감사합니다."""
-
-        # 이메일 메시지 생성
-        message = MIMEMultipart()
-        message['to'] = email
-        message['subject'] = subject
-        message.attach(MIMEText(body, 'plain'))
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
-
         try:
-            service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message}
-            ).execute()
+            GOOGLE_QUOTA.call(
+                GMAIL_SEND, "messages.send", send_reminder_message, service, name, email, survey_url
+            )
             return True
         except Exception as e:
             st.error(f"이메일 발송 실패: {str(e)}")
@@ -325,8 +553,35 @@ def send_reminder_email(name, email, survey_url):
         st.error(f"리마인더 이메일 처리 중 오류 발생: {str(e)}")
         return False
 
-def generate_survey_questions(target, purpose, requirements):
-    """OpenAI를 사용하여 Survey 문항을 생성합니다."""
+@st.cache_resource
+def get_openai_client():
+    """OpenAI 클라이언트를 처음 사용할 때 생성합니다. API 키가 없으면 None을 반환합니다."""
+    if 'openai' not in st.secrets:
+        return None
+    return lazy_import('openai').OpenAI(api_key=st.secrets['openai']['api_key'])
+
+@st.cache_resource
+def get_generation_cache():
+    """설문 문항 생성 결과 캐시를 생성합니다."""
+    return GenerationCache()
+
+def show_survey_question(number, question):
+    """생성된 문항 하나를 표시합니다."""
+    st.markdown(f"**{number}. {question.get('question', '')}**")
+    if question.get('type') in ['radio', 'checkbox']:
+        st.write("보기:")
+        for option in question.get('options', []):
+            st.write(f"- {option}")
+    st.write(f"유형: {question.get('type', '')}")
+    st.write(f"필수 여부: {'예' if question.get('required') else '아니오'}")
+    st.write("---")
+
+def generate_survey_questions(target, purpose, requirements, regenerate=False):
+    """OpenAI를 사용하여 Survey 문항을 생성합니다.
+
+    응답을 스트리밍으로 받아 문항이 완성되는 대로 화면에 표시합니다. 같은 입력이면 캐시된 결과를 사용합니다.
+    """
+    client = get_openai_client()
     if not client:
         st.error("""
             ### OpenAI API 키가 필요합니다
@@ -338,44 +593,105 @@ def generate_survey_questions(target, purpose, requirements):
         """)
         return None
     
+    status = st.empty()
+    status.info("⏳ OpenAI로부터 Survey 문항을 생성하는 중...")
+    title_placeholder = st.empty()
+    description_placeholder = st.empty()
+    st.subheader("추천 Survey 문항")
+    
     try:
-        # OpenAI API 호출
-        prompt = f"""
-        다음 조건에 맞는 설문조사 문항을 생성해주세요:
-
-        대상: {target}
-        목적: {purpose}
-        필수 포함 항목: {requirements}
-
-        다음 형식으로 JSON 응답을 생성해주세요:
-        {{
-            "title": "설문 제목",
-            "description": "설문 설명",
-            "questions": [
-                {{
-                    "type": "text/radio/checkbox/textarea",
-                    "question": "질문 내용",
-                    "required": true/false,
-                    "options": ["보기1", "보기2"] // type이 radio나 checkbox인 경우에만
-                }}
-            ]
-        }}
-        """
-
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates survey questions."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
-        )
-
-        # JSON 응답 파싱
-        survey_data = json.loads(response.choices[0].message.content)
+        count = 0
+        for event, value in stream_survey(
+            client, target, purpose, requirements,
+            cache=get_generation_cache(), regenerate=regenerate
+        ):
+            if event == "title":
+                title_placeholder.subheader(value)
+            elif event == "description":
+                description_placeholder.write(value)
+            elif event == "question":
+                count += 1
+                status.info(f"⏳ 문항 {count}개 생성됨...")
+                show_survey_question(count, value)
+            elif event == "done":
+                survey_data, info = value
+        
+        status.success("✨ Survey 문항이 생성되었습니다!")
+        title_placeholder.subheader(survey_data.get("title", ""))
+        description_placeholder.write(survey_data.get("description", ""))
+        
+        tokens = info["usage"].get("total_tokens", 0)
+        if info["cached"]:
+            st.caption(f"💾 같은 입력으로 생성한 결과를 캐시에서 불러왔습니다 (토큰 {tokens:,}개 절약).")
+        else:
+            col1, col2, col3 = st.columns(3)
+            first_question = info["first_question"]
+            col1.metric("첫 문항까지", f"{first_question:.1f}초" if first_question is not None else "-")
+            col2.metric("전체 생성 시간", f"{info['elapsed']:.1f}초")
+            col3.metric("사용 토큰", f"{tokens:,}")
+        if info["partial"] or info["skipped"]:
+            st.warning("⚠️ 응답 일부가 올바른 JSON이 아니어서 완성된 문항만 표시합니다.")
         return survey_data
         
     except Exception as e:
+        status.empty()
+        st.error(f"Survey 문항 생성 중 오류 발생: {str(e)}")
+        return None
+
+def generate_survey_variants(target, purpose, requirements, variant_count, regenerate=False):
+    """서로 다른 지침으로 여러 초안을 동시에 생성해 나란히 표시하고, 성공한 초안 목록을 반환합니다."""
+    if not get_openai_client():
+        st.error("OpenAI API 키가 필요합니다.")
+        return None
+    
+    variants = VARIANT_STYLES[:variant_count]
+    status = st.empty()
+    status.info(f"⏳ 초안 {len(variants)}개를 동시에 생성하는 중...")
+    columns = st.columns(len(variants))
+    placeholders = []
+    for col, (name, _) in zip(columns, variants):
+        with col:
+            st.markdown(f"#### {name}")
+            placeholder = st.empty()
+            placeholder.caption("생성 중...")
+            placeholders.append(placeholder)
+    
+    finished = 0
+    
+    def on_result(index, result):
+        nonlocal finished
+        finished += 1
+        status.info(f"⏳ 초안 {finished}/{len(variants)}개 완료")
+        with placeholders[index].container():
+            if result["error"]:
+                st.error(f"생성 실패: {result['error']}")
+                return
+            survey_data, info = result["survey"], result["info"]
+            st.caption("💾 캐시" if info["cached"] else f"{info['elapsed']:.1f}초 · 토큰 {info['usage'].get('total_tokens', 0):,}개")
+            st.subheader(survey_data.get("title", ""))
+            st.write(survey_data.get("description", ""))
+            for i, q in enumerate(survey_data.get("questions", []), 1):
+                show_survey_question(i, q)
+            st.download_button(
+                "JSON 다운로드",
+                json.dumps(survey_data, ensure_ascii=False, indent=2).encode('utf-8'),
+                f"survey_questions_{index + 1}.json",
+                "application/json",
+                key=f'download-json-{index}'
+            )
+    
+    try:
+        started = time.time()
+        results = run_variants(
+            lambda: lazy_import('openai').AsyncOpenAI(api_key=st.secrets['openai']['api_key']),
+            target, purpose, requirements,
+            variants=variants, cache=get_generation_cache(), regenerate=regenerate, on_result=on_result
+        )
+        drafts = [r["survey"] for r in results if r["survey"]]
+        status.success(f"✨ 초안 {len(drafts)}/{len(variants)}개를 {time.time() - started:.1f}초 만에 생성했습니다!")
+        return drafts
+    except Exception as e:
+        status.empty()
         st.error(f"Survey 문항 생성 중 오류 발생: {str(e)}")
         return None
 
@@ -393,35 +709,30 @@ def show_survey_creation():
         target = st.text_input("Survey 대상", placeholder="예: 교육 참가자, 신입사원, 프로젝트 팀원 등")
         purpose = st.text_area("Survey 목적", placeholder="예: 교육 만족도 평가, 업무 환경 개선을 위한 의견 수집 등")
         requirements = st.text_area("필수 포함 항목", placeholder="예: 만족도 5점 척도, 개선사항 의견, 재참여 의향 등")
+        variant_count = st.slider(
+            "초안 개수", 1, len(VARIANT_STYLES), 1,
+            help="2개 이상이면 " + ", ".join(name for name, _ in VARIANT_STYLES) + " 순서의 지침으로 초안을 동시에 생성합니다."
+        )
+        regenerate = st.checkbox("새로 생성 (캐시 사용 안 함)", help="같은 입력이라도 OpenAI로 문항을 다시 생성합니다.")
         submitted = st.form_submit_button("Survey 추천받기")
+    
+    cache_stats = get_generation_cache().stats()
+    if cache_stats["hits"]:
+        st.caption(
+            f"생성 캐시: 적중 {cache_stats['hits']}회 · 절약한 토큰 {cache_stats['tokens_saved']:,}개"
+        )
         
     if submitted:
         if not target or not purpose or not requirements:
             st.error("모든 항목을 입력해주세요.")
             return
             
-        with st.spinner("OpenAI로부터 Survey 문항을 생성하는 중..."):
-            survey_data = generate_survey_questions(target, purpose, requirements)
+        if variant_count > 1:
+            generate_survey_variants(target, purpose, requirements, variant_count, regenerate=regenerate)
+            return
+        survey_data = generate_survey_questions(target, purpose, requirements, regenerate=regenerate)
             
     if survey_data:
-        st.success("✨ Survey 문항이 생성되었습니다!")
-        
-        # 설문 제목과 설명 표시
-        st.subheader(survey_data["title"])
-        st.write(survey_data["description"])
-        
-        # 문항 표시
-        st.subheader("추천 Survey 문항")
-        for i, q in enumerate(survey_data["questions"], 1):
-            st.markdown(f"**{i}. {q['question']}**")
-            if q['type'] in ['radio', 'checkbox']:
-                st.write("보기:")
-                for option in q['options']:
-                    st.write(f"- {option}")
-            st.write(f"유형: {q['type']}")
-            st.write(f"필수 여부: {'예' if q['required'] else '아니오'}")
-            st.write("---")
-        
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Google Forms로 생성"):
@@ -463,16 +774,26 @@ def show_survey_status():
         if sheet["name"] == selected_survey
     )
     
+    if st.button("🔄 새로고침", key="refresh_status"):
+        get_sheet_repository().invalidate(selected_sheet["id"])
+    
     try:
-        client = get_gspread_client()
-        if client:
-            sheet = client.open_by_key(selected_sheet["id"]).sheet1
-            responses = sheet.get_all_records()
-            df_survey = pd.DataFrame(responses)
-            
+        df_survey = load_sheet_records(selected_sheet["id"])
+        if df_survey is not None:
+            show_data_freshness(selected_sheet["id"])
             if not df_survey.empty:
-                # 응답 현황
-                total_responses = len(df_survey)
+                # 응답 현황 (새로 추가된 행만 집계에 반영)
+                summary = get_summary_store().update(selected_sheet["id"], df_survey)
+                total_responses = summary.total
+                figure_cache = get_figure_cache()
+                
+                # 응답이 많거나 범주형 컬럼이 많으면 경량 모드를 기본으로 사용합니다
+                lightweight = st.toggle(
+                    "경량 모드",
+                    value=(total_responses >= LIGHTWEIGHT_MIN_RESPONSES
+                           or len(summary.categorical_columns()) > LIGHTWEIGHT_EAGER_CHARTS),
+                    help="상위 범주만 표시하고, 아래쪽 차트는 펼칠 때만 그립니다."
+                )
                 
                 # 메트릭 카드 스타일의 응답 현황
                 st.markdown("""
@@ -487,32 +808,10 @@ def show_survey_status():
                 # 만족도 분포 (만족도 컬럼이 있는 경우)
                 if '만족도' in df_survey.columns:
                     st.subheader("만족도 분포")
-                    satisfaction_counts = df_survey['만족도'].value_counts()
-                    
-                    # 만족도 순서 정의
-                    satisfaction_order = ['매우 만족', '만족', '보통', '불만족', '매우 불만족']
-                    satisfaction_counts = satisfaction_counts.reindex(satisfaction_order).fillna(0)
-                    
-                    # 색상 맵 정의
-                    colors = ['#22c55e', '#86efac', '#fde047', '#f87171', '#dc2626']
-                    
-                    # Plotly를 사용한 도넛 차트
-                    fig = go.Figure(data=[go.Pie(
-                        labels=satisfaction_counts.index,
-                        values=satisfaction_counts.values,
-                        hole=.4,
-                        marker=dict(colors=colors)
-                    )])
-                    
-                    fig.update_layout(
-                        title="만족도 분포",
-                        annotations=[dict(text=f'총 {total_responses}명', x=0.5, y=0.5, font_size=20, showarrow=False)],
-                        showlegend=True,
-                        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                        width=800,
-                        height=500
-                    )
+                    satisfaction_counts = summary.satisfaction_counts('만족도')
                     
+                    # Plotly를 사용한 도넛 차트 (데이터가 같으면 캐시된 차트 사용)
+                    fig = figure_cache.satisfaction_donut(satisfaction_counts, total_responses)
                     st.plotly_chart(fig, use_container_width=True)
                     
                     # 만족도 통계
@@ -528,35 +827,20 @@ def show_survey_status():
                         st.metric("부정 응답률", f"{negative_rate:.1f}%")
                 
                 # 기타 응답 분포
-                other_cols = [col for col in df_survey.columns if col != '만족도' and df_survey[col].dtype == 'object' and len(df_survey[col].unique()) < 10]
+                other_cols = summary.categorical_columns(exclude=('만족도',))
                 
                 if other_cols:
                     st.subheader("기타 응답 분포")
-                    for col in other_cols:
-                        counts = df_survey[col].value_counts()
+                    for idx, col in enumerate(other_cols):
+                        counts = summary.counts(col)
                         
-                        # Plotly를 사용한 바 차트
-                        fig = go.Figure(data=[
-                            go.Bar(
-                                x=counts.values,
-                                y=counts.index,
-                                orientation='h',
-                                marker=dict(
-                                    color='#3b82f6',
-                                    line=dict(color='#1e40af', width=1)
-                                )
-                            )
-                        ])
-                        
-                        fig.update_layout(
-                            title=f"{col} 분포",
-                            xaxis_title="응답 수",
-                            yaxis_title=None,
-                            showlegend=False,
-                            width=800,
-                            height=400
-                        )
+                        # 경량 모드에서는 앞쪽 차트만 바로 그리고 나머지는 펼칠 때 그립니다
+                        if lightweight and idx >= LIGHTWEIGHT_EAGER_CHARTS:
+                            if not st.toggle(f"{col} 분포 보기", key=f"show_chart_{col}"):
+                                continue
                         
+                        # Plotly를 사용한 바 차트 (경량 모드에서는 상위 범주 + 기타)
+                        fig = figure_cache.category_bar(col, counts, top_n=LIGHTWEIGHT_TOP_N if lightweight else None)
                         st.plotly_chart(fig, use_container_width=True)
                         
                         # 응답 비율 표시
@@ -564,7 +848,7 @@ def show_survey_status():
                             <div style="padding: 1rem; background: #f8f9fa; border-radius: 0.5rem; margin-bottom: 2rem;">
                                 <h4 style="color: #2563EB; margin-bottom: 0.5rem;">{col} 응답 비율</h4>
                                 <div style="display: flex; flex-wrap: wrap; gap: 1rem;">
-                                    {' '.join([f'<div style="background: #dbeafe; padding: 0.5rem; border-radius: 0.25rem;"><b>{k}</b>: {v/total_responses*100:.1f}%</div>' for k, v in counts.items()])}
+                                    {summary.ratio_html(col)}
                                 </div>
                             </div>
                         """, unsafe_allow_html=True)
@@ -573,6 +857,53 @@ def show_survey_status():
     except Exception as e:
         st.error(f"데이터 로드 중 오류 발생: {str(e)}")
 
+def show_raw_data_viewer(sheet_id, df_survey):
+    """검색·필터·정렬한 결과 중 현재 페이지만 표시합니다."""
+    index = get_response_index_store().get(sheet_id, df_survey)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        search = st.text_input("검색 (이름, 소속, 이메일)", key="raw_search")
+    filters = {}
+    with col2:
+        if '소속' in df_survey.columns:
+            filters['소속'] = st.multiselect(
+                "소속", options=sorted(df_survey['소속'].dropna().astype(str).unique()), key="raw_dept"
+            )
+    with col3:
+        if '만족도' in df_survey.columns:
+            filters['만족도'] = st.multiselect(
+                "만족도", options=[v for v in SATISFACTION_ORDER if v in set(df_survey['만족도'].unique())], key="raw_satisfaction"
+            )
+    
+    date_range = None
+    if index.dates is not None and index.dates.notna().any():
+        first, last = index.dates.min().date(), index.dates.max().date()
+        picked = st.date_input("응답 기간", value=(first, last), min_value=first, max_value=last, key="raw_dates")
+        if isinstance(picked, (tuple, list)) and len(picked) == 2:
+            date_range = tuple(picked)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_by = st.selectbox("정렬 기준", options=["(시트 순서)"] + list(df_survey.columns), key="raw_sort")
+    with col2:
+        ascending = st.radio("정렬 방향", ["오름차순", "내림차순"], horizontal=True, key="raw_order") == "오름차순"
+    with col3:
+        page_size = st.selectbox("페이지당 행 수", [25, 50, 100, 200], index=1, key="raw_page_size")
+    
+    positions = index.query(
+        search=search,
+        filters=filters,
+        date_range=date_range,
+        sort_by=None if sort_by == "(시트 순서)" else sort_by,
+        ascending=ascending,
+    )
+    total_pages = max(1, -(-len(positions) // page_size))
+    page = st.number_input(f"페이지 (전체 {total_pages}쪽)", min_value=1, max_value=total_pages, value=1, key="raw_page")
+    
+    st.caption(f"조건에 맞는 응답 {len(positions)}건 / 전체 {len(df_survey)}건")
+    st.dataframe(index.page(positions, page, page_size))
+
 def show_survey_results():
     st.header("Survey 결과")
     
@@ -593,30 +924,57 @@ def show_survey_results():
         if sheet["name"] == selected_survey
     )
     
+    if st.button("🔄 새로고침", key="refresh_results"):
+        get_sheet_repository().invalidate(selected_sheet["id"])
+    
     try:
-        client = get_gspread_client()
-        if client:
-            sheet = client.open_by_key(selected_sheet["id"]).sheet1
-            responses = sheet.get_all_records()
-            df_survey = pd.DataFrame(responses)
-            
+        df_survey = load_sheet_records(selected_sheet["id"])
+        if df_survey is not None:
+            show_data_freshness(selected_sheet["id"])
             if not df_survey.empty:
                 st.subheader("Raw Data")
-                st.dataframe(df_survey)
+                show_raw_data_viewer(selected_sheet["id"], df_survey)
                 
-                # CSV 다운로드 버튼
-                csv = df_survey.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    "CSV 다운로드",
-                    csv,
-                    f"{selected_survey}_results.csv",
-                    "text/csv",
-                    key='download-csv'
-                )
+                # 다운로드 버튼 (파일은 버튼을 누를 때만 청크 단위로 생성)
+                col1, col2 = st.columns([1, 3])
+                with col1:
+                    export_format = st.selectbox("형식", list(EXPORT_FORMATS), key="export_format")
+                extension, mime = EXPORT_FORMATS[export_format]
+                with col2:
+                    st.download_button(
+                        f"{export_format} 다운로드",
+                        lambda: export_frame(df_survey, extension),
+                        f"{selected_survey}_results.{extension}",
+                        mime,
+                        key='download-csv'
+                    )
             else:
                 st.info("아직 응답이 없습니다.")
     except Exception as e:
         st.error(f"데이터 로드 중 오류 발생: {str(e)}")
+    
+    # 등록된 전체 Survey를 하나의 압축 파일로 다운로드
+    if len(st.session_state.survey_sheets) > 1:
+        surveys = {sheet["name"]: sheet["id"] for sheet in st.session_state.survey_sheets}
+        archive_extension, _ = EXPORT_FORMATS[st.session_state.get("export_format", "CSV")]
+        
+        # 압축 파일은 버튼을 누를 때 만들지만, 빠지는 Survey를 버튼 옆에 알리도록 시트는 먼저 불러옵니다
+        frames, errors = get_sheet_repository().fetch_many(
+            surveys.values(), timeout=DASHBOARD_TIMEOUT, sheet_timeout=DASHBOARD_SHEET_TIMEOUT
+        )
+        loaded = {name: frames[sheet_id] for name, sheet_id in surveys.items() if sheet_id in frames}
+        failed = [name for name, sheet_id in surveys.items() if sheet_id in errors]
+        
+        if failed:
+            st.warning(f"{', '.join(failed)} Survey를 불러오지 못해 압축 파일에서 제외됩니다.")
+        if loaded:
+            st.download_button(
+                f"전체 Survey 압축 다운로드 ({len(loaded)}/{len(surveys)}개)" if failed else "전체 Survey 압축 다운로드",
+                lambda: export_archive(loaded, archive_extension),
+                "surveys.zip",
+                "application/zip",
+                key='download-archive'
+            )
 
 def show_reminder():
     st.header("리마인더")
@@ -638,6 +996,8 @@ def show_reminder():
         if sheet["name"] == selected_survey
     )
     
+    show_reminder_schedule(selected_sheet)
+    
     # 대상자 명단 입력 방식 선택
     st.subheader("대상자 명단")
     input_method = st.radio(
@@ -664,11 +1024,8 @@ def show_reminder():
                     if sheet["name"] == selected_target
                 )
                 
-                client = get_gspread_client()
-                if client:
-                    sheet = client.open_by_key(selected_target_sheet['id']).sheet1
-                    data = sheet.get_all_records()
-                    df_students = pd.DataFrame(data)
+                df_students = load_sheet_records(selected_target_sheet['id'])
+                if df_students is not None:
                     st.success("✅ 대상자 명단을 성공적으로 불러왔습니다.")
                     st.dataframe(df_students)
             except Exception as e:
@@ -678,13 +1035,10 @@ def show_reminder():
         sheet_url = st.text_input("Google Sheets URL")
         if sheet_url:
             try:
-                client = get_gspread_client()
-                if client:
-                    sheet_id = extract_sheet_id(sheet_url)
-                    if sheet_id:
-                        sheet = client.open_by_key(sheet_id).sheet1
-                        data = sheet.get_all_records()
-                        df_students = pd.DataFrame(data)
+                sheet_id = extract_sheet_id(sheet_url)
+                if sheet_id:
+                    df_students = load_sheet_records(sheet_id)
+                    if df_students is not None:
                         st.success("✅ 대상자 명단을 성공적으로 불러왔습니다.")
                         st.dataframe(df_students)
             except Exception as e:
@@ -698,24 +1052,10 @@ def show_reminder():
         
         if uploaded_file:
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    df_students = pd.read_csv(uploaded_file)
-                else:
-                    try:
-                        df_students = pd.read_excel(uploaded_file)
-                    except ImportError:
-                        st.error("""
-                            ### Excel 파일 처리를 위한 패키지가 필요합니다
-                            터미널에서 다음 명령어를 실행하세요:
-                            ```
-                            pip install openpyxl
-                            ```
-                            설치 후 앱을 다시 실행하세요.
-                        """)
-                        return
-                
+                df_students = load_uploaded_roster(uploaded_file)
+                if df_students is None:
+                    return
                 st.success("✅ 대상자 명단을 성공적으로 불러왔습니다.")
-                st.dataframe(df_students)
                 
             except Exception as e:
                 st.error(f"파일 처리 중 오류 발생: {str(e)}")
@@ -724,14 +1064,14 @@ def show_reminder():
     if df_students is not None:
         try:
             # 응답 데이터 로드
-            client = get_gspread_client()
-            if client:
-                sheet = client.open_by_key(selected_sheet["id"]).sheet1
-                responses = sheet.get_all_records()
-                df_survey = pd.DataFrame(responses)
+            df_survey = load_sheet_records(selected_sheet["id"])
+            if df_survey is not None:
+                # 미응답자 찾기 (이메일 → 이름+소속 순서로 매칭)
+                matched = match_respondents(df_students, df_survey)
+                non_respondents = df_students[~matched[MATCHED_COLUMN]]
                 
-                # 미응답자 찾기
-                non_respondents = find_non_respondents(df_students, df_survey)
+                with st.expander("매칭 기준별 현황"):
+                    st.dataframe(match_summary(matched))
                 
                 if len(non_respondents) == 0:
                     st.success("🎉 모든 대상자가 응답을 완료했습니다!")
@@ -744,27 +1084,378 @@ def show_reminder():
                         hide_index=True
                     )
                     
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        campaign = st.text_input(
+                            "캠페인 이름",
+                            value=datetime.date.today().isoformat(),
+                            help="같은 캠페인 안에서는 한 사람에게 한 번만 발송합니다."
+                        )
+                    with col2:
+                        cooldown_hours = st.number_input(
+                            "재발송 제한 시간(시간)", min_value=0, value=24,
+                            help="이 시간 안에 리마인더를 받은 사람에게는 다시 발송하지 않습니다."
+                        )
+                    with col3:
+                        max_workers = st.slider("동시 발송 수", 1, 8, DEFAULT_MAX_WORKERS, key="reminder_workers")
+                    
+                    outbox = get_reminder_outbox()
+                    summary = outbox.summary(selected_sheet["id"], campaign)
+                    if any(summary.values()):
+                        st.caption(
+                            f"발송함 현황 — 완료 {summary['sent']}명 · 대기 {summary['pending']}명 · "
+                            f"발송 중 {summary['sending']}명 · 실패 {summary['failed']}명"
+                        )
+                    
                     if st.button("리마인더 발송", type="primary"):
-                        with st.spinner("리마인더 발송 중..."):
-                            success_count = 0
-                            total_count = len(non_respondents)
+                        dispatcher = get_reminder_dispatcher(max_workers=max_workers)
+                        if dispatcher:
+                            # 화면의 목록은 캐시나 스냅샷일 수 있으므로 응답을 새로 읽어 미응답자를 다시 찾습니다
+                            try:
+                                df_fresh = get_sheet_repository().sync(selected_sheet["id"])
+                            except Exception as e:
+                                st.error(f"최신 응답을 불러오지 못해 발송하지 않았습니다: {str(e)}")
+                                return
+                            non_respondents = find_non_respondents(df_students, df_fresh)
+                            outbox.enqueue(
+                                selected_sheet["id"], campaign,
+                                zip(non_respondents['이름'], non_respondents['이메일']),
+                                selected_sheet["url"]
+                            )
                             progress_bar = st.progress(0.0)
+                            status_text = st.empty()
                             
-                            for idx, row in non_respondents.iterrows():
-                                if send_reminder_email(row['이름'], row['이메일'], selected_sheet["url"]):
-                                    success_count += 1
-                                    st.success(f"✅ {row['이름']}님께 리마인더를 발송했습니다.")
-                                
-                                progress_bar.progress(min(1.0, (idx + 1) / total_count))
+                            def update_progress(result, done, total):
+                                progress_bar.progress(done / total)
+                                status_text.write(f"{done}/{total}명 처리 완료")
+                            
+                            with st.spinner("리마인더 발송 중..."):
+                                results, stats = outbox.drain(
+                                    dispatcher, selected_sheet["id"], campaign,
+                                    cooldown_hours=cooldown_hours, on_result=update_progress
+                                )
+                            
+                            if stats['total'] == 0:
+                                st.info("이 캠페인에서 발송할 대상자가 남아 있지 않습니다.")
                             
-                            st.balloons()
-                            st.success(f"✨ 총 {success_count}명에게 리마인더를 발송했습니다!")
+                            col1, col2, col3 = st.columns(3)
+                            col1.metric("발송 성공", f"{stats['sent']}명")
+                            col2.metric("발송 실패", f"{stats['failed']}명")
+                            col3.metric("처리 속도", f"{stats['throughput']:.1f}건/초")
+                            
+                            failed = [r for r in results if not r["success"]]
+                            if failed:
+                                st.error(f"{len(failed)}명에게 발송하지 못했습니다.")
+                                st.dataframe(
+                                    pd.DataFrame(failed)[["name", "email", "error"]],
+                                    hide_index=True
+                                )
+                            # 발송 후에는 최신 응답을 다시 읽도록 캐시를 비웁니다
+                            get_sheet_repository().invalidate(selected_sheet["id"])
+                            if stats['sent']:
+                                st.balloons()
+                                st.success(f"✨ 총 {stats['sent']}명에게 리마인더를 발송했습니다!")
         except Exception as e:
             st.error(f"리마인더 처리 중 오류 발생: {str(e)}")
 
+def format_timestamp(ts):
+    return datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "-"
+
+def show_reminder_schedule(selected_sheet):
+    """선택한 Survey의 자동 리마인더 스케줄을 설정하고 전체 스케줄 상태를 표시합니다.
+
+    미응답자 확인과 발송은 백그라운드 스케줄러가 수행하며, 이 화면은 상태와 결과만 읽습니다.
+    """
+    scheduler = get_reminder_scheduler()
+    store = scheduler.store
+    schedule = store.get(selected_sheet["id"])
+    status_labels = {STATUS_ACTIVE: "실행 중", STATUS_PAUSED: "일시 중지", STATUS_COMPLETED: "종료"}
+    
+    with st.expander("⏰ 자동 리마인더 스케줄", expanded=schedule is not None):
+        target_sheets = st.session_state.get('target_sheets', [])
+        if not target_sheets:
+            st.info("자동 리마인더를 사용하려면 '대상자 관리'에서 대상자 목록을 먼저 등록해주세요.")
+        else:
+            with st.form("reminder_schedule"):
+                roster_names = [sheet["name"] for sheet in target_sheets]
+                roster_ids = [sheet["id"] for sheet in target_sheets]
+                default_roster = roster_ids.index(schedule["roster_id"]) if schedule and schedule["roster_id"] in roster_ids else 0
+                col1, col2 = st.columns(2)
+                with col1:
+                    roster_name = st.selectbox("대상자 목록", roster_names, index=default_roster)
+                    interval_hours = st.number_input(
+                        "발송 간격(시간)", min_value=1, value=int(schedule["interval_hours"]) if schedule else 24
+                    )
+                with col2:
+                    deadline_date = st.date_input(
+                        "마감일",
+                        value=(
+                            datetime.date.fromtimestamp(schedule["deadline"]) - datetime.timedelta(days=1)
+                            if schedule and schedule["deadline"]
+                            else datetime.date.today() + datetime.timedelta(days=7)
+                        ),
+                        help="마감일이 끝나면 더 이상 발송하지 않습니다."
+                    )
+                    max_reminders = st.number_input(
+                        "최대 발송 횟수", min_value=1, max_value=10,
+                        value=schedule["max_reminders"] if schedule else 3
+                    )
+                if st.form_submit_button("스케줄 저장"):
+                    roster_id = roster_ids[roster_names.index(roster_name)]
+                    # 백그라운드에서 실패하지 않도록 저장하기 전에 대상자 목록의 필수 컬럼을 확인합니다
+                    try:
+                        df_roster = load_sheet_records(roster_id)
+                        if df_roster is None:
+                            raise RuntimeError("대상자 목록을 불러올 수 없습니다.")
+                        missing = missing_roster_columns(df_roster)
+                    except Exception as e:
+                        missing = None
+                        st.error(f"대상자 목록 로드 중 오류 발생: {str(e)}")
+                    deadline = datetime.datetime.combine(
+                        deadline_date + datetime.timedelta(days=1), datetime.time()
+                    ).timestamp()
+                    if missing:
+                        st.error(f"대상자 목록에 {', '.join(missing)} 컬럼이 없어 스케줄을 저장하지 않았습니다.")
+                    elif missing is not None:
+                        store.save(
+                            selected_sheet["id"], selected_sheet["name"], selected_sheet["url"], roster_id,
+                            interval_hours=interval_hours, deadline=deadline, max_reminders=max_reminders
+                        )
+                        scheduler.wake()
+                        st.success("✅ 자동 리마인더 스케줄을 저장했습니다. 백그라운드에서 미응답자를 확인해 발송합니다.")
+                        schedule = store.get(selected_sheet["id"])
+        
+        if schedule:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("상태", status_labels.get(schedule["status"], schedule["status"]))
+            col2.metric("발송 횟수", f"{schedule['reminders_sent']} / {schedule['max_reminders']}")
+            col3.metric("다음 확인", format_timestamp(schedule["next_run"]) if schedule["status"] == STATUS_ACTIVE else "-")
+            last_result = schedule["last_result"]
+            if last_result:
+                message = last_result.get("error") or last_result.get("message", "")
+                (st.error if last_result.get("error") else st.caption)(
+                    f"마지막 실행 {format_timestamp(last_result['at'])}: {message}"
+                )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if schedule["status"] == STATUS_ACTIVE:
+                    if st.button("일시 중지", key="pause_schedule"):
+                        store.set_status(selected_sheet["id"], STATUS_PAUSED)
+                        st.rerun()
+                elif st.button("다시 시작", key="resume_schedule"):
+                    store.set_status(selected_sheet["id"], STATUS_ACTIVE)
+                    scheduler.wake()
+                    st.rerun()
+            with col2:
+                if st.button("스케줄 삭제", key="delete_schedule"):
+                    store.delete(selected_sheet["id"])
+                    st.rerun()
+        
+        schedules = store.all()
+        if schedules:
+            st.markdown("**전체 스케줄**")
+            st.dataframe(pd.DataFrame([{
+                "Survey": item["survey_name"],
+                "상태": status_labels.get(item["status"], item["status"]),
+                "발송 횟수": f"{item['reminders_sent']}/{item['max_reminders']}",
+                "다음 확인": format_timestamp(item["next_run"]) if item["status"] == STATUS_ACTIVE else "-",
+                "마감": format_timestamp(item["deadline"]),
+                "마지막 결과": (item["last_result"] or {}).get("error") or (item["last_result"] or {}).get("message", ""),
+            } for item in schedules]), hide_index=True)
+            if not scheduler.running:
+                st.warning("⚠️ 백그라운드 스케줄러가 실행 중이 아닙니다.")
+            elif scheduler.last_poll:
+                st.caption(f"스케줄러 마지막 확인: {format_timestamp(scheduler.last_poll)}")
+
+def show_response_matrix():
+    """등록된 모든 대상자 목록과 Survey의 응답 여부 매트릭스를 표시합니다."""
+    st.header("응답 매트릭스")
+    
+    target_sheets = st.session_state.get('target_sheets', [])
+    if not st.session_state.survey_sheets or not target_sheets:
+        st.warning("'Survey 관리'와 '대상자 관리'에서 Survey와 대상자 목록을 먼저 등록해주세요.")
+        return
+    
+    if not get_gspread_client():
+        return
+    
+    # 모든 시트를 동시에 불러옵니다
+    with st.spinner("등록된 시트를 불러오는 중..."):
+        sheet_ids = [sheet["id"] for sheet in st.session_state.survey_sheets + target_sheets]
+        frames, errors = get_sheet_repository().fetch_many(sheet_ids)
+    
+    for sheet in st.session_state.survey_sheets + target_sheets:
+        if sheet["id"] in errors:
+            st.warning(f"'{sheet['name']}' 시트를 불러오지 못했습니다: {errors[sheet['id']]}")
+    
+    rosters = {sheet["name"]: frames[sheet["id"]] for sheet in target_sheets if sheet["id"] in frames}
+    surveys = {
+        sheet["name"]: frames[sheet["id"]]
+        for sheet in st.session_state.survey_sheets if sheet["id"] in frames
+    }
+    if not rosters or not surveys:
+        st.info("매트릭스를 계산할 데이터가 없습니다.")
+        return
+    
+    matrix = response_matrix(rosters, surveys)
+    survey_names = list(surveys)
+    
+    selected_rosters = st.multiselect("대상자 목록", options=list(rosters), default=list(rosters))
+    if selected_rosters:
+        member = matrix[ROSTER_COLUMN].explode().isin(selected_rosters)
+        matrix = matrix[member.groupby(level=0).any()]
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("참여자", f"{len(matrix)}명")
+    col2.metric("Survey", f"{len(survey_names)}개")
+    col3.metric("전체 응답률", f"{matrix[survey_names].to_numpy().mean() * 100:.1f}%" if len(matrix) else "-")
+    
+    st.subheader("참여자별 응답 현황")
+    st.dataframe(matrix, hide_index=True)
+    
+    if '소속' in matrix.columns:
+        st.subheader("소속별 응답률 (%)")
+        st.dataframe(completion_by_department(matrix, survey_names))
+    
+    # 일괄 리마인더: Survey마다 자동 리마인더 스케줄에 연결된 대상자 목록에만 발송합니다
+    st.subheader("일괄 리마인더")
+    links = ScheduleStore().roster_links()
+    roster_names = {sheet["id"]: sheet["name"] for sheet in target_sheets}
+    sheets_by_name = {sheet["name"]: sheet for sheet in st.session_state.survey_sheets}
+    linked_surveys = [name for name in survey_names if links.get(sheets_by_name[name]["id"]) in roster_names]
+    if len(linked_surveys) < len(survey_names):
+        st.caption("대상자 목록이 연결되지 않은 Survey는 리마인더 페이지의 자동 리마인더 스케줄에서 먼저 연결해주세요.")
+    remind_surveys = st.multiselect("리마인더를 보낼 Survey", options=linked_surveys)
+    col1, col2 = st.columns(2)
+    with col1:
+        campaign = st.text_input("캠페인 이름", value=datetime.date.today().isoformat(), key="matrix_campaign")
+    with col2:
+        cooldown_hours = st.number_input("재발송 제한 시간(시간)", min_value=0, value=24, key="matrix_cooldown")
+    
+    if remind_surveys:
+        summary = []
+        for name in remind_surveys:
+            roster_id = links[sheets_by_name[name]["id"]]
+            if roster_id in frames:
+                matched = match_respondents(frames[roster_id], surveys[name])
+                summary.append(f"{name} ({roster_names[roster_id]}): 미응답 {int((~matched[MATCHED_COLUMN]).sum())}명")
+        st.info(" · ".join(summary))
+        
+        if st.button("일괄 리마인더 발송", type="primary"):
+            dispatcher = get_reminder_dispatcher()
+            if dispatcher:
+                outbox = get_reminder_outbox()
+                total_sent = 0
+                with st.spinner("리마인더 발송 중..."):
+                    # 캐시나 스냅샷의 지난 데이터로 발송하지 않도록 응답과 대상자 목록을 새로 읽습니다
+                    remind_sheets = [sheets_by_name[name] for name in remind_surveys]
+                    fresh, fresh_errors = get_sheet_repository().fetch_many(
+                        [sheet["id"] for sheet in remind_sheets] + [links[sheet["id"]] for sheet in remind_sheets],
+                        refresh=True
+                    )
+                    for sheet in remind_sheets:
+                        roster_id = links[sheet["id"]]
+                        failed_ids = [sheet_id for sheet_id in (sheet["id"], roster_id) if sheet_id in fresh_errors]
+                        if failed_ids:
+                            st.error(
+                                f"{sheet['name']}: 최신 데이터를 불러오지 못해 발송하지 않았습니다 "
+                                f"({fresh_errors[failed_ids[0]]})"
+                            )
+                            continue
+                        missing_columns = missing_roster_columns(fresh[roster_id])
+                        if missing_columns:
+                            st.error(
+                                f"{sheet['name']}: 대상자 목록 '{roster_names[roster_id]}'에 "
+                                f"{', '.join(missing_columns)} 컬럼이 없습니다."
+                            )
+                            continue
+                        non_respondents = find_non_respondents(fresh[roster_id], fresh[sheet["id"]])
+                        outbox.enqueue(
+                            sheet["id"], campaign,
+                            zip(non_respondents['이름'], non_respondents['이메일']), sheet["url"]
+                        )
+                        _, stats = outbox.drain(dispatcher, sheet["id"], campaign, cooldown_hours=cooldown_hours)
+                        total_sent += stats['sent']
+                        if stats['failed']:
+                            st.error(f"{sheet['name']}: {stats['failed']}명에게 발송하지 못했습니다.")
+                st.success(f"✨ 총 {total_sent}명에게 리마인더를 발송했습니다!")
+
+def export_metrics():
+    """secrets의 metrics.textfile 경로가 있으면 계측값을 Prometheus 텍스트 파일로 저장합니다."""
+    if 'metrics' not in st.secrets:
+        return
+    path = st.secrets['metrics'].get('textfile')
+    if not path:
+        return
+    try:
+        METRICS.write_prometheus(path)
+    except OSError as e:
+        st.sidebar.warning(f"계측값 저장 오류 발생: {str(e)}")
+
+def diagnostic_label(record):
+    labels = record["labels"]
+    if "page" in labels:
+        return labels["page"]
+    if "quota" in labels:
+        return f"할당량 대기 {labels['quota']}"
+    return f"{labels.get('service')} {labels.get('op')}"
+
+def show_diagnostics_panel(page, calls_before):
+    """이번 화면의 렌더링 시간과 외부 호출 수, 누적 계측값을 사이드바에 표시합니다."""
+    records = METRICS.snapshot()
+    render = next(
+        (r for r in records if r["name"] == "page_render" and r["labels"].get("page") == page), None
+    )
+    st.markdown("**진단 정보**")
+    if render:
+        st.caption(f"{page} 렌더링 {render['last'] * 1000:,.0f}ms")
+    st.caption(" · ".join(
+        f"{label} {METRICS.total('external_call', service=service) - calls_before[service]}회"
+        for service, label in DIAGNOSTIC_SERVICES.items()
+    ) + " 호출")
+
+    timers = pd.DataFrame([
+        {
+            "항목": diagnostic_label(r),
+            "상태": r["labels"].get("status"),
+            "호출": r["count"],
+            "평균(ms)": round(r["avg"] * 1000, 1),
+            "최대(ms)": round(r["max"] * 1000, 1),
+        }
+        for r in records if r["type"] == "timer"
+    ])
+    if not timers.empty:
+        st.dataframe(timers, hide_index=True)
+    writer = get_response_writer() if os.path.exists('service_account.json') else None
+    if writer:
+        st.caption(
+            f"응답 저장 완료 {writer.flushed:,}건 · 대기 {writer.pending_count:,}건"
+            + (f" · 마지막 오류: {writer.last_error}" if writer.last_error else "")
+        )
+    counters = [r for r in records if r["type"] == "counter"]
+    for r in counters:
+        labels = ", ".join(f"{k}={v}" for k, v in r["labels"].items())
+        st.caption(f"{r['name']} ({labels}): {r['value']:,}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Prometheus", data=METRICS.prometheus_text, file_name="survey_metrics.prom",
+            mime="text/plain", key="metrics_prom"
+        )
+    with col2:
+        st.download_button(
+            "JSON", data=METRICS.json_text, file_name="survey_metrics.json",
+            mime="application/json", key="metrics_json"
+        )
+
 def main():
     st.title("📊 Survey Management System")
     
+    # 등록된 Survey/대상자 목록 (로컬 레지스트리)
+    load_registered_sheets()
+    
     # 메뉴 상태 초기화
     if 'menu' not in st.session_state:
         st.session_state.menu = "메인 화면"
@@ -772,24 +1463,60 @@ def main():
     # 메인 메뉴
     st.session_state.menu = st.sidebar.selectbox(
         "메뉴 선택",
-        ["메인 화면", "Survey 관리", "대상자 관리", "새로운 Survey 생성", "Survey 응답 현황", "Survey 결과", "리마인더"],
-        index=["메인 화면", "Survey 관리", "대상자 관리", "새로운 Survey 생성", "Survey 응답 현황", "Survey 결과", "리마인더"].index(st.session_state.menu)
+        ["메인 화면", "Survey 관리", "대상자 관리", "새로운 Survey 생성", "Survey 응답 현황", "Survey 결과", "응답 매트릭스", "리마인더"],
+        index=["메인 화면", "Survey 관리", "대상자 관리", "새로운 Survey 생성", "Survey 응답 현황", "Survey 결과", "응답 매트릭스", "리마인더"].index(st.session_state.menu)
     )
     
-    if st.session_state.menu == "메인 화면":
-        show_main_dashboard()
-    elif st.session_state.menu == "Survey 관리":
-        show_survey_management()
-    elif st.session_state.menu == "대상자 관리":
-        show_target_management()
-    elif st.session_state.menu == "새로운 Survey 생성":
-        show_survey_creation()
-    elif st.session_state.menu == "Survey 응답 현황":
-        show_survey_status()
-    elif st.session_state.menu == "Survey 결과":
-        show_survey_results()
-    elif st.session_state.menu == "리마인더":
-        show_reminder()
+    # 모든 세션이 함께 쓰는 Google API 할당량 설정 (프로세스당 한 번)
+    configure_google_quota()
+
+    # 저장된 자동 리마인더 스케줄이 앱 시작과 함께 돌도록 스케줄러를 띄웁니다
+    get_reminder_scheduler()
+    
+    # 시트 캐시 통계
+    cache_stats = get_sheet_repository().stats()
+    st.sidebar.caption(
+        f"시트 캐시 적중 {cache_stats['hits']} · 미스 {cache_stats['misses']} · "
+        f"보관 {cache_stats['entries']}개"
+    )
+    show_response_writer_status()
+
+    # 필요할 때 불러온 무거운 모듈과 import 시간
+    loaded = import_times()
+    if loaded:
+        with st.sidebar.expander("모듈 로딩 시간"):
+            for name, seconds in loaded.items():
+                st.caption(f"{name}: {seconds * 1000:.0f}ms")
+
+    show_diagnostics = st.sidebar.checkbox("진단 정보 표시", key="show_diagnostics")
+    diagnostics = st.sidebar.empty()
+    page = st.session_state.menu
+    calls_before = {service: METRICS.total("external_call", service=service) for service in DIAGNOSTIC_SERVICES}
+
+    try:
+        with timer("page_render", page=page):
+            if page == "메인 화면":
+                show_main_dashboard()
+            elif page == "Survey 관리":
+                show_survey_management()
+            elif page == "대상자 관리":
+                show_target_management()
+            elif page == "새로운 Survey 생성":
+                show_survey_creation()
+            elif page == "Survey 응답 현황":
+                show_survey_status()
+            elif page == "Survey 결과":
+                show_survey_results()
+            elif page == "응답 매트릭스":
+                show_response_matrix()
+            elif page == "리마인더":
+                show_reminder()
+    finally:
+        # st.stop()으로 페이지가 중간에 끝나도 측정값은 남깁니다
+        export_metrics()
+        if show_diagnostics:
+            with diagnostics.container():
+                show_diagnostics_panel(page, calls_before)
 
 def show_main_dashboard():
     """메인 대시보드를 표시합니다."""
@@ -898,6 +1625,113 @@ def show_main_dashboard():
                         </p>
                     </div>
                 """.format(len(st.session_state.target_sheets)), unsafe_allow_html=True)
+        
+        with col3:
+            # 레지스트리에 기록된 행 수만 사용하므로 API를 호출하지 않습니다
+            total_responses = sum(sheet["row_count"] or 0 for sheet in st.session_state.survey_sheets)
+            st.markdown("""
+                <div class="metric-card">
+                    <h4 style="color: #4B5563; margin-bottom: 0.5rem;">수집된 응답</h4>
+                    <p style="color: #2563EB; font-size: 2rem; font-weight: 700; margin: 0;">
+                        {:,}건
+                    </p>
+                </div>
+            """.format(total_responses), unsafe_allow_html=True)
+        
+        if st.session_state.survey_sheets:
+            st.dataframe(pd.DataFrame([{
+                "Survey": sheet["name"],
+                "응답 수": sheet["row_count"],
+                "문항 수": len(sheet["header"]) if sheet["header"] else None,
+                "마지막 동기화": (
+                    datetime.datetime.fromtimestamp(sheet["last_sync"]).strftime("%Y-%m-%d %H:%M")
+                    if sheet["last_sync"] else "-"
+                ),
+                "리비전": sheet["revision"],
+            } for sheet in st.session_state.survey_sheets]), hide_index=True)
+        
+        show_live_dashboard()
+
+def show_live_dashboard():
+    """등록된 모든 Survey와 연결된 대상자 목록을 동시에 불러와 Survey별 응답 수, 응답률, 만족도 분포를 표시합니다.
+
+    응답률은 Survey마다 자동 리마인더 스케줄에 연결된 대상자 목록을 기준으로 계산하고, 연결된 목록이 없는
+    Survey는 응답 수만 표시합니다. 느리거나 실패한 시트는 기다리지 않고 레지스트리에 기록된 값과 함께 부분
+    결과로 표시합니다.
+    """
+    survey_sheets = st.session_state.survey_sheets
+    target_sheets = st.session_state.get('target_sheets', [])
+    if not survey_sheets:
+        return
+    
+    st.markdown('<h2 class="sub-title">실시간 응답 현황</h2>', unsafe_allow_html=True)
+    if not os.path.exists('service_account.json'):
+        st.caption("Google Sheets 연결을 설정하면 Survey별 실시간 현황이 표시됩니다.")
+        return
+    
+    links = ScheduleStore().roster_links()
+    roster_ids = {sheet["id"]: links.get(sheet["id"]) for sheet in survey_sheets}
+    roster_names = {sheet["id"]: sheet["name"] for sheet in target_sheets}
+    
+    with st.spinner("등록된 시트를 동시에 불러오는 중..."):
+        frames, errors = get_sheet_repository().fetch_many(
+            [sheet["id"] for sheet in survey_sheets] + [roster_id for roster_id in roster_ids.values() if roster_id],
+            max_workers=DASHBOARD_FETCH_WORKERS,
+            timeout=DASHBOARD_TIMEOUT,
+            sheet_timeout=DASHBOARD_SHEET_TIMEOUT
+        )
+    
+    rows, satisfaction = [], {}
+    for sheet in survey_sheets:
+        roster_id = roster_ids[sheet["id"]]
+        roster_label = roster_names.get(roster_id, roster_id) if roster_id else "연결 없음"
+        df = frames.get(sheet["id"])
+        if df is None:
+            rows.append({
+                "Survey": sheet["name"],
+                "대상자 목록": roster_label,
+                "응답 수": sheet["row_count"],
+                "응답률": None,
+                "상태": f"⚠️ {errors.get(sheet['id'], '불러오지 못함')} (마지막 기록 값)",
+            })
+            continue
+        summary = get_summary_store().update(sheet["id"], df)
+        roster = frames.get(roster_id) if roster_id else None
+        rate = None
+        if roster is not None and len(roster):
+            rate = round(match_respondents(roster, df)[MATCHED_COLUMN].mean() * 100, 1)
+        rows.append({
+            "Survey": sheet["name"],
+            "대상자 목록": roster_label,
+            "응답 수": summary.total,
+            "응답률": rate,
+            "상태": "✅ 최신",
+        })
+        if '만족도' in df.columns:
+            satisfaction[sheet["name"]] = summary.satisfaction_counts()
+    
+    linked = {roster_id for roster_id in roster_ids.values() if roster_id}
+    loaded = [frames[roster_id] for roster_id in linked if roster_id in frames]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("불러온 Survey", f"{sum(sheet['id'] in frames for sheet in survey_sheets)} / {len(survey_sheets)}")
+    col2.metric("총 응답", f"{sum(row['응답 수'] or 0 for row in rows):,}건")
+    col3.metric("연결된 대상자", f"{sum(len(df) for df in loaded):,}명" if loaded else "-")
+    
+    st.dataframe(
+        pd.DataFrame(rows),
+        column_config={"응답률": st.column_config.ProgressColumn("응답률", format="%.1f%%", min_value=0, max_value=100)},
+        hide_index=True
+    )
+    if any(roster_id is None for roster_id in roster_ids.values()):
+        st.caption("응답률은 자동 리마인더 스케줄에 대상자 목록이 연결된 Survey만 표시합니다.")
+    
+    failed = [roster_names.get(roster_id, roster_id) for roster_id in linked if roster_id in errors]
+    if failed:
+        st.warning(f"대상자 목록 {', '.join(failed)}을(를) 불러오지 못해 응답률을 표시하지 못했습니다.")
+    
+    if satisfaction:
+        fig = satisfaction_mix_bar(satisfaction)
+        st.plotly_chart(fig, use_container_width=True)
 
 def show_target_management():
     """대상자 관리 페이지를 표시합니다."""
@@ -912,26 +1746,24 @@ def show_target_management():
     with tab1:
         if st.session_state.target_sheets:
             for idx, sheet in enumerate(st.session_state.target_sheets):
-                with st.expander(f"대상자 목록 {idx + 1}: {sheet['name']}"):
+                with st.expander(f"대상자 목록 {idx + 1}: {sheet['name']} ({format_sheet_meta(sheet, '명')})"):
                     try:
-                        client = get_gspread_client()
-                        if client:
-                            sheet_data = client.open_by_key(sheet['id']).sheet1
-                            df = pd.DataFrame(sheet_data.get_all_records())
+                        df = load_sheet_records(sheet['id'])
+                        if df is not None:
                             st.dataframe(df)
                             
-                            # CSV 다운로드 버튼
-                            csv = df.to_csv(index=False).encode('utf-8')
+                            # CSV 다운로드 버튼 (누를 때만 생성)
                             st.download_button(
                                 "CSV 다운로드",
-                                csv,
+                                lambda df=df: export_frame(df, "csv"),
                                 f"{sheet['name']}_대상자목록.csv",
                                 "text/csv",
                                 key=f'download-csv-{idx}'
                             )
                             
                             if st.button("삭제", key=f"del_target_{idx}"):
-                                st.session_state.target_sheets.pop(idx)
+                                get_sheet_repository().invalidate(sheet['id'], full=True)
+                                unregister_sheet(KIND_TARGET, sheet['id'])
                                 st.rerun()
                     except Exception as e:
                         st.error(f"데이터 로드 중 오류 발생: {str(e)}")
@@ -956,11 +1788,7 @@ def show_target_management():
                 if submitted and list_name and sheet_url:
                     sheet_id = extract_sheet_id(sheet_url)
                     if sheet_id:
-                        st.session_state.target_sheets.append({
-                            "name": list_name,
-                            "url": sheet_url,
-                            "id": sheet_id
-                        })
+                        register_sheet(KIND_TARGET, list_name, sheet_url, sheet_id)
                         st.success(f"✅ {list_name} 목록이 추가되었습니다!")
                         st.rerun()
         
@@ -973,34 +1801,50 @@ def show_target_management():
             
             if uploaded_file:
                 try:
-                    if uploaded_file.name.endswith('.csv'):
-                        df = pd.read_csv(uploaded_file)
-                    else:
-                        df = pd.read_excel(uploaded_file)
+                    df = load_uploaded_roster(uploaded_file)
                     
-                    st.dataframe(df)
-                    
-                    if st.button("Google Sheets로 저장"):
-                        try:
-                            client = get_gspread_client()
-                            if client:
-                                # 새 스프레드시트 생성
-                                sheet = client.create(f"대상자목록_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
-                                # 데이터 저장
-                                worksheet = sheet.sheet1
-                                worksheet.update([df.columns.values.tolist()] + df.values.tolist())
+                    if df is not None:
+                        job_id = frame_fingerprint(df)
+                        pending = get_sheet_uploader().pending_job(job_id)
+                        if pending:
+                            st.info(
+                                f"이전 업로드가 {len(pending['done'])}개 청크까지 완료된 상태로 중단되었습니다. "
+                                "다시 저장하면 남은 청크만 이어서 올립니다."
+                            )
+                        
+                        if st.button("이어서 업로드" if pending else "Google Sheets로 저장"):
+                            try:
+                                client = get_gspread_client()
+                                if client:
+                                    report = upload_roster(
+                                        client, df, job_id,
+                                        f"대상자목록_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                                    )
                                 
-                                # 목록에 추가
-                                st.session_state.target_sheets.append({
-                                    "name": uploaded_file.name.split('.')[0],
-                                    "url": f"https://docs.google.com/spreadsheets/d/{sheet.id}",
-                                    "id": sheet.id
-                                })
+                                    col1, col2, col3 = st.columns(3)
+                                    col1.metric("업로드 행", f"{report['uploaded_rows']:,} / {report['total_rows']:,}")
+                                    col2.metric("처리 속도", f"{report['rows_per_sec']:,.0f}행/초")
+                                    col3.metric("소요 시간", f"{report['elapsed']:.1f}초")
                                 
-                                st.success("✅ 대상자 목록이 Google Sheets에 저장되었습니다!")
-                                st.rerun()
-                        except Exception as e:
-                            st.error(f"Google Sheets 저장 중 오류 발생: {str(e)}")
+                                    if report["failed_chunks"]:
+                                        st.warning(
+                                            f"⚠️ {len(report['failed_chunks'])}개 청크를 올리지 못했습니다. "
+                                            "'이어서 업로드'를 눌러 남은 청크만 다시 시도하세요."
+                                        )
+                                        with st.expander("실패한 청크"):
+                                            for index, error in report["errors"].items():
+                                                st.write(f"청크 {index + 1}: {error}")
+                                    else:
+                                        # 목록에 추가
+                                        sheet_id = report["spreadsheet_id"]
+                                        register_sheet(
+                                            KIND_TARGET, uploaded_file.name.split('.')[0],
+                                            f"https://docs.google.com/spreadsheets/d/{sheet_id}", sheet_id
+                                        )
+                                    
+                                        st.success("✅ 대상자 목록이 Google Sheets에 저장되었습니다!")
+                            except Exception as e:
+                                st.error(f"Google Sheets 저장 중 오류 발생: {str(e)}")
                 
                 except Exception as e:
                     st.error(f"파일 처리 중 오류 발생: {str(e)}")
@@ -1017,13 +1861,7 @@ def show_survey_management():
         if submitted and sheet_name and sheet_url:
             sheet_id = extract_sheet_id(sheet_url)
             if sheet_id:
-                if 'survey_sheets' not in st.session_state:
-                    st.session_state.survey_sheets = []
-                st.session_state.survey_sheets.append({
-                    "name": sheet_name,
-                    "url": sheet_url,
-                    "id": sheet_id
-                })
+                register_sheet(KIND_SURVEY, sheet_name, sheet_url, sheet_id)
                 st.success(f"✅ {sheet_name} Survey가 추가되었습니다!")
     
     # 등록된 Sheets 목록
@@ -1033,11 +1871,12 @@ def show_survey_management():
             col1, col2, col3 = st.columns([3, 6, 1])
             with col1:
                 st.write(sheet["name"])
+                st.caption(format_sheet_meta(sheet, "건"))
             with col2:
                 st.write(sheet["url"])
             with col3:
                 if st.button("삭제", key=f"del_{idx}"):
-                    st.session_state.survey_sheets.pop(idx)
+                    unregister_sheet(KIND_SURVEY, sheet["id"])
                     st.rerun()
     else:
         st.info("등록된 Survey가 없습니다. 새로운 Survey를 추가해주세요.")
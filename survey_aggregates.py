@@ -0,0 +1,130 @@
+"""응답 현황 대시보드용 집계 요약.
+
+시트별로 응답 수, 컬럼별 범주 집계, 범주형 컬럼 목록을 보관하고 새로 추가된 행만 반영해 갱신합니다.
+응답 시트는 행이 추가되기만 하므로 갱신 비용은 새 행 수에 비례합니다.
+"""
+import threading
+
+import pandas as pd
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+# 범주형으로 간주할 최대 고유값 수 (미만)
+CATEGORY_LIMIT = 10
+
+SATISFACTION_ORDER = ['매우 만족', '만족', '보통', '불만족', '매우 불만족']
+
+
+class SurveySummary:
+    """한 응답 시트의 집계 요약입니다.
+
+    always_count에 있는 컬럼은 고유값이 많아도 값별 집계를 유지합니다.
+    """
+
+    def __init__(self, always_count=('만족도',)):
+        self.always_count = set(always_count)
+        self.version = 0  # 다시 집계해도 이전 값과 겹치지 않도록 초기화하지 않습니다
+        self.reset()
+
+    def reset(self):
+        self.total = 0
+        self.columns = None
+        self._last_row = None
+        self._counts = {}        # 컬럼 -> {값: 개수}, 고유값이 많아지면 None
+        self._has_na = {}
+        self._high_cardinality = set()
+        self._text_columns = set()
+        self._html_cache = {}
+
+    def _row_key(self, df, position):
+        return tuple(df.iloc[position].astype(str))
+
+    def _can_append(self, df):
+        if self.columns is None or list(df.columns) != self.columns or len(df) < self.total:
+            return False
+        if self.total and self._row_key(df, self.total - 1) != self._last_row:
+            return False
+        return True
+
+    def update(self, df):
+        """DataFrame의 새 행만 반영합니다. 앞부분이 달라졌으면 처음부터 다시 집계합니다."""
+        if not self._can_append(df):
+            self.reset()
+            self.columns = list(df.columns)
+        if len(df) == self.total:
+            return self
+
+        new_rows = df.iloc[self.total:]
+        for col in self.columns:
+            values = new_rows[col]
+            if is_object_dtype(values.dtype) or is_string_dtype(values.dtype):
+                self._text_columns.add(col)
+            counts = self._counts.get(col, {})
+            if counts is None:
+                continue
+            for value, count in values.value_counts().items():
+                counts[value] = counts.get(value, 0) + int(count)
+            self._has_na[col] = self._has_na.get(col, False) or bool(values.isna().any())
+            # 전체 데이터의 고유값 수(결측값 포함)가 기준 이상이면 범주형에서 제외하고 더 이상 집계하지 않습니다
+            if len(counts) + self._has_na[col] >= CATEGORY_LIMIT:
+                self._high_cardinality.add(col)
+            if col in self._high_cardinality and col not in self.always_count:
+                self._counts[col] = None
+            else:
+                self._counts[col] = counts
+
+        self.total = len(df)
+        self._last_row = self._row_key(df, self.total - 1)
+        self.version += 1
+        self._html_cache.clear()
+        return self
+
+    def counts(self, column):
+        """컬럼의 값별 응답 수를 value_counts()와 같은 형태로 반환합니다. 범주형이 아니면 None입니다."""
+        counts = self._counts.get(column)
+        if counts is None:
+            return None
+        return pd.Series(counts, dtype='int64').sort_values(ascending=False, kind='stable')
+
+    def categorical_columns(self, exclude=()):
+        """고유값이 적은 텍스트 컬럼 목록을 시트 컬럼 순서대로 반환합니다."""
+        return [
+            col for col in (self.columns or [])
+            if col not in exclude and col in self._text_columns and col not in self._high_cardinality
+        ]
+
+    def satisfaction_counts(self, column='만족도'):
+        counts = self.counts(column)
+        if counts is None:
+            counts = pd.Series(dtype='int64')
+        return counts.reindex(SATISFACTION_ORDER).fillna(0)
+
+    def ratio_html(self, column):
+        """컬럼의 응답 비율 HTML을 만듭니다. 데이터가 바뀌지 않았으면 이전 결과를 재사용합니다."""
+        if column not in self._html_cache:
+            counts = self.counts(column)
+            self._html_cache[column] = ' '.join([
+                f'<div style="background: #dbeafe; padding: 0.5rem; border-radius: 0.25rem;">'
+                f'<b>{k}</b>: {v/self.total*100:.1f}%</div>'
+                for k, v in counts.items()
+            ])
+        return self._html_cache[column]
+
+
+class SummaryStore:
+    """시트 ID별 집계 요약을 보관합니다."""
+
+    def __init__(self):
+        self._summaries = {}
+        self._lock = threading.Lock()
+
+    def update(self, sheet_id, df):
+        with self._lock:
+            summary = self._summaries.setdefault(sheet_id, SurveySummary())
+            return summary.update(df)
+
+    def invalidate(self, sheet_id=None):
+        with self._lock:
+            if sheet_id is None:
+                self._summaries.clear()
+            else:
+                self._summaries.pop(sheet_id, None)
@@ -0,0 +1,145 @@
+"""응답 현황 차트 생성과 캐시.
+
+같은 데이터로 만든 Plotly Figure는 데이터 지문(fingerprint)을 키로 재사용합니다.
+경량 모드에서는 상위 N개 범주와 '기타'만 그립니다. Plotly는 차트를 처음 만들 때 불러옵니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from lazy_imports import lazy_import
+from survey_aggregates import SATISFACTION_ORDER
+
+DEFAULT_MAX_FIGURES = 256
+LIGHTWEIGHT_TOP_N = 5
+OTHER_LABEL = "기타"
+
+SATISFACTION_COLORS = ['#22c55e', '#86efac', '#fde047', '#f87171', '#dc2626']
+
+
+def fingerprint(counts, *extra):
+    """값별 집계와 추가 옵션으로 데이터 지문을 만듭니다."""
+    h = hashlib.sha1()
+    for key, value in counts.items():
+        h.update(f"{key}\x1f{value}\x1e".encode('utf-8'))
+    for item in extra:
+        h.update(f"{item}\x1d".encode('utf-8'))
+    return h.hexdigest()
+
+
+def top_n_counts(counts, n=LIGHTWEIGHT_TOP_N):
+    """상위 n개 범주만 남기고 나머지는 '기타'로 합칩니다."""
+    if n is None or len(counts) <= n:
+        return counts
+    top = counts.nlargest(n)
+    rest = counts.drop(top.index).sum()
+    return pd.concat([top, pd.Series({OTHER_LABEL: rest})])
+
+
+def satisfaction_donut(satisfaction_counts, total_responses):
+    """만족도 분포 도넛 차트를 만듭니다."""
+    go = lazy_import('plotly.graph_objects')
+    fig = go.Figure(data=[go.Pie(
+        labels=satisfaction_counts.index,
+        values=satisfaction_counts.values,
+        hole=.4,
+        marker=dict(colors=SATISFACTION_COLORS)
+    )])
+
+    fig.update_layout(
+        title="만족도 분포",
+        annotations=[dict(text=f'총 {total_responses}명', x=0.5, y=0.5, font_size=20, showarrow=False)],
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        width=800,
+        height=500
+    )
+    return fig
+
+
+def satisfaction_mix_bar(satisfaction_by_survey):
+    """{Survey 이름: 만족도 집계}를 Survey별 비율(%) 누적 가로 막대로 비교합니다."""
+    go = lazy_import('plotly.graph_objects')
+    names = list(satisfaction_by_survey)
+    fig = go.Figure()
+    for level, color in zip(SATISFACTION_ORDER, SATISFACTION_COLORS):
+        values = []
+        for name in names:
+            counts = satisfaction_by_survey[name]
+            total = counts.sum()
+            values.append(counts.get(level, 0) / total * 100 if total else 0)
+        fig.add_trace(go.Bar(name=level, y=names, x=values, orientation='h', marker=dict(color=color)))
+
+    fig.update_layout(
+        barmode='stack',
+        title="Survey별 만족도 분포 (%)",
+        xaxis=dict(range=[0, 100]),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=max(250, 60 * len(names) + 120)
+    )
+    return fig
+
+
+def category_bar(column, counts):
+    """컬럼의 응답 분포 가로 막대 차트를 만듭니다."""
+    go = lazy_import('plotly.graph_objects')
+    fig = go.Figure(data=[
+        go.Bar(
+            x=counts.values,
+            y=counts.index,
+            orientation='h',
+            marker=dict(
+                color='#3b82f6',
+                line=dict(color='#1e40af', width=1)
+            )
+        )
+    ])
+
+    fig.update_layout(
+        title=f"{column} 분포",
+        xaxis_title="응답 수",
+        yaxis_title=None,
+        showlegend=False,
+        width=800,
+        height=400
+    )
+    return fig
+
+
+class FigureCache:
+    """데이터 지문을 키로 Plotly Figure를 보관하는 LRU 캐시입니다."""
+
+    def __init__(self, max_figures=DEFAULT_MAX_FIGURES):
+        self.max_figures = max_figures
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """key에 해당하는 Figure를 반환하고, 없으면 build()로 만들어 저장합니다."""
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return fig
+            self.misses += 1
+        fig = build()
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_figures:
+                self._figures.popitem(last=False)
+        return fig
+
+    def satisfaction_donut(self, satisfaction_counts, total_responses):
+        key = ("donut", fingerprint(satisfaction_counts, total_responses))
+        return self.get_or_build(key, lambda: satisfaction_donut(satisfaction_counts, total_responses))
+
+    def category_bar(self, column, counts, top_n=None):
+        counts = top_n_counts(counts, top_n)
+        key = ("bar", column, fingerprint(counts))
+        return self.get_or_build(key, lambda: category_bar(column, counts))
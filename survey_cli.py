@@ -0,0 +1,382 @@
+"""Streamlit 없이 쓰는 배치용 명령줄 도구.
+
+cron이나 작업 실행기에서 등록된 Survey를 동기화하고, 미응답자 보고서를 만들고, 리마인더를 보내고, 응답을
+파일로 내보냅니다. 시트 목록은 앱과 같은 레지스트리(sheet_registry.db)를, 발송 이력은 같은 발송함
+(reminder_outbox.db)을 쓰므로 앱과 CLI가 같은 재발송 제한을 공유합니다.
+
+    python survey_cli.py sync
+    python survey_cli.py report --survey "교육 만족도" --details --json
+    python survey_cli.py remind --campaign 2024-03-2주차 --cooldown-hours 24
+    python survey_cli.py export --format parquet --output-dir exports
+
+--survey를 주지 않으면 등록된 Survey 전체가 대상입니다. report와 remind는 Survey마다 --roster로 지정한 명단,
+지정하지 않으면 자동 리마인더 스케줄에 연결된 명단과 비교합니다. 연결된 명단이 없는 Survey는 응답 수만
+보고하고 리마인더를 보내지 않습니다 (다른 과정의 대상자에게 발송하지 않도록 명단을 합쳐 쓰지 않습니다).
+종료 코드: 0 성공, 1 일부 시트나 발송 실패, 2 설정 오류(인증 정보, 시트 선택 등)
+"""
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+
+import pandas as pd
+
+from google_quota import GOOGLE_QUOTA, SHEETS_READ, per_minute
+from instrumentation import METRICS
+from lazy_imports import lazy_import
+from reminder_engine import DEFAULT_MAX_WORKERS, DEFAULT_TOKEN_PATH, build_dispatcher, load_saved_credentials
+from reminder_outbox import DEFAULT_OUTBOX_PATH, ReminderOutbox
+from reminder_scheduler import ScheduleStore
+from respondent_matching import find_non_respondents, normalize_email
+from sheet_registry import DEFAULT_REGISTRY_PATH, KIND_SURVEY, KIND_TARGET, SheetRegistry
+from sheet_repository import DEFAULT_FETCH_WORKERS, SheetRepository
+from snapshot_store import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+from survey_export import EXPORT_FORMATS, export_archive, export_frame, safe_filename
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_CONFIG = 2
+
+DEFAULT_SERVICE_ACCOUNT = 'service_account.json'
+DEFAULT_SHEET_TIMEOUT = 120  # 시트 하나당 (초)
+SHEETS_SCOPE = ['https://spreadsheets.google.com/feeds',
+                'https://www.googleapis.com/auth/drive']
+REPORT_COLUMNS = ['이름', '소속', '이메일']
+NO_ROSTER = "연결된 대상자 명단이 없습니다. --roster로 지정하거나 자동 리마인더 스케줄을 만들어주세요."
+
+
+class CLIError(Exception):
+    """설정 문제로 명령을 실행할 수 없을 때 올립니다 (종료 코드 2)."""
+
+
+def open_repository(args, registry):
+    """서비스 계정으로 시트 저장소를 만듭니다. 동기화 결과는 레지스트리와 스냅샷에 기록됩니다."""
+    if not os.path.exists(args.service_account):
+        raise CLIError(f"서비스 계정 JSON 파일({args.service_account})이 없습니다.")
+    gspread = lazy_import('gspread')
+    service_account = lazy_import('oauth2client.service_account')
+    creds = service_account.ServiceAccountCredentials.from_json_keyfile_name(args.service_account, SHEETS_SCOPE)
+    client = gspread.authorize(creds)
+    snapshot_store = SnapshotStore(args.snapshot_dir)
+    return SheetRepository(
+        lambda: client,
+        snapshot_store=snapshot_store if snapshot_store.available else None,
+        on_sync=registry.record_sync,
+    )
+
+
+def select_sheets(registry, kind, wanted):
+    """ID나 이름으로 등록된 시트를 고릅니다. wanted가 비어 있으면 해당 종류 전체를 반환합니다."""
+    sheets = registry.sheets(kind)
+    if not wanted:
+        return sheets
+    by_key = {}
+    for sheet in sheets:
+        by_key[sheet["id"]] = sheet
+        by_key.setdefault(sheet["name"], sheet)
+    missing = [key for key in wanted if key not in by_key]
+    if missing:
+        raise CLIError(f"등록되지 않은 시트입니다: {', '.join(missing)}")
+    return list({by_key[key]["id"]: by_key[key] for key in wanted}.values())
+
+
+def fetch(repo, sheets, args):
+    """시트를 API에서 새로 가져와 ({id: DataFrame}, {id: 오류})를 반환합니다."""
+    return repo.fetch_many(
+        [sheet["id"] for sheet in sheets], max_workers=args.workers,
+        sheet_timeout=args.sheet_timeout, refresh=True
+    )
+
+
+def combine_rosters(frames):
+    """여러 대상자 명단을 합치고 같은 이메일은 한 번만 남깁니다."""
+    rosters = [df for df in frames if df is not None and not df.empty]
+    if not rosters:
+        return None
+    roster = pd.concat(rosters, ignore_index=True)
+    if '이메일' in roster.columns:
+        key = normalize_email(roster['이메일'])
+        roster = roster[key.isna() | ~key.duplicated()].reset_index(drop=True)
+    return roster
+
+
+def load_roster(repo, registry, args):
+    targets = select_sheets(registry, KIND_TARGET, args.roster)
+    if not targets:
+        raise CLIError("등록된 대상자 명단이 없습니다.")
+    frames, errors = fetch(repo, targets, args)
+    if errors:
+        names = {sheet["id"]: sheet["name"] for sheet in targets}
+        raise CLIError("대상자 명단을 불러올 수 없습니다: " + ", ".join(
+            f"{names[sheet_id]} ({error})" for sheet_id, error in errors.items()
+        ))
+    roster = combine_rosters(frames.values())
+    if roster is None:
+        raise CLIError("대상자 명단이 비어 있습니다.")
+    return roster
+
+
+def load_surveys(repo, registry, args):
+    """선택한 Survey를 가져와 (시트 목록, {id: DataFrame}, {id: 오류})를 반환합니다."""
+    surveys = select_sheets(registry, KIND_SURVEY, args.survey)
+    if not surveys:
+        raise CLIError("등록된 Survey가 없습니다.")
+    frames, errors = fetch(repo, surveys, args)
+    return surveys, frames, errors
+
+
+def survey_rosters(repo, registry, args, surveys):
+    """Survey별로 비교할 대상자 명단을 정해 ({survey_id: DataFrame 또는 None}, {survey_id: 오류})를 반환합니다.
+
+    --roster를 주면 모든 Survey에 그 명단을 쓰고, 주지 않으면 자동 리마인더 스케줄에 연결된 명단을 씁니다.
+    연결된 명단이 없는 Survey는 None입니다.
+    """
+    if args.roster:
+        roster = load_roster(repo, registry, args)
+        return {sheet["id"]: roster for sheet in surveys}, {}
+
+    links = ScheduleStore(args.outbox).roster_links()
+    linked = {sheet["id"]: links.get(sheet["id"]) for sheet in surveys}
+    frames, errors = fetch(repo, [{"id": roster_id} for roster_id in set(linked.values()) if roster_id], args)
+    rosters, roster_errors = {}, {}
+    for survey_id, roster_id in linked.items():
+        if roster_id in errors:
+            roster_errors[survey_id] = f"대상자 명단을 불러올 수 없습니다: {errors[roster_id]}"
+        else:
+            rosters[survey_id] = frames.get(roster_id)
+    return rosters, roster_errors
+
+
+def non_respondent_report(roster, df_survey, details=False):
+    """Survey 하나의 응답 현황과 (선택 시) 미응답자 목록을 만듭니다."""
+    non_respondents = find_non_respondents(roster, df_survey)
+    responded = len(roster) - len(non_respondents)
+    report = {
+        "roster": len(roster),
+        "responded": responded,
+        "non_respondents": len(non_respondents),
+        "response_rate": round(responded / len(roster) * 100, 1) if len(roster) else 0.0,
+    }
+    if details:
+        columns = [col for col in REPORT_COLUMNS if col in non_respondents.columns]
+        report["details"] = non_respondents[columns].astype(object).where(
+            non_respondents[columns].notna(), None
+        ).to_dict('records')
+    return report, non_respondents
+
+
+# --- 명령 --------------------------------------------------------------------
+
+def cmd_sync(args, registry, repo):
+    kinds = [KIND_SURVEY, KIND_TARGET] if args.kind == 'all' else [args.kind]
+    sheets = [
+        dict(sheet, kind=kind)
+        for kind in kinds
+        for sheet in select_sheets(registry, kind, args.survey if kind == KIND_SURVEY else args.roster)
+    ]
+    frames, errors = fetch(repo, sheets, args)
+    results = []
+    for sheet in sheets:
+        df = frames.get(sheet["id"])
+        results.append({
+            "id": sheet["id"], "name": sheet["name"], "kind": sheet["kind"],
+            "rows": len(df) if df is not None else None,
+            "error": errors.get(sheet["id"]),
+        })
+    return {"sheets": results}, bool(errors)
+
+
+def cmd_report(args, registry, repo):
+    surveys, frames, errors = load_surveys(repo, registry, args)
+    rosters, roster_errors = survey_rosters(repo, registry, args, surveys)
+    results, missing = [], []
+    for sheet in surveys:
+        entry = {"id": sheet["id"], "name": sheet["name"]}
+        results.append(entry)
+        error = errors.get(sheet["id"]) or roster_errors.get(sheet["id"])
+        if error:
+            entry["error"] = error
+            continue
+        roster = rosters.get(sheet["id"])
+        if roster is None:
+            # 비교할 명단이 없으면 응답률 대신 응답 수만 보고합니다
+            entry["responses"] = len(frames[sheet["id"]])
+            continue
+        report, non_respondents = non_respondent_report(roster, frames[sheet["id"]], args.details)
+        entry.update(report)
+        if args.output:
+            missing.append(non_respondents.assign(Survey=sheet["name"]))
+    if args.output and missing:
+        pd.concat(missing, ignore_index=True).to_csv(args.output, index=False, encoding='utf-8-sig')
+    return {"surveys": results, "output": args.output}, bool(errors or roster_errors)
+
+
+def cmd_remind(args, registry, repo):
+    dispatcher = None
+    if not args.dry_run:
+        creds = load_saved_credentials(args.token)
+        if creds is None:
+            raise CLIError(f"저장된 Gmail 인증 정보({args.token})가 없습니다. 앱의 리마인더 페이지에서 한 번 인증해주세요.")
+        dispatcher = build_dispatcher(creds, max_workers=args.max_workers)
+
+    surveys, frames, errors = load_surveys(repo, registry, args)
+    rosters, roster_errors = survey_rosters(repo, registry, args, surveys)
+    outbox = ReminderOutbox(args.outbox)
+    results, failed = [], False
+    for sheet in surveys:
+        entry = {"id": sheet["id"], "name": sheet["name"]}
+        results.append(entry)
+        roster = rosters.get(sheet["id"])
+        error = errors.get(sheet["id"]) or roster_errors.get(sheet["id"]) or (NO_ROSTER if roster is None else None)
+        if error:
+            entry["error"] = error
+            failed = True
+            continue
+        _, non_respondents = non_respondent_report(roster, frames[sheet["id"]])
+        entry["non_respondents"] = len(non_respondents)
+        if args.dry_run or non_respondents.empty:
+            entry.update({"sent": 0, "failed": 0})
+            continue
+        outbox.enqueue(sheet["id"], args.campaign, zip(non_respondents['이름'], non_respondents['이메일']),
+                       sheet["url"])
+        _, stats = outbox.drain(dispatcher, sheet["id"], args.campaign, cooldown_hours=args.cooldown_hours)
+        entry.update({"sent": stats["sent"], "failed": stats["failed"]})
+        failed = failed or stats["failed"] > 0
+    return {"campaign": args.campaign, "dry_run": args.dry_run, "surveys": results}, failed
+
+
+def cmd_export(args, registry, repo):
+    surveys, frames, errors = load_surveys(repo, registry, args)
+    results = [
+        {"id": sheet["id"], "name": sheet["name"], "rows": len(frames[sheet["id"]]) if sheet["id"] in frames else None,
+         "error": errors.get(sheet["id"])}
+        for sheet in surveys
+    ]
+    if args.archive:
+        named = {sheet["name"]: frames[sheet["id"]] for sheet in surveys if sheet["id"] in frames}
+        with export_archive(named, args.format) as src, open(args.archive, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        return {"archive": args.archive, "surveys": results}, bool(errors)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    used = set()
+    for sheet, entry in zip(surveys, results):
+        if sheet["id"] not in frames:
+            continue
+        base = safe_filename(sheet["name"])
+        filename, n = f"{base}.{args.format}", 1
+        while filename in used:
+            n += 1
+            filename = f"{base}_{n}.{args.format}"
+        used.add(filename)
+        path = os.path.join(args.output_dir, filename)
+        with export_frame(frames[sheet["id"]], args.format) as src, open(path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        entry["path"] = path
+    return {"output_dir": args.output_dir, "surveys": results}, bool(errors)
+
+
+COMMANDS = {"sync": cmd_sync, "report": cmd_report, "remind": cmd_remind, "export": cmd_export}
+
+
+# --- 출력 --------------------------------------------------------------------
+
+def _format_entry(entry):
+    name = f"{entry['name']} ({entry['id']})"
+    if entry.get("error"):
+        return f"✗ {name}: {entry['error']}"
+    parts = []
+    if entry.get("rows") is not None:
+        parts.append(f"{entry['rows']:,}행")
+    if "responses" in entry:
+        parts.append(f"응답 {entry['responses']:,}건 (연결된 대상자 명단 없음)")
+    if "response_rate" in entry:
+        parts.append(f"응답 {entry['responded']:,}/{entry['roster']:,} ({entry['response_rate']}%)")
+    if "non_respondents" in entry:
+        parts.append(f"미응답 {entry['non_respondents']:,}명")
+    if "sent" in entry:
+        parts.append(f"발송 {entry['sent']:,} · 실패 {entry['failed']:,}")
+    if entry.get("path"):
+        parts.append(entry["path"])
+    return f"✓ {name}: " + " · ".join(parts)
+
+
+def print_result(command, result, as_json):
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+        return
+    for entry in result.get("sheets", result.get("surveys", [])):
+        print(_format_entry(entry))
+        for person in entry.get("details", []):
+            print("    " + " · ".join(str(v) for v in person.values() if v is not None))
+    for key in ("output", "archive"):
+        if result.get(key):
+            print(f"저장: {result[key]}")
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--registry', default=DEFAULT_REGISTRY_PATH, help="시트 레지스트리 파일")
+    common.add_argument('--service-account', default=DEFAULT_SERVICE_ACCOUNT, help="서비스 계정 JSON 파일")
+    common.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIR)
+    common.add_argument('--survey', action='append', default=[], help="Survey ID 또는 이름 (여러 번 지정 가능)")
+    common.add_argument('--roster', action='append', default=[],
+                        help="대상자 명단 ID 또는 이름 (여러 번 지정 가능). 지정하지 않으면 report/remind는 "
+                             "자동 리마인더 스케줄에 연결된 명단을 씁니다")
+    common.add_argument('--outbox', default=DEFAULT_OUTBOX_PATH, help="발송함·스케줄 파일")
+    common.add_argument('--workers', type=int, default=DEFAULT_FETCH_WORKERS, help="동시에 가져올 시트 수")
+    common.add_argument('--sheet-timeout', type=float, default=DEFAULT_SHEET_TIMEOUT, help="시트 하나당 시간 한도 (초)")
+    common.add_argument('--reads-per-minute', type=int, default=None, help="Sheets 읽기 할당량 (분당)")
+    common.add_argument('--metrics-file', default=None, help="끝난 뒤 계측값을 Prometheus 텍스트로 저장할 경로")
+    common.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+
+    parser = argparse.ArgumentParser(prog='survey_cli', description="Survey 동기화·보고서·리마인더·내보내기 배치 도구")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    sync = subparsers.add_parser('sync', parents=[common], help="등록된 시트를 가져와 캐시·스냅샷·메타데이터를 갱신")
+    sync.add_argument('--kind', choices=['all', KIND_SURVEY, KIND_TARGET], default='all')
+
+    report = subparsers.add_parser('report', parents=[common], help="Survey별 미응답자 보고서")
+    report.add_argument('--details', action='store_true', help="미응답자 목록 포함")
+    report.add_argument('--output', default=None, help="미응답자 목록을 저장할 CSV 파일")
+
+    remind = subparsers.add_parser('remind', parents=[common], help="미응답자에게 리마인더 발송")
+    remind.add_argument('--campaign', default=f"cli-{datetime.date.today().isoformat()}",
+                        help="발송 캠페인 이름 (같은 캠페인에서는 한 사람에게 한 번만 발송)")
+    remind.add_argument('--cooldown-hours', type=float, default=0, help="최근 이 시간 안에 받은 사람은 제외")
+    remind.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS)
+    remind.add_argument('--token', default=DEFAULT_TOKEN_PATH, help="저장된 Gmail 인증 정보")
+    remind.add_argument('--dry-run', action='store_true', help="발송하지 않고 대상 수만 확인")
+
+    export = subparsers.add_parser('export', parents=[common], help="Survey 응답을 파일로 내보내기")
+    export.add_argument('--format', choices=[ext for ext, _ in EXPORT_FORMATS.values()], default='csv')
+    export.add_argument('--output-dir', default='.')
+    export.add_argument('--archive', default=None, help="파일별로 저장하지 않고 하나의 ZIP으로 저장")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.reads_per_minute:
+        GOOGLE_QUOTA.configure(SHEETS_READ, *per_minute(args.reads_per_minute))
+    try:
+        registry = SheetRegistry(args.registry)
+        repo = open_repository(args, registry)
+        result, partial = COMMANDS[args.command](args, registry, repo)
+        code = EXIT_PARTIAL if partial else EXIT_OK
+    except CLIError as e:
+        result, code = {"error": str(e)}, EXIT_CONFIG
+        if not args.json:
+            print(f"오류: {e}", file=sys.stderr)
+    result = {"command": args.command, "exit_code": code, **result}
+    if args.json or code != EXIT_CONFIG:
+        print_result(args.command, result, args.json)
+    if args.metrics_file:
+        METRICS.write_prometheus(args.metrics_file)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
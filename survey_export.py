@@ -0,0 +1,131 @@
+"""응답 데이터 내보내기 (CSV, Parquet, XLSX, 전체 압축본).
+
+DataFrame을 일정 크기의 청크로 나눠 임시 파일에 차례로 기록하므로, 전체 파일을 한 번에 문자열로
+만들지 않습니다. 다운로드 버튼에서 클릭 시점에만 호출되도록 사용합니다.
+"""
+import re
+import tempfile
+import zipfile
+
+import pandas as pd
+
+from lazy_imports import lazy_import
+from snapshot_store import mixed_columns
+
+DEFAULT_CHUNK_SIZE = 50_000
+EXCEL_MAX_ROWS = 1_048_576  # 헤더 포함 시트당 최대 행 수
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def iter_chunks(df, chunk_size=DEFAULT_CHUNK_SIZE):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def write_csv(df, f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """CSV를 청크 단위로 바이너리 파일에 기록합니다."""
+    if df.empty:
+        f.write(df.to_csv(index=False).encode('utf-8'))
+        return
+    for i, chunk in enumerate(iter_chunks(df, chunk_size)):
+        f.write(chunk.to_csv(index=False, header=(i == 0)).encode('utf-8'))
+
+
+def write_parquet(df, f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Parquet을 청크마다 row group 하나씩 기록합니다. 숫자와 문자열이 섞인 컬럼은 문자열로 저장합니다."""
+    try:
+        pa = lazy_import('pyarrow')
+        pq = lazy_import('pyarrow.parquet')
+    except ImportError:
+        raise ImportError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다.")
+    mixed = mixed_columns(df)
+
+    def to_table(chunk, schema=None):
+        if mixed:
+            chunk = chunk.copy(deep=False)
+            for col in mixed:
+                chunk[col] = chunk[col].map(lambda v: v if v is None else str(v))
+        return pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+    # 스키마는 전체 DataFrame 기준으로 정합니다. 첫 청크에서 모두 비어 있던 컬럼도 뒤 청크의 값으로 타입을 정하도록
+    # 컬럼마다 처음 나오는 값 하나씩만 모은 한 행짜리 표본에서 추론합니다
+    sample = pd.DataFrame({
+        col: df[col].iloc[[df[col].notna().argmax()]].reset_index(drop=True) if len(df) else df[col]
+        for col in df.columns
+    })
+    schema = to_table(sample).schema
+    with pq.ParquetWriter(f, schema) as writer:
+        for chunk in iter_chunks(df, chunk_size):
+            writer.write_table(to_table(chunk, schema))
+
+
+def write_xlsx(df, f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """XLSX를 write-only 모드로 기록합니다. 시트 최대 행 수를 넘으면 다음 시트에 이어서 씁니다."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    header = [str(col) for col in df.columns]
+    sheet, rows_in_sheet, sheet_no = None, 0, 0
+
+    def new_sheet():
+        nonlocal sheet, rows_in_sheet, sheet_no
+        sheet_no += 1
+        sheet = workbook.create_sheet(title="Sheet1" if sheet_no == 1 else f"Sheet{sheet_no}")
+        sheet.append(header)
+        rows_in_sheet = 1
+
+    new_sheet()
+    for chunk in iter_chunks(df, chunk_size):
+        for row in chunk.itertuples(index=False, name=None):
+            if rows_in_sheet >= EXCEL_MAX_ROWS:
+                new_sheet()
+            sheet.append([None if pd.isna(v) else v for v in row])  # 결측값은 빈 칸으로
+            rows_in_sheet += 1
+    workbook.save(f)
+
+
+_WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+
+def export_frame(df, extension, chunk_size=DEFAULT_CHUNK_SIZE):
+    """DataFrame을 지정한 형식의 임시 파일로 내보내고, 처음 위치로 되돌린 파일 객체를 반환합니다."""
+    f = tempfile.TemporaryFile()
+    _WRITERS[extension](df, f, chunk_size)
+    f.seek(0)
+    return f
+
+
+def safe_filename(name):
+    return re.sub(r'[\\/:*?"<>|]+', '_', str(name)).strip() or "survey"
+
+
+def export_archive(frames, extension="csv", chunk_size=DEFAULT_CHUNK_SIZE):
+    """{이름: DataFrame}을 형식별 파일로 묶은 ZIP 임시 파일을 반환합니다."""
+    f = tempfile.TemporaryFile()
+    used = set()
+    with zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, df in frames.items():
+            base = safe_filename(name)
+            filename, n = f"{base}.{extension}", 1
+            while filename in used:
+                n += 1
+                filename = f"{base}_{n}.{extension}"
+            used.add(filename)
+            with archive.open(filename, 'w', force_zip64=True) as member:
+                if extension == "csv":
+                    write_csv(df, member, chunk_size)
+                else:
+                    # Parquet/XLSX 작성기는 탐색 가능한 파일이 필요하므로 임시 파일을 거칩니다
+                    with export_frame(df, extension, chunk_size) as tmp:
+                        while True:
+                            block = tmp.read(1024 * 1024)
+                            if not block:
+                                break
+                            member.write(block)
+    f.seek(0)
+    return f
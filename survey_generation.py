@@ -0,0 +1,440 @@
+"""OpenAI 기반 설문 문항 생성과 응답 캐시.
+
+대상·목적·필수 항목을 정규화한 값과 모델, temperature로 캐시 키를 만들고, 같은 입력이면 디스크에 저장된
+결과를 그대로 돌려줍니다. 캐시 폴더 전체 크기가 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+
+생성은 스트리밍으로 받으며, 응답 JSON을 조금씩 읽어 questions 배열의 문항이 완성되는 대로 내보냅니다.
+여러 초안을 만들 때는 비동기 클라이언트로 요청을 동시에 보내고, 끝나는 순서대로 결과를 넘깁니다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+
+from instrumentation import count, timer
+
+SURVEY_MODEL = "gpt-3.5-turbo"
+SURVEY_TEMPERATURE = 0.7
+SYSTEM_PROMPT = "You are a helpful assistant that creates survey questions."
+
+DEFAULT_CACHE_DIR = 'generation_cache'
+DEFAULT_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# 초안별 추가 지침 (이름, 지침)
+VARIANT_STYLES = [
+    ("기본", None),
+    ("간결형", "문항은 5개 이내로 핵심만 간결하게 구성해주세요."),
+    ("상세형", "문항을 10개 이상으로 세분화하고 주관식 문항을 포함해주세요."),
+    ("친근한 어조", "질문은 부드럽고 친근한 구어체로 작성해주세요."),
+]
+DEFAULT_VARIANT_CONCURRENCY = 3
+DEFAULT_VARIANT_TIMEOUT = 60
+
+
+def build_prompt(target, purpose, requirements):
+    return f"""
+        다음 조건에 맞는 설문조사 문항을 생성해주세요:
+
+        대상: {target}
+        목적: {purpose}
+        필수 포함 항목: {requirements}
+
+        다음 형식으로 JSON 응답을 생성해주세요:
+        {{
+            "title": "설문 제목",
+            "description": "설문 설명",
+            "questions": [
+                {{
+                    "type": "text/radio/checkbox/textarea",
+                    "question": "질문 내용",
+                    "required": true/false,
+                    "options": ["보기1", "보기2"] // type이 radio나 checkbox인 경우에만
+                }}
+            ]
+        }}
+        """
+
+
+def build_messages(target, purpose, requirements, style=None):
+    prompt = build_prompt(target, purpose, requirements)
+    if style:
+        prompt += f"\n        추가 지침: {style}\n"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def normalize_input(text):
+    """캐시 키용으로 입력을 정규화합니다 (NFKC, 앞뒤 공백 제거, 연속 공백 하나로)."""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', str(text or ''))).strip()
+
+
+def cache_key(target, purpose, requirements, model=SURVEY_MODEL, temperature=SURVEY_TEMPERATURE, style=None):
+    parts = [normalize_input(target), normalize_input(purpose), normalize_input(requirements), model, temperature]
+    if style:
+        parts.append(normalize_input(style))
+    payload = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """캐시 키별 생성 결과를 JSON 파일로 보관하는 크기 제한 캐시입니다."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """저장된 항목을 반환합니다. 없거나 읽을 수 없으면 None입니다."""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            count("cache_requests", cache="generation", result="miss")
+            return None
+        os.utime(path)  # 최근 사용 시각을 갱신해 LRU 순서로 정리합니다
+        with self._lock:
+            self.hits += 1
+            self.tokens_saved += entry.get("usage", {}).get("total_tokens", 0)
+        count("cache_requests", cache="generation", result="hit")
+        return entry
+
+    def put(self, key, entry):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            for name in os.listdir(self.directory):
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name))
+            total = sum(size for _, size, _ in files)
+            for _, size, name in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                total -= size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "tokens_saved": self.tokens_saved,
+            }
+
+
+class IncrementalSurveyParser:
+    """스트리밍으로 들어오는 설문 JSON을 읽으며 완성된 문항을 꺼냅니다.
+
+    feed(text)는 이번에 새로 완성된 문항 목록을 반환합니다. 최상위 title/description 값도 완성되는 대로
+    채웁니다. 잘못된 문항 하나는 건너뛰고(skipped) 나머지 문항은 계속 읽습니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.title = None
+        self.description = None
+        self.questions = []
+        self.skipped = 0
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._key = None
+        self._questions_depth = None
+        self._item_start = None
+
+    def feed(self, text):
+        self.text += text
+        completed = []
+        buf = self.text
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = buf[self._string_start:i + 1]
+                    if self._depth == 1 and self._key in ('title', 'description') and self._item_start is None:
+                        self._set_top_level(self._key, self._last_string)
+                continue
+            if self._depth == 0 and ch != '{':
+                continue  # 코드 블록 표시(```json) 등 JSON 바깥 문자는 무시합니다
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ':':
+                if self._depth == 1 and self._last_string is not None:
+                    self._key = self._loads(self._last_string)
+            elif ch == ',':
+                if self._depth == 1:
+                    self._key = None
+                self._last_string = None
+            elif ch in '{[':
+                self._depth += 1
+                if ch == '[' and self._depth == 2 and self._key == 'questions':
+                    self._questions_depth = self._depth
+                elif ch == '{' and self._questions_depth is not None and self._depth == self._questions_depth + 1:
+                    self._item_start = i
+            elif ch in '}]':
+                if ch == '}' and self._item_start is not None and self._depth == self._questions_depth + 1:
+                    question = self._loads(buf[self._item_start:i + 1])
+                    if isinstance(question, dict) and question.get('question'):
+                        self.questions.append(question)
+                        completed.append(question)
+                    else:
+                        self.skipped += 1
+                    self._item_start = None
+                elif ch == ']' and self._depth == self._questions_depth:
+                    self._questions_depth = None
+                self._depth -= 1
+        self._pos = len(buf)
+        return completed
+
+    def _set_top_level(self, key, token):
+        value = self._loads(token)
+        if isinstance(value, str):
+            setattr(self, key, value)
+
+    @staticmethod
+    def _loads(text):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    def result(self):
+        """전체 응답을 파싱한 설문 데이터와 일부만 복구했는지 여부를 반환합니다.
+
+        전체 JSON이 올바르지 않으면 지금까지 완성된 제목·설명·문항으로 설문을 구성합니다.
+        """
+        start, end = self.text.find('{'), self.text.rfind('}')
+        if start >= 0 and end > start:
+            data = self._loads(self.text[start:end + 1])
+            if isinstance(data, dict) and isinstance(data.get('questions'), list):
+                return data, False
+        if not self.questions:
+            raise ValueError("응답에서 설문 문항을 찾을 수 없습니다.")
+        return {
+            "title": self.title or "",
+            "description": self.description or "",
+            "questions": list(self.questions),
+        }, True
+
+
+def _usage_dict(usage):
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+
+
+def stream_survey(client, target, purpose, requirements, cache=None, regenerate=False,
+                  model=SURVEY_MODEL, temperature=SURVEY_TEMPERATURE):
+    """설문 문항을 스트리밍으로 생성하며 (이벤트, 값) 튜플을 차례로 내보냅니다.
+
+    이벤트는 "title", "description", "question"(문항 dict)이고, 마지막은 ("done", (설문 데이터, 정보))입니다.
+    정보 키: cached, partial(일부 복구 여부), skipped(건너뛴 문항 수), usage, key,
+    first_question(첫 문항까지 걸린 초), elapsed. 캐시 적중 시에는 저장된 결과를 바로 내보냅니다.
+    """
+    started = time.monotonic()
+    key = cache_key(target, purpose, requirements, model, temperature)
+    if cache is not None and not regenerate:
+        entry = cache.get(key)
+        if entry is not None:
+            survey_data = entry["survey"]
+            yield "title", survey_data.get("title", "")
+            yield "description", survey_data.get("description", "")
+            for question in survey_data.get("questions", []):
+                yield "question", question
+            elapsed = time.monotonic() - started
+            yield "done", (survey_data, {
+                "cached": True, "partial": False, "skipped": 0, "usage": entry.get("usage", {}), "key": key,
+                "first_question": elapsed, "elapsed": elapsed,
+            })
+            return
+
+    # 스트림을 여는 데까지(첫 응답 대기)만 잽니다. 이후 시간은 화면 갱신과 섞이므로 elapsed로 따로 봅니다
+    with timer("external_call", service="openai", op="chat.completions.create"):
+        stream = client.chat.completions.create(
+            model=model,
+            messages=build_messages(target, purpose, requirements),
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+    parser = IncrementalSurveyParser()
+    usage = {}
+    first_question = None
+    sent_title = sent_description = False
+    for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage = _usage_dict(chunk.usage)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        questions = parser.feed(delta)
+        if parser.title is not None and not sent_title:
+            sent_title = True
+            yield "title", parser.title
+        if parser.description is not None and not sent_description:
+            sent_description = True
+            yield "description", parser.description
+        for question in questions:
+            if first_question is None:
+                first_question = time.monotonic() - started
+            yield "question", question
+
+    count("openai_tokens", usage.get("total_tokens", 0), model=model)
+    survey_data, partial = parser.result()
+    if not partial and cache is not None:
+        cache.put(key, {
+            "survey": survey_data,
+            "usage": usage,
+            "model": model,
+            "temperature": temperature,
+            "created_at": time.time(),
+        })
+    yield "done", (survey_data, {
+        "cached": False, "partial": partial, "skipped": parser.skipped, "usage": usage, "key": key,
+        "first_question": first_question, "elapsed": time.monotonic() - started,
+    })
+
+
+def generate_survey(client, target, purpose, requirements, cache=None, regenerate=False,
+                    model=SURVEY_MODEL, temperature=SURVEY_TEMPERATURE):
+    """설문 문항을 생성해 (설문 데이터, 정보)를 반환합니다. 정보 키는 stream_survey와 같습니다.
+
+    regenerate=True이면 캐시를 건너뛰고 새로 생성한 결과로 캐시를 덮어씁니다. API 오류는 그대로 올립니다.
+    """
+    for event, value in stream_survey(client, target, purpose, requirements, cache, regenerate, model, temperature):
+        if event == "done":
+            return value
+
+
+async def _generate_variant(async_client, semaphore, target, purpose, requirements, name, style,
+                            cache, regenerate, timeout, model, temperature):
+    started = time.monotonic()
+    result = {"variant": name, "survey": None, "info": None, "error": None}
+    key = cache_key(target, purpose, requirements, model, temperature, style)
+    if cache is not None and not regenerate:
+        entry = cache.get(key)
+        if entry is not None:
+            result["survey"] = entry["survey"]
+            result["info"] = {"cached": True, "partial": False, "usage": entry.get("usage", {}), "key": key,
+                              "elapsed": time.monotonic() - started}
+            return result
+
+    try:
+        async with semaphore:
+            with timer("external_call", service="openai", op="chat.completions.create"):
+                response = await asyncio.wait_for(
+                    async_client.chat.completions.create(
+                        model=model,
+                        messages=build_messages(target, purpose, requirements, style),
+                        temperature=temperature
+                    ),
+                    timeout
+                )
+        parser = IncrementalSurveyParser()
+        parser.feed(response.choices[0].message.content or "")
+        survey_data, partial = parser.result()
+        usage = _usage_dict(getattr(response, "usage", None))
+        count("openai_tokens", usage.get("total_tokens", 0), model=model)
+        if not partial and cache is not None:
+            cache.put(key, {
+                "survey": survey_data,
+                "usage": usage,
+                "model": model,
+                "temperature": temperature,
+                "created_at": time.time(),
+            })
+        result["survey"] = survey_data
+        result["info"] = {"cached": False, "partial": partial, "usage": usage, "key": key,
+                          "elapsed": time.monotonic() - started}
+    except asyncio.TimeoutError:
+        result["error"] = f"{timeout}초 안에 응답이 없어 중단했습니다."
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+async def generate_variants(async_client, target, purpose, requirements, variants=VARIANT_STYLES,
+                            concurrency=DEFAULT_VARIANT_CONCURRENCY, timeout=DEFAULT_VARIANT_TIMEOUT,
+                            cache=None, regenerate=False, on_result=None,
+                            model=SURVEY_MODEL, temperature=SURVEY_TEMPERATURE):
+    """여러 초안을 동시에 생성해 variants 순서대로 결과 목록을 반환합니다.
+
+    variants는 (이름, 추가 지침) 목록이고, 동시에 보내는 요청은 concurrency개로 제한합니다.
+    결과 키: variant, survey, info, error. 요청마다 timeout(초)을 넘기면 그 초안만 실패로 처리합니다.
+    on_result(순번, 결과)는 초안이 끝나는 순서대로 호출됩니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index, name, style):
+        result = await _generate_variant(async_client, semaphore, target, purpose, requirements, name, style,
+                                         cache, regenerate, timeout, model, temperature)
+        return index, result
+
+    tasks = [asyncio.ensure_future(run(i, name, style)) for i, (name, style) in enumerate(variants)]
+    results = [None] * len(tasks)
+    for future in asyncio.as_completed(tasks):
+        index, result = await future
+        results[index] = result
+        if on_result:
+            on_result(index, result)
+    return results
+
+
+def run_variants(client_factory, target, purpose, requirements, **kwargs):
+    """새 이벤트 루프에서 generate_variants를 실행합니다.
+
+    client_factory()는 비동기 OpenAI 클라이언트를 만들며, 연결은 이 루프 안에서만 쓰고 닫습니다.
+    """
+    async def main():
+        async with client_factory() as async_client:
+            return await generate_variants(async_client, target, purpose, requirements, **kwargs)
+
+    return asyncio.run(main())
@@ -0,0 +1,105 @@
+"""응답 Raw Data 조회용 인덱스 (검색, 필터, 정렬, 페이지).
+
+시트별로 검색용 텍스트, 파싱한 날짜, 컬럼별 정렬 순서를 한 번 만들어 두고 페이지를 넘길 때마다 재사용합니다.
+화면에는 현재 페이지의 행만 보냅니다.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ['이름', '소속', '이메일']
+DATE_COLUMNS = ['제출일시', '타임스탬프', 'Timestamp']
+DEFAULT_PAGE_SIZE = 50
+
+
+def parse_dates(series):
+    """응답 시각 컬럼을 datetime으로 변환합니다. Google Forms의 '2024. 3. 5 오후 2:03:04' 형식도 처리합니다."""
+    text = series.astype("string").str.strip()
+    dates = pd.to_datetime(text, errors='coerce', format='mixed')
+    missing = dates.isna() & text.notna()
+    if missing.any():
+        korean = (
+            text[missing]
+            .str.replace('오전', 'AM', regex=False)
+            .str.replace('오후', 'PM', regex=False)
+        )
+        dates[missing] = pd.to_datetime(korean, errors='coerce', format='%Y. %m. %d %p %I:%M:%S')
+    return dates
+
+
+class ResponseIndex:
+    """한 응답 DataFrame에 대한 조회 인덱스입니다."""
+
+    def __init__(self, df):
+        self.df = df
+        columns = [col for col in SEARCH_COLUMNS if col in df.columns] or list(df.columns)
+        text = None
+        for col in columns:
+            part = df[col].astype("string").fillna("")
+            text = part if text is None else text + " " + part
+        self.search_text = text.str.lower() if text is not None else None
+        self.date_column = next((col for col in DATE_COLUMNS if col in df.columns), None)
+        self.dates = parse_dates(df[self.date_column]) if self.date_column else None
+        self._sort_orders = {}
+
+    def sort_order(self, column, ascending=True):
+        """컬럼 기준 정렬 순서(행 위치 배열)를 반환합니다. 한 번 계산한 순서는 재사용합니다."""
+        key = (column, ascending)
+        if key not in self._sort_orders:
+            values = (self.dates if column == self.date_column else self.df[column]).reset_index(drop=True)
+            try:
+                ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+            except TypeError:
+                # 숫자와 문자열이 섞인 컬럼은 문자열로 비교합니다
+                ordered = values.astype(str).sort_values(ascending=ascending, kind='stable')
+            order = ordered.index.to_numpy()
+            self._sort_orders[key] = order
+        return self._sort_orders[key]
+
+    def query(self, search="", filters=None, date_range=None, sort_by=None, ascending=True):
+        """조건에 맞는 행 위치 배열을 정렬된 순서로 반환합니다.
+
+        filters는 {컬럼: 허용 값 목록}, date_range는 (시작일, 종료일)이며 종료일 당일을 포함합니다.
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        if search and self.search_text is not None:
+            mask &= self.search_text.str.contains(search.lower(), regex=False).to_numpy(dtype=bool, na_value=False)
+        for column, values in (filters or {}).items():
+            if values:
+                mask &= self.df[column].isin(values).to_numpy()
+        if date_range and self.dates is not None:
+            start, end = date_range
+            dates = self.dates
+            in_range = dates.notna()
+            if start is not None:
+                in_range &= dates >= pd.Timestamp(start)
+            if end is not None:
+                in_range &= dates < pd.Timestamp(end) + pd.Timedelta(days=1)
+            mask &= in_range.to_numpy(dtype=bool)
+
+        if sort_by:
+            order = self.sort_order(sort_by, ascending)
+            return order[mask[order]]
+        return np.flatnonzero(mask)
+
+    def page(self, positions, page, page_size=DEFAULT_PAGE_SIZE):
+        """1부터 시작하는 페이지 번호의 행만 잘라 반환합니다."""
+        start = (page - 1) * page_size
+        return self.df.iloc[positions[start:start + page_size]]
+
+
+class ResponseIndexStore:
+    """시트 ID별 조회 인덱스를 보관합니다. 캐시된 DataFrame이 바뀌면 인덱스를 다시 만듭니다."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, sheet_id, df):
+        with self._lock:
+            index = self._indexes.get(sheet_id)
+            if index is None or index.df is not df:
+                index = ResponseIndex(df)
+                self._indexes[sheet_id] = index
+            return index
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import pytest
+
+import google_quota
+from google_quota import SHEETS_READ, QuotaLimiter, TokenBucket, per_minute
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # 실제 sleep처럼 조금이라도 시간이 흐르게 해 부동소수점 오차로 같은 시각에 머무르지 않게 합니다
+        self.now += max(seconds, 1e-6)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(google_quota, "time", clock)
+    return clock
+
+
+class ApiError(Exception):
+    def __init__(self, code, retry_after=None):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+        self.response = SimpleNamespace(headers={"Retry-After": retry_after} if retry_after else {})
+
+
+@pytest.mark.parametrize("limit", [6, 60, 300])
+def test_per_minute_bucket_never_exceeds_the_limit_in_any_minute(clock, limit):
+    rate, burst = per_minute(limit)
+    bucket = TokenBucket(rate, burst)
+    calls = []
+    while clock.now < 300:
+        bucket.acquire()
+        calls.append(clock.now)
+
+    busiest = max(sum(start <= t < start + 60 for t in calls) for start in calls)
+    assert busiest <= limit
+    # 처음 버스트 뒤로는 속도만큼 계속 내줍니다
+    assert len(calls) >= int(burst + rate * 300) - 1
+
+
+def test_acquire_waits_for_the_next_token(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, pytest.approx(0.5)]
+    bucket.drain()
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def flaky(errors, result="ok"):
+    errors = list(errors)
+
+    def func():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return func
+
+
+def test_call_retries_with_backoff_and_drains_on_429(clock):
+    delays = []
+    limiter = QuotaLimiter(quotas={SHEETS_READ: (1.0, 5)}, backoff=1.0, sleep=delays.append)
+
+    assert limiter.call(SHEETS_READ, "get", flaky([ApiError(429), ApiError(503), ApiError(429, "20")])) == "ok"
+
+    # 지터는 대기 시간의 절반까지이며, Retry-After가 더 길면 그 시간을 기다립니다
+    assert 0.5 <= delays[0] <= 1.0 and 1.0 <= delays[1] <= 2.0 and delays[2] == 20.0
+    # 429를 받으면 버킷이 비워져 다음 호출은 새 토큰을 기다립니다
+    assert limiter.bucket(SHEETS_READ)._tokens < 1
+
+
+def test_call_raises_non_retryable_errors_and_gives_up_after_retries(clock):
+    delays = []
+    limiter = QuotaLimiter(retries=2, sleep=delays.append)
+
+    with pytest.raises(ApiError, match="400"):
+        limiter.call(SHEETS_READ, "get", flaky([ApiError(400)]))
+    assert delays == []
+
+    with pytest.raises(ApiError, match="500"):
+        limiter.call(SHEETS_READ, "get", flaky([ApiError(500)] * 3))
+    assert len(delays) == 2
@@ -0,0 +1,40 @@
+import threading
+
+from google_quota import unlimited_quota
+from reminder_engine import ReminderDispatcher
+
+
+def test_dispatch_reports_each_recipient_and_keeps_going_after_failures():
+    def send(service, name, email, survey_url, http=None):
+        if email.startswith("bad"):
+            raise RuntimeError("invalid recipient")
+
+    recipients = [(f"참여자{i}", f"user{i}@x.com") for i in range(8)] + [("실패", "bad@x.com")]
+    progress = []
+    dispatcher = ReminderDispatcher(None, max_workers=3, limiter=unlimited_quota(), send_func=send)
+
+    results, stats = dispatcher.dispatch(recipients, "https://example.com",
+                                         on_result=lambda result, done, total: progress.append((done, total)))
+
+    assert sorted(r["email"] for r in results) == sorted(email for _, email in recipients)
+    assert [r["error"] for r in results if not r["success"]] == ["invalid recipient"]
+    assert (stats["total"], stats["sent"], stats["failed"]) == (9, 8, 1)
+    assert progress[-1] == (9, 9)
+
+
+def test_each_worker_thread_gets_its_own_http_connection():
+    seen = {}
+    lock = threading.Lock()
+
+    def send(service, name, email, survey_url, http=None):
+        with lock:
+            seen.setdefault(threading.get_ident(), set()).add(id(http))
+
+    dispatcher = ReminderDispatcher(
+        None, http_factory=object, max_workers=4, limiter=unlimited_quota(), send_func=send
+    )
+    dispatcher.dispatch([(f"참여자{i}", f"user{i}@x.com") for i in range(40)], "https://example.com")
+
+    connections = list(seen.values())
+    assert all(len(ids) == 1 for ids in connections)
+    assert len(set().union(*connections)) == len(connections)
@@ -0,0 +1,62 @@
+import threading
+import time
+
+from google_quota import unlimited_quota
+from reminder_engine import ReminderDispatcher
+from reminder_outbox import ReminderOutbox
+
+RECIPIENTS = [(f"참여자{i}", f"user{i}@x.com") for i in range(40)]
+
+
+def make_dispatcher(sent, delay=0.0):
+    lock = threading.Lock()
+
+    def send(service, name, email, survey_url, http=None):
+        time.sleep(delay)
+        with lock:
+            sent.append(email)
+
+    return ReminderDispatcher(None, max_workers=4, limiter=unlimited_quota(), send_func=send)
+
+
+def test_concurrent_drains_send_each_recipient_once(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    ReminderOutbox(path).enqueue("survey", "c1", RECIPIENTS, "https://example.com")
+    sent = []
+    # 앱 화면, 스케줄러, CLI가 같은 파일을 동시에 비우는 상황
+    drains = [
+        threading.Thread(target=ReminderOutbox(path, claim_batch=5).drain,
+                         args=(make_dispatcher(sent, delay=0.01), "survey", "c1"))
+        for _ in range(3)
+    ]
+    for thread in drains:
+        thread.start()
+    for thread in drains:
+        thread.join()
+
+    assert sorted(sent) == sorted(email for _, email in RECIPIENTS)
+
+
+def test_enqueue_drops_pending_rows_for_people_who_responded(tmp_path):
+    outbox = ReminderOutbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("survey", "c1", RECIPIENTS[:2], "https://example.com")
+    # 발송 전에 중단되었고, 그 사이 user1이 응답했습니다
+    outbox.enqueue("survey", "c1", RECIPIENTS[:1], "https://example.com")
+
+    sent = []
+    _, stats = outbox.drain(make_dispatcher(sent), "survey", "c1")
+
+    assert sent == ["user0@x.com"]
+    assert stats["sent"] == 1
+
+
+def test_enqueue_skips_missing_emails(tmp_path):
+    outbox = ReminderOutbox(str(tmp_path / "outbox.db"))
+    added = outbox.enqueue(
+        "survey", "c1",
+        [("이메일 있음", "a@x.com"), ("결측", float("nan")), ("None", None), ("공백", "  ")],
+        "https://example.com"
+    )
+
+    assert added == 1
+    assert outbox.pending("survey", "c1") == [("이메일 있음", "a@x.com")]
@@ -0,0 +1,82 @@
+from benchmarks.fakes import FakeSheetsClient
+from google_quota import unlimited_quota
+from reminder_engine import ReminderDispatcher
+from reminder_outbox import ReminderOutbox
+from reminder_scheduler import ReminderScheduler, ScheduleStore, STATUS_ACTIVE, STATUS_COMPLETED, STATUS_PAUSED
+from sheet_repository import SheetRepository
+from snapshot_store import SnapshotStore
+
+ROSTER = [["이름", "소속", "이메일"], ["김민수", "구매팀", "a@x.com"], ["이영희", "영업팀", "b@x.com"]]
+RESPONSES = [["이름", "소속", "이메일", "만족도"], ["김민수", "구매팀", "a@x.com", "만족"]]
+
+
+def make_scheduler(tmp_path, client, sent):
+    repository = SheetRepository(
+        lambda: client, snapshot_store=SnapshotStore(str(tmp_path / "snapshots")), limiter=unlimited_quota()
+    )
+    dispatcher = ReminderDispatcher(
+        None, limiter=unlimited_quota(), send_func=lambda service, name, email, url, http=None: sent.append(email)
+    )
+    store = ScheduleStore(str(tmp_path / "outbox.db"))
+    scheduler = ReminderScheduler(store, ReminderOutbox(str(tmp_path / "outbox.db")), repository.sync, lambda: dispatcher)
+    return scheduler, repository, store
+
+
+def test_scheduler_does_not_send_from_a_stale_snapshot(tmp_path):
+    client = FakeSheetsClient()
+    client.add_sheet("roster", ROSTER)
+    survey = client.add_sheet("survey", RESPONSES)
+
+    _, repository, store = make_scheduler(tmp_path, client, [])
+    repository.get_records("roster")
+    repository.get_records("survey")  # 스냅샷 저장
+    survey.values.append(["이영희", "영업팀", "b@x.com", "보통"])
+
+    # 재시작: 새 저장소는 스냅샷부터 읽지만 스케줄러는 API에서 다시 읽어야 합니다
+    sent = []
+    scheduler, _, store = make_scheduler(tmp_path, client, sent)
+    store.save("survey", "설문", "https://example.com", "roster")
+    scheduler.run_due()
+
+    assert sent == []
+    assert store.get("survey")["status"] == STATUS_COMPLETED
+
+
+def test_scheduler_skips_the_round_when_the_sheet_cannot_be_read(tmp_path):
+    client = FakeSheetsClient()
+    client.add_sheet("roster", ROSTER)
+    client.add_sheet("survey", RESPONSES)
+
+    _, repository, _ = make_scheduler(tmp_path, client, [])
+    repository.get_records("roster")
+    repository.get_records("survey")
+    client.sheets["survey"].sheet1.error_rate = 1.0
+
+    sent = []
+    scheduler, _, store = make_scheduler(tmp_path, client, sent)
+    store.save("survey", "설문", "https://example.com", "roster")
+    result, = scheduler.run_due()
+
+    assert sent == []
+    assert "error" in result
+    schedule = store.get("survey")
+    assert schedule["status"] == STATUS_ACTIVE and schedule["reminders_sent"] == 0
+
+
+def test_scheduler_pauses_a_roster_without_required_columns_and_runs_the_rest(tmp_path):
+    client = FakeSheetsClient()
+    client.add_sheet("roster", ROSTER)
+    client.add_sheet("no-name", [["소속", "이메일"], ["영업팀", "b@x.com"]])
+    client.add_sheet("survey", RESPONSES)
+    client.add_sheet("other", RESPONSES)
+
+    sent = []
+    scheduler, _, store = make_scheduler(tmp_path, client, sent)
+    store.save("survey", "설문", "https://example.com", "no-name")
+    store.save("other", "다른 설문", "https://example.com", "roster")
+    results = scheduler.run_due()
+
+    assert len(results) == 2
+    assert sent == ["b@x.com"]
+    assert store.get("survey")["status"] == STATUS_PAUSED
+    assert "이름" in store.get("survey")["last_result"]["error"]
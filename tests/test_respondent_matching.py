@@ -0,0 +1,37 @@
+import pandas as pd
+
+from respondent_matching import (
+    MATCHED_COLUMN, ROSTER_COLUMN, find_non_respondents, match_respondents, response_matrix
+)
+
+
+def test_same_name_and_department_is_not_matched_through_another_persons_response():
+    roster = pd.DataFrame({
+        "이름": ["김민수", "김민수", "이영희"],
+        "소속": ["구매팀", "구매팀", "영업팀"],
+        "이메일": ["a@x.com", "b@x.com", None],
+    })
+    survey = pd.DataFrame({
+        "이름": ["김민수", "이영희"],
+        "소속": ["구매팀", "영업팀"],
+        "이메일": ["a@x.com", ""],
+    })
+
+    # 이메일이 있는 대상자는 이메일로만, 이메일이 없는 대상자만 이름+소속으로 매칭합니다
+    assert match_respondents(roster, survey)[MATCHED_COLUMN].tolist() == [True, False, True]
+    assert find_non_respondents(roster, survey)["이메일"].tolist() == ["b@x.com"]
+    assert response_matrix({"명단": roster}, {"S": survey})["S"].tolist() == [True, False, True]
+
+
+def test_response_matrix_lists_every_roster_of_a_participant():
+    rosters = {
+        "영업, 1기": pd.DataFrame({"이름": ["김민수", "이영희"], "이메일": ["a@x.com", "b@x.com"]}),
+        "구매(2기)": pd.DataFrame({"이름": ["김민수"], "이메일": ["A@x.com"]}),
+    }
+    survey = pd.DataFrame({"이름": ["이영희"], "이메일": ["b@x.com"]})
+
+    matrix = response_matrix(rosters, {"S": survey})
+
+    # 이름에 구분자나 정규식 문자가 있어도 명단 이름 그대로 들어갑니다
+    assert matrix[ROSTER_COLUMN].tolist() == [["영업, 1기", "구매(2기)"], ["영업, 1기"]]
+    assert matrix["S"].tolist() == [False, True]
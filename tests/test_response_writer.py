@@ -0,0 +1,49 @@
+import pytest
+
+from benchmarks.fakes import FakeWorksheet
+from google_quota import unlimited_quota
+from response_writer import ResponseWriter
+
+
+def make_writer(tmp_path, worksheet, **kwargs):
+    return ResponseWriter(lambda: worksheet, spool_path=str(tmp_path / "spool.jsonl"),
+                          flush_interval=3600, limiter=unlimited_quota(), **kwargs)
+
+
+def test_flush_appends_rows_in_batches_and_empties_the_spool(tmp_path):
+    worksheet = FakeWorksheet()
+    batches = []
+    append_rows = worksheet.append_rows
+    worksheet.append_rows = lambda rows, **kwargs: (batches.append(len(rows)), append_rows(rows, **kwargs))
+
+    writer = make_writer(tmp_path, worksheet, max_batch=50)
+    rows = [[f"참여자{i}", "만족"] for i in range(120)]
+    for row in rows:
+        writer.submit(row)
+    writer.flush()
+    writer.close()
+
+    assert worksheet.values == rows
+    assert max(batches) <= 50 and sum(batches) == 120
+    assert writer.pending_count == 0 and writer.flushed == 120
+    assert (tmp_path / "spool.jsonl").read_text() == ""
+
+
+def test_failed_flush_keeps_rows_in_the_spool_for_the_next_run(tmp_path):
+    worksheet = FakeWorksheet(error_rate=1.0)
+    writer = make_writer(tmp_path, worksheet)
+    writer.submit(["김민수", "만족"])
+
+    with pytest.raises(Exception):
+        writer.flush()
+    assert writer.last_error and writer.pending_count == 1
+    writer.close()
+
+    # 다음 실행은 스풀에 남은 응답부터 저장합니다
+    worksheet.error_rate = 0.0
+    restarted = make_writer(tmp_path, worksheet)
+    assert restarted.flush() == 1
+    restarted.close()
+
+    assert worksheet.values == [["김민수", "만족"]]
+    assert restarted.last_error is None
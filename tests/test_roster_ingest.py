@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+from roster_ingest import REASON_COLUMN, ROW_COLUMN, ingest_roster
+
+ROWS = [
+    ["이름", "이메일"],
+    ["김민수", "a@x.com"],
+    [None, None],          # 빈 행
+    ["이영희", "잘못된 주소"],
+    ["박지훈", "A@x.com"],  # 중복
+]
+
+
+def excel_file():
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    for row in ROWS:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def csv_file():
+    lines = [",".join(value or "" for value in row) if any(row) else "" for row in ROWS]
+    return io.BytesIO("\n".join(lines).encode("utf-8"))
+
+
+@pytest.mark.parametrize("make_file, filename", [(excel_file, "명단.xlsx"), (csv_file, "명단.csv")])
+def test_rejected_rows_report_the_row_number_in_the_file(make_file, filename):
+    df, df_rejected, report = ingest_roster(make_file(), filename, chunk_size=1)
+
+    assert df["이름"].tolist() == ["김민수"]
+    assert df_rejected[ROW_COLUMN].tolist() == [4, 5]
+    assert df_rejected[REASON_COLUMN].tolist() == ["이메일 형식 오류", "중복"]
+    assert report["rows_read"] == 3
@@ -0,0 +1,97 @@
+import threading
+
+import pandas as pd
+
+from benchmarks.fakes import FakeSheetsClient
+from google_quota import unlimited_quota
+from sheet_repository import SheetRepository
+from snapshot_store import SnapshotStore
+
+HEADER = ["이름", "이메일", "만족도"]
+
+
+def rows(start, stop):
+    return [[f"참여자{i}", f"user{i}@x.com", "만족"] for i in range(start, stop)]
+
+
+def make_repository(client, **kwargs):
+    return SheetRepository(lambda: client, limiter=unlimited_quota(), **kwargs)
+
+
+def test_evicting_a_sheet_keeps_the_lock_of_a_running_fetch():
+    client = FakeSheetsClient()
+    for sheet_id in ("a", "b"):
+        client.add_sheet(sheet_id, [HEADER] + rows(0, 3))
+    repo = make_repository(client, max_entries=1, ttl=0)
+    repo.get_records("a")
+
+    second = threading.Thread(target=repo.get_records, args=("a",))
+    with repo._fetch_lock("a"):
+        repo.get_records("b")  # 조회 중인 'a'를 캐시에서 밀어냅니다
+        second.start()
+        second.join(0.2)
+        # 같은 시트의 두 번째 조회는 새 잠금을 만들지 않고 첫 조회가 끝나기를 기다립니다
+        assert second.is_alive()
+    second.join()
+
+    assert set(repo._fetch_locks) <= set(repo._cache)
+
+
+def test_fetch_locks_stay_bounded_by_the_cache():
+    client = FakeSheetsClient()
+    for i in range(50):
+        client.add_sheet(f"s{i}", [HEADER] + rows(0, 2))
+    repo = make_repository(client, max_entries=8)
+
+    for i in range(50):
+        repo.get_records(f"s{i}")
+
+    assert len(repo._fetch_locks) == 8
+
+
+def test_invalidate_does_not_serve_the_old_snapshot(tmp_path):
+    client = FakeSheetsClient()
+    worksheet = client.add_sheet("a", [HEADER] + rows(0, 3))
+    snapshots = SnapshotStore(str(tmp_path))
+
+    for incremental in (False, True):
+        repo = make_repository(client, incremental=incremental, snapshot_store=snapshots)
+        repo.get_records("a")
+        worksheet.values.extend(rows(len(worksheet.values) - 1, len(worksheet.values) + 1))
+
+        # 앱을 다시 시작해 캐시는 비어 있고 디스크의 스냅샷만 남은 경우도 확인합니다
+        for current in (repo, make_repository(client, incremental=incremental, snapshot_store=snapshots)):
+            current.invalidate("a")
+            assert len(current.get_records("a")) == len(worksheet.values) - 1
+
+
+def full_fetch(client, sheet_id):
+    return make_repository(client, incremental=False).get_records(sheet_id)
+
+
+def test_incremental_sync_matches_a_full_fetch():
+    client = FakeSheetsClient()
+    worksheet = client.add_sheet("a", [HEADER] + rows(0, 5))
+    repo = make_repository(client, ttl=0)
+    repo.get_records("a")
+
+    # 행 추가: 새 행만 읽습니다
+    worksheet.values.extend(rows(5, 8))
+    pd.testing.assert_frame_equal(repo.get_records("a"), full_fetch(client, "a"))
+    assert repo.stats()["incremental_syncs"] == 1
+
+    # 행 삭제, 마지막 행 수정, 헤더 변경은 전체를 다시 읽습니다
+    def truncate(values):
+        del values[3:]
+
+    def edit_last_row(values):
+        values[-1][2] = "보통"
+
+    def rename_column(values):
+        values[0][2] = "전반적 만족도"
+
+    for change in (truncate, edit_last_row, rename_column):
+        full_syncs = repo.stats()["full_syncs"]
+        change(worksheet.values)
+        pd.testing.assert_frame_equal(repo.get_records("a"), full_fetch(client, "a"))
+        assert repo.stats()["full_syncs"] == full_syncs + 1
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeSheetsClient
+from google_quota import unlimited_quota
+from sheet_uploader import SheetUploader, UploadProgress
+
+ROSTER = pd.DataFrame({
+    "이름": [f"참여자{i}" for i in range(25)],
+    "소속": ["구매팀"] * 25,
+    "이메일": [f"user{i}@x.com" for i in range(25)],
+})
+
+
+def make_uploader(tmp_path):
+    return SheetUploader(progress=UploadProgress(str(tmp_path)), chunk_size=10, limiter=unlimited_quota())
+
+
+def test_upload_reuses_created_spreadsheet_after_failure_before_first_chunk(tmp_path):
+    client = FakeSheetsClient()
+    uploader = make_uploader(tmp_path)
+    sheet = client.create("명단")
+    uploader.start_job("job", sheet.id, ROSTER)
+
+    def broken_resize(rows=None, cols=None):
+        raise RuntimeError("중단")
+
+    worksheet = sheet.sheet1
+    worksheet.resize, original_resize = broken_resize, worksheet.resize
+    with pytest.raises(RuntimeError):
+        uploader.upload(worksheet, ROSTER, job_id="job", spreadsheet_id=sheet.id)
+
+    # 다음 시도는 새 스프레드시트를 만들지 않고 기록된 스프레드시트에 올립니다
+    assert uploader.pending_job("job")["spreadsheet_id"] == sheet.id
+    worksheet.resize = original_resize
+    report = uploader.upload(worksheet, ROSTER, job_id="job", spreadsheet_id=sheet.id)
+
+    assert report["uploaded_rows"] == len(ROSTER)
+    assert worksheet.values[0] == list(ROSTER.columns)
+    assert len(worksheet.values) == len(ROSTER) + 1
+    assert uploader.pending_job("job") is None
+
+
+def test_matches_job_rejects_worksheet_with_other_header(tmp_path):
+    client = FakeSheetsClient()
+    uploader = make_uploader(tmp_path)
+    state = {"spreadsheet_id": "s", "rows": len(ROSTER), "chunk_size": 10, "resized": True, "done": [0]}
+
+    matching = client.add_sheet("a", [list(ROSTER.columns)])
+    other = client.add_sheet("b", [["다른", "헤더"]])
+
+    assert uploader.matches_job(state, matching, ROSTER)
+    assert not uploader.matches_job(state, other, ROSTER)
+    assert not uploader.matches_job(dict(state, rows=3), matching, ROSTER)
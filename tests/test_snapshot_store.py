@@ -0,0 +1,35 @@
+import pandas as pd
+
+from benchmarks.fakes import FakeSheetsClient
+from google_quota import unlimited_quota
+from sheet_repository import SheetRepository
+from snapshot_store import SnapshotStore
+
+
+def test_snapshot_round_trip_keeps_mixed_columns_and_sync_state(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    # 빈 칸이 있는 숫자 컬럼은 시트에서 숫자와 문자열이 섞여 들어옵니다
+    df = pd.DataFrame({"이름": ["김민수", "이영희"], "점수": [5, ""]})
+    state = {"header": ["이름", "점수"], "row_count": 2, "last_row": ["이영희", ""]}
+
+    store.save("sheet", df, sync_state=state, fetched_at=123.0)
+    loaded, meta = store.load("sheet")
+
+    assert loaded["점수"].tolist() == [5, ""]
+    assert meta["sync_state"] == state
+    assert store.info("sheet")["fetched_at"] == 123.0
+    assert store.load("missing") == (None, None)
+
+
+def test_cold_start_serves_the_snapshot_when_the_api_is_down(tmp_path):
+    client = FakeSheetsClient()
+    worksheet = client.add_sheet("a", [["이름", "이메일"], ["김민수", "a@x.com"]])
+    snapshots = SnapshotStore(str(tmp_path))
+    SheetRepository(lambda: client, snapshot_store=snapshots, limiter=unlimited_quota()).get_records("a")
+
+    worksheet.error_rate = 1.0
+    restarted = SheetRepository(lambda: client, snapshot_store=snapshots, limiter=unlimited_quota())
+    df = restarted.get_records("a")
+
+    assert df["이메일"].tolist() == ["a@x.com"]
+    assert restarted.freshness("a")["source"] == "snapshot"
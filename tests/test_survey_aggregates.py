@@ -0,0 +1,55 @@
+import pandas as pd
+
+from survey_aggregates import SurveySummary
+
+SATISFACTION = ["매우 만족", "만족", "보통", "불만족", "매우 불만족"]
+
+
+def responses(start, stop):
+    return pd.DataFrame({
+        "이름": [f"참여자{i}" for i in range(start, stop)],
+        "부서": [["영업", "개발", None][i % 3] for i in range(start, stop)],
+        "만족도": [SATISFACTION[i % 5] for i in range(start, stop)],
+    })
+
+
+def assert_same_summary(summary, df):
+    full = SurveySummary().update(df)
+    assert summary.total == full.total == len(df)
+    assert summary.categorical_columns() == full.categorical_columns()
+    for col in df.columns:
+        if full.counts(col) is None:
+            assert summary.counts(col) is None
+        else:
+            pd.testing.assert_series_equal(summary.counts(col).sort_index(), full.counts(col).sort_index())
+
+
+def test_appended_rows_match_a_full_recompute():
+    summary = SurveySummary()
+    for stop in (3, 4, 12, 30):
+        df = responses(0, stop)
+        summary.update(df)
+        assert_same_summary(summary, df)
+
+    # 이름은 응답이 늘며 고유값이 많아져 범주형에서 빠지고, 부서와 만족도는 남습니다
+    assert summary.categorical_columns() == ["부서", "만족도"]
+    assert summary.counts("만족도")["만족"] == 6
+
+
+def test_changed_rows_are_recounted_from_scratch():
+    summary = SurveySummary().update(responses(0, 10))
+    version = summary.version
+
+    edited = responses(0, 10)
+    edited.loc[9, "만족도"] = "보통"
+    summary.update(edited)
+    assert_same_summary(summary, edited)
+
+    truncated = responses(0, 5)
+    summary.update(truncated)
+    assert_same_summary(summary, truncated)
+    assert summary.version > version
+
+    # 같은 데이터로 다시 갱신하면 캐시된 결과를 그대로 씁니다
+    version = summary.version
+    assert summary.update(truncated).version == version
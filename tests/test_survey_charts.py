@@ -0,0 +1,37 @@
+import pandas as pd
+
+from survey_charts import OTHER_LABEL, FigureCache, top_n_counts
+
+
+def test_top_n_counts_keeps_the_largest_categories_and_the_total():
+    counts = pd.Series({"영업": 9, "개발": 7, "인사": 1, "재무": 2, "기획": 3})
+
+    top = top_n_counts(counts, 2)
+
+    assert top.index.tolist() == ["영업", "개발", OTHER_LABEL]
+    assert top[OTHER_LABEL] == 6 and top.sum() == counts.sum()
+    assert top_n_counts(counts, None) is counts
+    assert top_n_counts(counts, 5) is counts
+
+
+def test_figures_are_reused_until_the_counts_change():
+    cache = FigureCache()
+    counts = pd.Series({"만족": 3, "보통": 1})
+
+    first = cache.category_bar("만족도", counts)
+    assert cache.category_bar("만족도", counts.copy()) is first
+    assert cache.category_bar("만족도", pd.Series({"만족": 4, "보통": 1})) is not first
+    # 같은 집계라도 다른 컬럼이나 경량 모드의 차트는 따로 만듭니다
+    assert cache.category_bar("부서", counts) is not first
+    assert cache.category_bar("만족도", counts, top_n=1) is not first
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_least_recently_used_figures_are_evicted():
+    cache = FigureCache(max_figures=2)
+    figures = {key: cache.get_or_build(key, object) for key in ("a", "b")}
+    cache.get_or_build("a", object)
+    cache.get_or_build("c", object)
+
+    assert cache.get_or_build("a", object) is figures["a"]
+    assert cache.get_or_build("b", object) is not figures["b"]
@@ -0,0 +1,72 @@
+import io
+import zipfile
+
+import pandas as pd
+
+import survey_export
+from survey_export import export_archive, export_frame, write_csv, write_parquet
+
+
+def read_parquet(df, chunk_size):
+    buffer = io.BytesIO()
+    write_parquet(df, buffer, chunk_size=chunk_size)
+    return pd.read_parquet(io.BytesIO(buffer.getvalue()))
+
+
+def test_parquet_column_empty_in_first_chunk_keeps_later_values():
+    # 시트에서 읽은 값처럼 object 컬럼으로 만듭니다
+    df = pd.DataFrame({
+        "이름": [f"참여자{i}" for i in range(6)],
+        "의견": [None, None, None, None, "좋아요", "보통"],
+        "점수": [None, None, 3, 4, 5, 1],
+    }, dtype=object)
+
+    result = read_parquet(df, chunk_size=2)
+
+    assert result["의견"].tolist()[4:] == ["좋아요", "보통"]
+    assert result["점수"].tolist()[2:] == [3, 4, 5, 1]
+    assert len(result) == len(df)
+
+
+def make_responses(n):
+    return pd.DataFrame({
+        "이름": [f"참여자{i}" for i in range(n)],
+        "만족도": ["만족", None, "보통"] * (n // 3) + ["만족"] * (n % 3),
+    })
+
+
+def test_chunked_csv_has_one_header_and_matches_a_single_write():
+    df = make_responses(10)
+    buffer = io.BytesIO()
+
+    write_csv(df, buffer, chunk_size=3)
+
+    assert buffer.getvalue().decode('utf-8') == df.to_csv(index=False)
+    empty = io.BytesIO()
+    write_csv(df.iloc[:0], empty)
+    assert empty.getvalue().decode('utf-8').strip() == "이름,만족도"
+
+
+def test_xlsx_continues_on_a_new_sheet_past_the_row_limit(monkeypatch):
+    monkeypatch.setattr(survey_export, "EXCEL_MAX_ROWS", 5)
+    df = make_responses(9)
+
+    with export_frame(df, "xlsx", chunk_size=4) as f:
+        sheets = pd.read_excel(f, sheet_name=None)
+
+    assert list(sheets) == ["Sheet1", "Sheet2", "Sheet3"]
+    combined = pd.concat(sheets.values(), ignore_index=True)
+    assert combined["이름"].tolist() == df["이름"].tolist()
+    # 결측값은 빈 칸으로 기록됩니다
+    assert combined["만족도"].isna().tolist() == df["만족도"].isna().tolist()
+
+
+def test_archive_gives_duplicate_names_their_own_files():
+    frames = {"만족도/조사": make_responses(3), "만족도:조사": make_responses(4)}
+
+    with export_archive(frames, "parquet") as f, zipfile.ZipFile(f) as archive:
+        names = archive.namelist()
+        lengths = [len(pd.read_parquet(io.BytesIO(archive.read(name)))) for name in names]
+
+    assert names == ["만족도_조사.parquet", "만족도_조사_2.parquet"]
+    assert lengths == [3, 4]
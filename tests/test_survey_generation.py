@@ -0,0 +1,130 @@
+import json
+import time
+
+import pytest
+
+from benchmarks.fakes import SAMPLE_SURVEY, FakeAsyncOpenAI, FakeOpenAI
+from survey_generation import VARIANT_STYLES, GenerationCache, IncrementalSurveyParser, run_variants, stream_survey
+
+
+def feed_in_pieces(parser, text, size):
+    completed = []
+    for start in range(0, len(text), size):
+        completed.extend(parser.feed(text[start:start + size]))
+    return completed
+
+
+@pytest.mark.parametrize("size", [1, 7, 10_000])
+def test_questions_are_emitted_as_soon_as_they_are_complete(size):
+    text = "```json\n" + json.dumps(SAMPLE_SURVEY, ensure_ascii=False, indent=2) + "\n```"
+    parser = IncrementalSurveyParser()
+
+    completed = feed_in_pieces(parser, text, size)
+
+    assert completed == SAMPLE_SURVEY["questions"]
+    assert (parser.title, parser.description) == (SAMPLE_SURVEY["title"], SAMPLE_SURVEY["description"])
+    assert parser.result() == (SAMPLE_SURVEY, False)
+
+
+def test_first_question_is_ready_before_the_stream_ends():
+    text = json.dumps(SAMPLE_SURVEY, ensure_ascii=False)
+    first_end = text.index("}") + 1
+    parser = IncrementalSurveyParser()
+
+    assert parser.feed(text[:first_end - 1]) == []
+    assert parser.title == SAMPLE_SURVEY["title"]
+    assert parser.feed(text[first_end - 1:first_end]) == SAMPLE_SURVEY["questions"][:1]
+
+
+def test_brackets_and_quotes_inside_strings_are_not_structure():
+    survey = {
+        "title": "설문 \"베타\" {2차}",
+        "questions": [
+            {"type": "text", "question": "괄호 } 와 ] 가 들어간 질문", "required": True},
+            {"type": "text", "question": "역슬래시 \\ 와 \" 따옴표", "required": False},
+        ],
+    }
+    parser = IncrementalSurveyParser()
+
+    completed = feed_in_pieces(parser, json.dumps(survey, ensure_ascii=False), 3)
+
+    assert completed == survey["questions"]
+    assert parser.title == survey["title"]
+
+
+def test_malformed_questions_are_skipped_and_the_rest_recovered():
+    text = (
+        '{"title": "만족도 조사", "description": "설명", "questions": ['
+        '{"type": "text", "question": "첫 질문"}, '
+        '{"type": "text", "question": }, '
+        '{"type": "radio", "options": ["예", "아니오"]}, '
+        '{"type": "textarea", "question": "마지막 질문"}, '
+        '{"type": "text", "question": "잘린 질'
+    )
+    parser = IncrementalSurveyParser()
+
+    completed = feed_in_pieces(parser, text, 5)
+    survey, partial = parser.result()
+
+    assert [q["question"] for q in completed] == ["첫 질문", "마지막 질문"]
+    assert parser.skipped == 2
+    assert partial and survey["title"] == "만족도 조사" and survey["questions"] == completed
+
+
+def test_result_without_any_question_raises():
+    parser = IncrementalSurveyParser()
+    parser.feed('{"title": "제목", "questions": [')
+
+    with pytest.raises(ValueError):
+        parser.result()
+
+
+def test_stream_survey_caches_complete_results(tmp_path):
+    client = FakeOpenAI(chunk_chars=5)
+    cache = GenerationCache(str(tmp_path))
+
+    events = list(stream_survey(client, "신입사원", "교육 만족도", "만족도", cache=cache))
+    cached_events = list(stream_survey(client, "신입사원 ", "교육  만족도", "만족도", cache=cache))
+
+    questions = [value for event, value in events if event == "question"]
+    assert questions == SAMPLE_SURVEY["questions"]
+    survey, info = events[-1][1]
+    assert survey == SAMPLE_SURVEY and not info["cached"] and info["first_question"] is not None
+    # 공백만 다른 입력은 같은 캐시 항목을 씁니다
+    assert cached_events[-1][1][1]["cached"] and client.calls == 1
+    assert [event for event, _ in cached_events[:2]] == ["title", "description"]
+
+
+def test_variants_run_concurrently_and_come_back_in_order(tmp_path):
+    variants = VARIANT_STYLES[:3]
+    finished = []
+
+    started = time.monotonic()
+    results = run_variants(lambda: FakeAsyncOpenAI(latency=0.3), "신입사원", "교육 만족도", "만족도",
+                           variants=variants, concurrency=3, cache=GenerationCache(str(tmp_path)),
+                           on_result=lambda index, result: finished.append(index))
+    elapsed = time.monotonic() - started
+
+    # 세 요청을 동시에 보내므로 전체 시간은 한 요청 시간에 가깝습니다
+    assert elapsed < 0.6
+    assert [r["variant"] for r in results] == [name for name, _ in variants]
+    assert all(r["survey"] == SAMPLE_SURVEY and r["error"] is None for r in results)
+    assert sorted(finished) == [0, 1, 2]
+    # 초안마다 지침이 다르므로 캐시 항목도 따로 만들어집니다
+    assert len({r["info"]["key"] for r in results}) == 3
+
+
+def test_slow_or_failing_variants_fail_alone(tmp_path):
+    cache = GenerationCache(str(tmp_path))
+    run_variants(FakeAsyncOpenAI, "신입사원", "교육 만족도", "만족도",
+                 variants=VARIANT_STYLES[:1], cache=cache)
+
+    slow = run_variants(lambda: FakeAsyncOpenAI(latency=1.0), "신입사원", "교육 만족도", "만족도",
+                        variants=VARIANT_STYLES[:2], timeout=0.05, cache=cache)
+    failing = run_variants(lambda: FakeAsyncOpenAI(error_rate=1.0), "신입사원", "교육 만족도", "만족도",
+                           variants=VARIANT_STYLES[1:2])
+
+    # 캐시된 초안은 요청 없이 바로 돌려받고, 시간을 넘긴 초안만 실패합니다
+    assert slow[0]["info"]["cached"] and slow[0]["error"] is None
+    assert slow[1]["survey"] is None and "0.05초" in slow[1]["error"]
+    assert failing[0]["survey"] is None and "Rate limit" in failing[0]["error"]
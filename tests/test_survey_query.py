@@ -0,0 +1,64 @@
+import datetime
+
+import pandas as pd
+
+from survey_query import ResponseIndex, ResponseIndexStore, parse_dates
+
+RESPONSES = pd.DataFrame({
+    "이름": ["김민수", "이영희", "박지성", "김하늘", "최유리"],
+    "소속": ["영업팀", "개발팀", "영업팀", None, "개발팀"],
+    "이메일": ["minsu@x.com", "yh@x.com", "js@x.com", "sky@x.com", "yuri@x.com"],
+    "만족도": ["만족", "보통", "매우 만족", "만족", "불만족"],
+    "점수": [3, "", 5, 1, 2],
+    "타임스탬프": ["2024. 3. 5 오후 2:03:04", "2024-03-06 09:00:00", "", "2024. 3. 7 오전 11:30:00",
+              "2024-03-04 23:59:59"],
+})
+
+
+def test_korean_google_forms_timestamps_are_parsed():
+    dates = parse_dates(RESPONSES["타임스탬프"])
+
+    assert dates[0] == pd.Timestamp("2024-03-05 14:03:04")
+    assert dates[3] == pd.Timestamp("2024-03-07 11:30:00")
+    assert pd.isna(dates[2])
+
+
+def test_query_matches_plain_pandas_filtering_and_sorting():
+    index = ResponseIndex(RESPONSES)
+
+    positions = index.query(search="김", filters={"만족도": ["만족", "매우 만족"]}, sort_by="이름", ascending=False)
+    expected = (
+        RESPONSES[RESPONSES["이름"].str.contains("김") & RESPONSES["만족도"].isin(["만족", "매우 만족"])]
+        .sort_values("이름", ascending=False)
+    )
+    pd.testing.assert_frame_equal(RESPONSES.iloc[positions], expected)
+
+    # 검색은 대소문자를 구분하지 않고 이메일도 찾으며, 빈 소속은 건너뜁니다
+    assert index.query(search="YURI").tolist() == [4]
+    assert index.query(search="팀", filters={"소속": []}).tolist() == [0, 1, 2, 4]
+
+
+def test_date_range_includes_the_end_day_and_drops_missing_dates():
+    index = ResponseIndex(RESPONSES)
+
+    positions = index.query(date_range=(datetime.date(2024, 3, 5), datetime.date(2024, 3, 6)), sort_by="타임스탬프")
+
+    assert positions.tolist() == [0, 1]
+
+
+def test_mixed_columns_sort_as_text_and_pages_slice_the_result():
+    index = ResponseIndex(RESPONSES)
+
+    positions = index.query(sort_by="점수")
+
+    assert RESPONSES["점수"].iloc[positions].tolist() == ["", 1, 2, 3, 5]
+    assert index.page(positions, 2, page_size=2)["이름"].tolist() == ["최유리", "김민수"]
+    assert index.page(positions, 4, page_size=2).empty
+
+
+def test_store_rebuilds_the_index_when_the_frame_changes():
+    store = ResponseIndexStore()
+    index = store.get("sheet", RESPONSES)
+
+    assert store.get("sheet", RESPONSES) is index
+    assert store.get("sheet", RESPONSES.copy()) is not index